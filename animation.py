@@ -0,0 +1,48 @@
+FACING_RIGHT = 0
+FACING_LEFT = 1
+
+class AnimationClip:
+    """
+    A precomputed frame table for one animation, with a frame list per facing direction.
+    Frames advance every ticks_per_frame simulation ticks.
+    """
+    def __init__(self, frames_right, frames_left=None, ticks_per_frame=1):
+        frames_right = tuple(frames_right)
+        if frames_left is None:
+            frames_left = frames_right
+        self.frames = (frames_right, tuple(frames_left))
+        self.ticks_per_frame = ticks_per_frame
+
+    def __len__(self):
+        return len(self.frames[FACING_RIGHT])
+
+    def frame(self, facing, tick):
+        table = self.frames[facing]
+        return table[(tick // self.ticks_per_frame) % len(table)]
+
+class Animator:
+    """
+    Plays named clips. Playback advances once per simulation tick, so it is
+    deterministic and never touches the wall clock or allocates surfaces.
+    """
+    def __init__(self, clips, clip):
+        self.clips = clips
+        self.clip_name = clip
+        self.clip = clips[clip]
+        self.facing = FACING_RIGHT
+        self.tick = 0
+
+    @property
+    def image(self):
+        return self.clip.frame(self.facing, self.tick)
+
+    def update(self, clip, facing):
+        """Advance one tick of clip (restarting it if it changed) and return the frame."""
+        if clip != self.clip_name:
+            self.clip_name = clip
+            self.clip = self.clips[clip]
+            self.tick = 0
+        else:
+            self.tick += 1
+        self.facing = facing
+        return self.clip.frame(facing, self.tick)
@@ -0,0 +1,154 @@
+"""
+Asset pack builder and loader.
+
+Running this module packs every game image into a single file, pre-scaled for
+the configured screen size and stored as raw pixels that can go straight into
+convert()/convert_alpha(). At startup load_asset() serves images from the pack
+and falls back to decoding the original PNGs when the pack is missing or stale.
+
+    python assets.py
+"""
+import json
+import os
+import struct
+import threading
+import pygame
+from settings import *
+
+PACK_MAGIC = b"APAK"
+PACK_VERSION = 1
+# magic, format version, index length
+PACK_HEADER = struct.Struct("<4sHI")
+
+def fit_to_screen(image):
+    """Scale an image to fit the screen while keeping its aspect ratio."""
+    rect = image.get_rect()
+    scale = min(SCREEN_WIDTH / rect.width, SCREEN_HEIGHT / rect.height)
+    new_size = (int(rect.width * scale), int(rect.height * scale))
+    return pygame.transform.scale(image, new_size)
+
+# Asset name (its source path) -> preprocessing applied before packing
+ASSETS = {
+    'logo.png': fit_to_screen,
+    'images/p1_idle.png': None,
+    'images/p1_walk1.png': None,
+    'images/p1_walk2.png': None,
+    'images/p1_jump.png': None,
+}
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_source(name):
+    """Decode and preprocess an asset from its original image file."""
+    image = pygame.image.load(name)
+    prepare = ASSETS.get(name)
+    if prepare is not None:
+        image = prepare(image)
+    return image
+
+def build_asset_pack(path=ASSET_PACK_FILE):
+    """Write every asset in ASSETS into a single pack file at path."""
+    index = {'screen': [SCREEN_WIDTH, SCREEN_HEIGHT], 'sources': {}, 'assets': {}}
+    blobs = []
+    offset = 0
+    for name in ASSETS:
+        image = load_source(name)
+        fmt = "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"
+        data = pygame.image.tobytes(image, fmt)
+        index['sources'][name] = source_stamp(name)
+        index['assets'][name] = {'offset': offset, 'length': len(data), 'size': list(image.get_size()), 'format': fmt}
+        blobs.append(data)
+        offset += len(data)
+
+    index_data = json.dumps(index).encode('utf-8')
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_data)))
+        f.write(index_data)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_path, path)
+    return index
+
+class AssetPack:
+    """
+    A loaded asset pack. The index maps each asset name to its pixel data,
+    so lookups are a dict access and a slice of the pack buffer.
+    """
+    def __init__(self, path=ASSET_PACK_FILE):
+        self.path = path
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, index_length = PACK_HEADER.unpack_from(data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} asset pack")
+        start = PACK_HEADER.size
+        self.index = json.loads(data[start:start + index_length])
+        self.data = memoryview(data)[start + index_length:]
+
+    def is_stale(self):
+        """True if the pack was built for another screen size or from older sources."""
+        if self.index['screen'] != [SCREEN_WIDTH, SCREEN_HEIGHT]:
+            return True
+        if set(self.index['assets']) != set(ASSETS):
+            return True
+        for name, stamp in self.index['sources'].items():
+            try:
+                if source_stamp(name) != stamp:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def __contains__(self, name):
+        return name in self.index['assets']
+
+    def load(self, name):
+        entry = self.index['assets'][name]
+        offset = entry['offset']
+        pixels = self.data[offset:offset + entry['length']]
+        return pygame.image.frombytes(bytes(pixels), tuple(entry['size']), entry['format'])
+
+# Packs opened so far, by path (None if missing, invalid or stale). The
+# background loader and the main thread can both ask for a pack at startup.
+_packs = {}
+_packs_lock = threading.Lock()
+
+def get_asset_pack(path=ASSET_PACK_FILE):
+    """Open the asset pack at path once, returning None if it is missing, invalid or stale."""
+    with _packs_lock:
+        if path not in _packs:
+            try:
+                pack = AssetPack(path)
+                _packs[path] = None if pack.is_stale() else pack
+            except (OSError, ValueError, struct.error):
+                _packs[path] = None
+        return _packs[path]
+
+def reset_asset_pack():
+    with _packs_lock:
+        _packs.clear()
+
+def prepare_surface(image):
+    """Convert an image to the display's pixel format, if there is a display."""
+    if pygame.display.get_surface() is None:
+        return image
+    if image.get_flags() & pygame.SRCALPHA:
+        return image.convert_alpha()
+    return image.convert()
+
+def load_asset(name, use_pack=True):
+    """Return a ready-to-blit surface for an asset, preferring the asset pack."""
+    pack = get_asset_pack() if use_pack else None
+    if pack is not None and name in pack:
+        image = pack.load(name)
+    else:
+        image = load_source(name)
+    return prepare_surface(image)
+
+if __name__ == "__main__":
+    pygame.init()
+    index = build_asset_pack()
+    print(f"Packed {len(index['assets'])} assets into {ASSET_PACK_FILE}")
@@ -0,0 +1,172 @@
+"""
+NumPy batch physics: many independent players in the same level, stepped
+together with array operations. Requires numpy (pip install numpy).
+
+Every player follows exactly the rules of Player.update and Game.update,
+including pygame's rounding of positions to whole-pixel rects, so a batch
+gives the same results as running each player through the game.
+
+    env = BatchPhysics(4096)
+    obs = env.reset()
+    while not env.done.all():
+        obs, rewards, done, info = env.step(actions)
+"""
+import numpy as np
+from settings import *
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from sprites import build_level, get_player_clips
+
+def round_half_away(values):
+    """Round like pygame does when a float is assigned to a Rect."""
+    magnitude = np.abs(values)
+    whole = np.floor(magnitude)
+    whole += magnitude - whole >= 0.5
+    return np.copysign(whole, values).astype(np.int64)
+
+class BatchPhysics:
+    """
+    n players in one level. Players share the level, including the moving
+    platforms, and each keeps its own position, velocity, score and
+    game-over flag. Players that are done stay frozen until reset().
+    """
+    def __init__(self, n, tick_rate=SIM_TICK_RATE, player_size=None, level=build_level):
+        self.n = n
+        self.dt = PHYSICS_BASE_RATE / tick_rate
+        self.level = level
+        if player_size is None:
+            # Player rects keep the size of the idle frame
+            player_size = get_player_clips(YELLOW)['idle'].frames[0][0].get_size()
+        self.width, self.height = player_size
+        self.reset()
+
+    def reset(self):
+        """Rebuild the level, put every player on the start platform and return the observations."""
+        platforms, start = self.level()
+        self.plat_left = np.array([p.rect.x for p in platforms], dtype=np.int64)
+        self.plat_top = np.array([p.rect.y for p in platforms], dtype=np.int64)
+        self.plat_width = np.array([p.rect.width for p in platforms], dtype=np.int64)
+        self.plat_height = np.array([p.rect.height for p in platforms], dtype=np.int64)
+        self.plat_floor = np.array([p.is_floor for p in platforms], dtype=bool)
+        self.plat_moving = np.array([p.moving for p in platforms], dtype=bool)
+        self.plat_x = np.array([getattr(p, 'x', p.rect.x) for p in platforms], dtype=np.float64)
+        self.plat_start = np.array([getattr(p, 'start_x', p.rect.x) for p in platforms], dtype=np.float64)
+        self.plat_velocity = np.array([getattr(p, 'velocity', 0.0) for p in platforms], dtype=np.float64)
+
+        n = self.n
+        self.x = np.full(n, float(start.rect.centerx))
+        self.y = np.full(n, float(start.rect.top))
+        self.vx = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.last_platform = np.full(n, platforms.index(start), dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.grounded = np.ones(n, dtype=bool)
+        return self.observe()
+
+    def observe(self):
+        """(n, 4) array of x, y, x velocity, y velocity."""
+        return np.stack((self.x, self.y, self.vx, self.vy), axis=1)
+
+    def platform_rects_x(self):
+        plat_x = round_half_away(self.plat_x)
+        plat_x[~self.plat_moving] = self.plat_left[~self.plat_moving]
+        return plat_x
+
+    def time_of_impact(self, x0, y0, x1, y1):
+        """
+        (players, platforms) matrix of the fraction of the step at which
+        each player's feet land on each platform (inf if they don't), the
+        same test as collision.time_of_impact.
+        """
+        plat_x = self.platform_rects_x()
+        top = self.plat_top
+        x0, y0, x1, y1 = x0[:, None], y0[:, None], x1[:, None], y1[:, None]
+        wrapped = np.abs(x1 - x0) > SCREEN_WIDTH / 2
+        crossing = (y0 <= top) & (top < y1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (top - y0) / (y1 - y0)
+        feet_x = np.where(wrapped, x1, x0 + (x1 - x0) * t)
+        left = round_half_away(feet_x) - self.width // 2
+        crossing &= (left < plat_x + self.plat_width) & (left + self.width > plat_x)
+        end_x = round_half_away(x1) - self.width // 2
+        end_y = round_half_away(y1) - self.height
+        overlap = ((end_x < plat_x + self.plat_width) & (end_x + self.width > plat_x) &
+                   (end_y < top + self.plat_height) & (end_y + self.height > top))
+        return np.where(crossing, t, np.where(overlap, 1.0, np.inf))
+
+    def step(self, actions):
+        """
+        Advance every player one step with its mask of INPUT_* bits.
+        Returns (observations, rewards, done, info) where rewards are the
+        points scored this step and info holds the total scores.
+        """
+        actions = np.asarray(actions)
+        live = ~self.done
+        dt = self.dt
+        score_before = self.score.copy()
+
+        # Jump: only when the last step left the player standing on something
+        jumping = live & self.grounded & (actions & INPUT_JUMP != 0)
+        self.vy[jumping] = -PLAYER_JUMP
+
+        # Player.update, in the same operation order so results match bit for bit
+        vx = self.vx[live]
+        vy = self.vy[live]
+        ax = np.where(actions[live] & INPUT_RIGHT != 0, PLAYER_ACC,
+                      np.where(actions[live] & INPUT_LEFT != 0, -PLAYER_ACC, 0.0))
+        ax = ax + vx * PLAYER_FRICTION
+        ay = PLAYER_GRAVITY
+        path = 1 + 0.5 * dt
+        start_x = self.x.copy()
+        start_y = self.y.copy()
+        x = self.x[live] + (vx + ax * path) * dt
+        y = self.y[live] + (vy + ay * path) * dt
+        vx = vx + ax * dt
+        vy = vy + ay * dt
+        x = np.where(x > SCREEN_WIDTH, 0.0, x)
+        x = np.where(x < 0, float(SCREEN_WIDTH), x)
+        self.x[live] = x
+        self.y[live] = y
+        self.vx[live] = vx
+        self.vy[live] = vy
+
+        # Platform.update for the moving platforms, reflecting overshoot at the ends
+        moving = self.plat_moving
+        self.plat_x[moving] += self.plat_velocity[moving] * dt
+        end_x = self.plat_start + self.plat_width
+        over = moving & (self.plat_x > end_x)
+        self.plat_x = np.where(over, 2 * end_x - self.plat_x, self.plat_x)
+        self.plat_velocity = np.where(over, -np.abs(self.plat_velocity), self.plat_velocity)
+        under = moving & (self.plat_x < self.plat_start)
+        self.plat_x = np.where(under, 2 * self.plat_start - self.plat_x, self.plat_x)
+        self.plat_velocity = np.where(under, np.abs(self.plat_velocity), self.plat_velocity)
+
+        # Game.update: solve contacts, landing falling players on the first
+        # platform their feet cross
+        self.grounded[live] = False
+        falling = np.flatnonzero(live & (self.vy > 0))
+        if len(falling):
+            impact = self.time_of_impact(start_x[falling], start_y[falling], self.x[falling], self.y[falling])
+            landed = np.isfinite(impact).any(axis=1)
+            players = falling[landed]
+            impact = impact[landed]
+            # Earliest impact, then highest top, then not the floor, then platform order
+            first = impact == impact.min(axis=1)[:, None]
+            rank = np.where(first, self.plat_top * 2 + self.plat_floor, np.iinfo(np.int64).max)
+            platforms = rank.argmin(axis=1)
+
+            on_floor = self.plat_floor[platforms]
+            self.done[players[on_floor]] = True
+            players = players[~on_floor]
+            platforms = platforms[~on_floor]
+
+            self.grounded[players] = True
+            self.y[players] = self.plat_top[platforms]
+            scored = (self.vy[players] > PLAYER_GRAVITY * dt) & (platforms != self.last_platform[players])
+            self.score[players[scored]] += SCORE_PER_PLATFORM
+            self.last_platform[players[scored]] = platforms[scored]
+            self.vy[players] = 0
+            carried = self.plat_moving[platforms]
+            self.x[players[carried]] += self.plat_velocity[platforms[carried]] * dt
+
+        return self.observe(), self.score - score_before, self.done.copy(), {'score': self.score.copy()}
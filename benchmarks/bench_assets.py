@@ -0,0 +1,53 @@
+"""
+Compare cold-start asset loading from the asset pack against decoding the raw PNGs.
+
+Every measurement runs in a fresh Python process that imports pygame, opens a
+window and loads all assets once, so nothing is cached in the interpreter. The
+OS file cache is still warm after the first run; drop it between runs (e.g.
+`echo 3 > /proc/sys/vm/drop_caches` as root) to include disk reads.
+
+    python -m benchmarks.bench_assets
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+
+def child(use_pack):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import assets
+    from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+    pygame.display.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    start = time.perf_counter()
+    for name in assets.ASSETS:
+        assets.load_asset(name, use_pack=use_pack)
+    print(time.perf_counter() - start)
+
+def measure(use_pack):
+    times = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_assets", "--child", "pack" if use_pack else "raw"],
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child(sys.argv[-1] == "pack")
+        sys.exit()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+    import assets
+    assets.build_asset_pack()
+    raw = measure(use_pack=False)
+    packed = measure(use_pack=True)
+    print(f"Cold start in a fresh process, median of {RUNS} runs:")
+    print(f"  raw PNGs:   {raw * 1000:8.2f} ms")
+    print(f"  asset pack: {packed * 1000:8.2f} ms  ({raw / packed:.1f}x faster)")
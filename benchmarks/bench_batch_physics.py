@@ -0,0 +1,41 @@
+"""
+Scripted agents evaluated per second: NumPy batch physics against running
+each agent through the headless scalar simulation.
+
+    python -m benchmarks.bench_batch_physics
+"""
+import os
+import time
+
+AGENTS = 4096
+STEPS = 600 # 10 seconds of game time
+SCALAR_AGENTS = 64 # The scalar path is timed on a sample
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import numpy as np
+    from batch_physics import BatchPhysics
+    from simulation import Simulation
+
+    rng = np.random.default_rng(1)
+    # Each agent holds a random input for 15 steps at a time
+    actions = np.repeat(rng.integers(0, 8, size=(STEPS // 15, AGENTS)), 15, axis=0)
+
+    env = BatchPhysics(AGENTS)
+    start = time.perf_counter()
+    env.reset()
+    for t in range(STEPS):
+        env.step(actions[t])
+    batch = time.perf_counter() - start
+
+    sim = Simulation()
+    start = time.perf_counter()
+    for i in range(SCALAR_AGENTS):
+        sim.reset()
+        for _ in sim.run(actions[:, i].tolist()):
+            pass
+    scalar = time.perf_counter() - start
+
+    print(f"{AGENTS} agents x {STEPS} steps:")
+    print(f"  scalar: {SCALAR_AGENTS / scalar:10.0f} agents/s")
+    print(f"  batch:  {AGENTS / batch:10.0f} agents/s  ({AGENTS / batch / (SCALAR_AGENTS / scalar):.0f}x)")
@@ -0,0 +1,78 @@
+"""
+Endless mode soak test: an hour of game time (at SIM_TICK_RATE) on one
+seeded level, played headless by a simple climbing bot that is put back
+on a platform whenever the lava catches it. Every ten minutes of game
+time it reports the platforms alive, traced memory, throughput and the
+platform sprites and surfaces the pool ever created, which should all stay
+flat however far the level has scrolled.
+
+    python -m benchmarks.bench_endless_soak [minutes]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+SEED = 2024
+WINDOW_MINUTES = 10
+
+def bot(game):
+    """Inputs that climb towards the nearest platform above the player."""
+    from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+    while True:
+        player = game.player
+        feet = player.pos.y
+        above = [p for p in game.platforms
+                 if not p.is_floor and 30 <= feet - p.rect.top <= 200]
+        inputs = 0
+        if above:
+            target = max(above, key=lambda p: p.rect.top)
+            # Shortest way round, the screen wraps
+            dx = (target.rect.centerx - player.pos.x + game.screen_width / 2) % game.screen_width - game.screen_width / 2
+            if abs(dx) > 10:
+                inputs |= INPUT_RIGHT if dx > 0 else INPUT_LEFT
+            if player.contact.grounded and abs(dx) < 150:
+                inputs |= INPUT_JUMP
+        yield inputs
+
+def respawn(game):
+    """Put the player back on the highest platform on screen."""
+    camera = game.level.camera
+    platforms = [p for p in game.platforms
+                 if not p.is_floor and camera.top + 100 < p.rect.top < game.level.lava.rect.top - 100]
+    platform = min(platforms, key=lambda p: p.rect.top)
+    player = game.player
+    player.pos.update(platform.rect.centerx, platform.rect.top)
+    player.prev_pos.update(player.pos)
+    player.vel.update(0, 0)
+    player.rect.midbottom = player.pos
+    player.contact.set(platform, 0.0)
+    game.playing = True
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from settings import SIM_TICK_RATE
+    from simulation import Simulation
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    window = WINDOW_MINUTES * 60 * SIM_TICK_RATE
+
+    sim = Simulation(endless=True, seed=SEED)
+    sim.reset()
+    game = sim.game
+    inputs = bot(game)
+    tracemalloc.start()
+    print(f"{'minute':>6} {'height':>9} {'chunks':>6} {'platforms':>9} {'deaths':>6} {'memory':>10} {'sprites':>7} {'surfaces':>8} {'steps/s':>9}")
+    deaths = 0
+    start = time.perf_counter()
+    for minute in range(WINDOW_MINUTES, minutes + 1, WINDOW_MINUTES):
+        for _ in range(window):
+            sim.step(next(inputs))
+            if not game.playing:
+                deaths += 1
+                respawn(game)
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        pool = game.platform_pool.stats()
+        print(f"{minute:>6} {-game.level.camera.top:>9.0f} {len(game.level.chunks):>6} "
+              f"{len(game.platforms):>9} {deaths:>6} {current / 1024:>8.0f}kB {pool.created:>7} {pool.surfaces:>8} {window / elapsed:>9.0f}")
+        start = time.perf_counter()
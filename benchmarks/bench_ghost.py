@@ -0,0 +1,62 @@
+"""
+What a ghost adds to a frame: one simulation step and one full redraw per
+frame on the dummy video driver, the live player hopping about on the start
+platform, against the ghost's own work for a frame (decode a step, place
+it and blit it) replaying the same moves.
+
+    python -m benchmarks.bench_ghost
+"""
+import os
+import time
+
+FRAMES = 2000
+RUNS = 21
+
+def hop_inputs():
+    from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+    # Stays on the start platform forever (see test_simulation)
+    loop = [INPUT_JUMP] + [0] * 79 + [INPUT_LEFT] * 5 + [0] * 75 + [INPUT_RIGHT] * 5 + [0] * 75
+    return (loop * (FRAMES // len(loop) + 1))[:FRAMES]
+
+def frame_time(game, inputs):
+    game.reset()
+    start = time.perf_counter()
+    for step in inputs:
+        game.step(step)
+        game.draw(0.5)
+    return (time.perf_counter() - start) / len(inputs)
+
+def ghost_time(game, run):
+    from ghost import Ghost
+    ghost = Ghost(game, run)
+    screen = game.screen
+    start = time.perf_counter()
+    for _ in range(run.steps - 1):
+        ghost.update()
+        ghost.interpolate(0.5)
+        screen.blit(ghost.image, ghost.rect)
+    return (time.perf_counter() - start) / (run.steps - 1)
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from main import Game
+    from ghost import GhostRecorder
+    from simulation import Simulation
+
+    # Open the window first, so every frame is converted to the display format
+    game = Game()
+    game.best_ghost = None
+    inputs = hop_inputs()
+    sim = Simulation()
+    sim.reset()
+    recorder = GhostRecorder.for_game(sim.game)
+    for _ in sim.run(inputs):
+        recorder.record(sim.game.player)
+    run = recorder.run(0)
+
+    frame = min(frame_time(game, inputs) for _ in range(RUNS))
+    ghost = min(ghost_time(game, run) for _ in range(RUNS))
+    print(f"{FRAMES} frames, best of {RUNS} runs:")
+    print(f"  frame without ghost: {frame * 1e6:8.1f} us")
+    print(f"  ghost's own work:    {ghost * 1e6:8.1f} us  ({ghost / frame * 100:.1f}% of the frame)")
@@ -0,0 +1,58 @@
+"""
+Platform storage at 100,000 platforms (a fifth of them moving): memory
+held by Platform sprites in a PlatformGroup against a PlatformStore, and
+the time to move every moving platform one step. Requires numpy.
+
+    python -m benchmarks.bench_platform_store
+"""
+import os
+import random
+import time
+import tracemalloc
+
+COUNT = 100_000
+MOVING_SHARE = 0.2
+STEPS = 20
+
+def specs(rng):
+    return [(rng.randrange(20_000), rng.randrange(20_000), rng.randint(50, 150), 20, rng.random() < MOVING_SHARE)
+            for _ in range(COUNT)]
+
+def traced(build):
+    """Return (result, bytes traced while building it)."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def time_steps(update):
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        update(1.0)
+    return (time.perf_counter() - start) / STEPS
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from sprites import Platform, PlatformGroup
+    from platform_store import PlatformStore
+    layout = specs(random.Random(1))
+
+    group, group_bytes = traced(lambda: PlatformGroup(*(Platform(*spec) for spec in layout)))
+    # Surface pixels live in SDL's heap, which tracemalloc can't see
+    pixel_bytes = sum(p.image.get_bytesize() * p.rect.width * p.rect.height for p in group)
+
+    def build_store():
+        store = PlatformStore(COUNT)
+        for spec in layout:
+            store.add(*spec)
+        return store
+    store, store_bytes = traced(build_store)
+
+    print(f"{COUNT} platforms, {int(COUNT * MOVING_SHARE)} moving")
+    print(f"  sprites: {group_bytes / 2**20:7.1f} MB Python objects + {pixel_bytes / 2**20:.1f} MB surface pixels")
+    print(f"  store:   {store_bytes / 2**20:7.1f} MB ({store_bytes / COUNT:.0f} bytes per platform)")
+    sprite_step = time_steps(group.update)
+    store_step = time_steps(store.update)
+    print(f"  update:  sprites {sprite_step * 1000:7.2f} ms/step, store {store_step * 1000:6.2f} ms/step "
+          f"({sprite_step / store_step:.0f}x)")
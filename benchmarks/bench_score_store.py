@@ -0,0 +1,64 @@
+"""
+SqliteStore with 1,000,000 stored scores: rank queries from the in-memory
+index against SQL COUNT, keyset pages against OFFSET pages deep into the
+board, and submission throughput.
+
+    python -m benchmarks.bench_score_store
+"""
+import os
+import random
+import tempfile
+import time
+
+COUNT = 1_000_000
+RANK_QUERIES = 10_000
+SQL_RANK_QUERIES = 20
+SUBMITS = 10_000
+
+def timed(f, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = f()
+    return result, (time.perf_counter() - start) / repeat
+
+if __name__ == "__main__":
+    from score_store import SqliteStore
+    rng = random.Random(1)
+    colors = ['[255, 255, 0]', '[255, 0, 0]', '[0, 255, 0]', '[0, 0, 255]']
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteStore(os.path.join(tmp, "scores.db"), 5)
+        rows = [(f"P{rng.randrange(1000):03}", rng.randrange(0, 100_000, 10), rng.choice(colors), "2026-10-18")
+                for _ in range(COUNT)]
+        _, elapsed = timed(lambda: store.db.executemany(
+            "INSERT INTO scores (name, score, color, day) VALUES (?, ?, ?, ?)", rows))
+        store.db.commit()
+        store.next_id = COUNT
+        print(f"{COUNT} scores bulk-loaded in {elapsed:.2f} s")
+
+        _, elapsed = timed(lambda: store.rank(50_000))
+        print(f"  rank index built in {elapsed * 1000:.0f} ms (once per board)")
+        probes = [rng.randrange(0, 100_000) for _ in range(RANK_QUERIES)]
+        _, elapsed = timed(lambda: [store.rank(p) for p in probes])
+        print(f"  rank (index):     {elapsed / RANK_QUERIES * 1e6:9.1f} us")
+        _, elapsed = timed(lambda: [store.db.execute("SELECT COUNT(*) FROM scores WHERE score > ?", (p,)).fetchone()
+                                    for p in probes[:SQL_RANK_QUERIES]])
+        print(f"  rank (SQL COUNT): {elapsed / SQL_RANK_QUERIES * 1e6:9.1f} us")
+
+        _, elapsed = timed(lambda: store.load(), repeat=100)
+        print(f"  top 5:            {elapsed * 1e6:9.1f} us")
+        deep = store.db.execute("SELECT * FROM scores ORDER BY score DESC, id LIMIT 1 OFFSET 499999").fetchone()
+        after = {'score': deep['score'], 'id': deep['id']}
+        _, elapsed = timed(lambda: store.page(20, after=after), repeat=100)
+        print(f"  page at 500k (keyset): {elapsed * 1e6:9.1f} us")
+        _, elapsed = timed(lambda: store.db.execute(
+            "SELECT * FROM scores ORDER BY score DESC, id LIMIT 20 OFFSET 500000").fetchall(), repeat=5)
+        print(f"  page at 500k (OFFSET): {elapsed * 1e6:9.1f} us")
+
+        def submit_all():
+            for i in range(SUBMITS):
+                store.submit({'name': "NEW", 'score': rng.randrange(0, 100_000, 10), 'color': (255, 255, 0)})
+        _, submit_time = timed(submit_all)
+        _, flush_time = timed(store.flush)
+        print(f"  submit: {submit_time / SUBMITS * 1e6:.1f} us each on the game thread, "
+              f"{SUBMITS / (submit_time + flush_time):.0f} scores/s written")
+        store.close()
@@ -0,0 +1,34 @@
+"""
+Headless simulation throughput: random scripted sessions of up to
+MAX_STEPS steps, run back to back on one core.
+
+    python -m benchmarks.bench_simulation
+"""
+import os
+import random
+import time
+
+SESSIONS = 500
+MAX_STEPS = 600 # 10 seconds of game time
+
+def random_inputs(rng):
+    from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+    choices = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_LEFT | INPUT_JUMP, INPUT_RIGHT | INPUT_JUMP)
+    while True:
+        yield rng.choice(choices)
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from simulation import Simulation
+    rng = random.Random(1)
+    sim = Simulation()
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        sim.reset()
+        for _ in sim.run(random_inputs(rng), max_steps=MAX_STEPS):
+            steps += 1
+    elapsed = time.perf_counter() - start
+    print(f"{SESSIONS} sessions, {steps} steps in {elapsed:.2f} s")
+    print(f"  {SESSIONS / elapsed:10.0f} sessions/s")
+    print(f"  {steps / elapsed:10.0f} steps/s")
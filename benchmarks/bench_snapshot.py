@@ -0,0 +1,63 @@
+"""
+Snapshot cost per tick: after every step the world is captured into one
+reused buffer and restored from it straight away, as a rollback client
+checking its prediction would, next to the cost of the step itself. On the
+fixed level the player hops on the start platform; on an endless level the
+climbing bot from the soak test plays, put back on a platform when the lava
+catches it.
+
+    python -m benchmarks.bench_snapshot
+"""
+import os
+import time
+
+STEPS = 20000
+
+def hop_inputs():
+    from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+    # Stays on the start platform of the fixed level (see test_simulation)
+    loop = [INPUT_JUMP] + [0] * 79 + [INPUT_LEFT] * 5 + [0] * 75 + [INPUT_RIGHT] * 5 + [0] * 75
+    while True:
+        yield from loop
+
+def measure(sim, inputs, respawn=None):
+    from snapshot import WorldSnapshot
+    game = sim.game
+    snapshot = WorldSnapshot(game)
+    clock = time.perf_counter
+    step_time = capture_time = restore_time = 0.0
+    for tick in range(STEPS):
+        start = clock()
+        game.step(next(inputs))
+        captured = clock()
+        snapshot.capture(tick)
+        restored = clock()
+        snapshot.restore()
+        end = clock()
+        step_time += captured - start
+        capture_time += restored - captured
+        restore_time += end - restored
+        if not game.playing:
+            respawn(game)
+    return step_time / STEPS, capture_time / STEPS, restore_time / STEPS, snapshot.size
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from simulation import Simulation
+    from benchmarks.bench_endless_soak import SEED, bot, respawn
+
+    fixed = Simulation()
+    fixed.reset()
+    endless = Simulation(endless=True, seed=SEED)
+    endless.reset()
+    runs = {
+        "fixed level": (fixed, hop_inputs(), None),
+        "endless level": (endless, bot(endless.game), respawn),
+    }
+    print(f"{STEPS} ticks, capture and restore after every step:")
+    for name, (sim, inputs, respawn_player) in runs.items():
+        step, capture, restore, size = measure(sim, inputs, respawn_player)
+        print(f"  {name}: {size} byte snapshots")
+        print(f"    step:    {step * 1e6:6.2f} us")
+        print(f"    capture: {capture * 1e6:6.2f} us  ({capture / step * 100:.0f}% of a step)")
+        print(f"    restore: {restore * 1e6:6.2f} us  ({restore / step * 100:.0f}% of a step)")
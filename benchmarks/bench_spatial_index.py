@@ -0,0 +1,49 @@
+"""
+Platform collision query cost: a linear spritecollide scan against the
+PlatformGroup spatial index, at 10, 1,000 and 100,000 platforms spread over
+a level that grows with the count (constant density).
+
+    python -m benchmarks.bench_spatial_index
+"""
+import os
+import random
+import time
+
+COUNTS = (10, 1_000, 100_000)
+QUERIES = 2_000
+SCAN_QUERIES = 50 # The linear scan gets slow at 100k
+
+def make_platforms(n, rng):
+    import pygame
+    side = int((n ** 0.5) * 200)
+    platforms = []
+    for _ in range(n):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randrange(side), rng.randrange(side), rng.randint(50, 150), 20)
+        sprite.moving = False
+        platforms.append(sprite)
+    return platforms, side
+
+def time_queries(query, probes):
+    start = time.perf_counter()
+    for probe in probes:
+        query(probe)
+    return (time.perf_counter() - start) / len(probes)
+
+if __name__ == "__main__":
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+    from sprites import PlatformGroup
+    rng = random.Random(1)
+    print(f"{'platforms':>10} {'scan':>12} {'grid':>12}")
+    for n in COUNTS:
+        platforms, side = make_platforms(n, rng)
+        group = PlatformGroup(*platforms)
+        probes = []
+        for _ in range(QUERIES):
+            probe = pygame.sprite.Sprite()
+            probe.rect = pygame.Rect(rng.randrange(side), rng.randrange(side), 22, 41) # player + 1px probe
+            probes.append(probe)
+        scan = time_queries(lambda p: pygame.sprite.spritecollide(p, group, False), probes[:SCAN_QUERIES])
+        grid = time_queries(lambda p: group.collide(p.rect), probes)
+        print(f"{n:>10} {scan * 1e6:>9.1f} us {grid * 1e6:>9.2f} us")
@@ -0,0 +1,60 @@
+"""
+Swept (continuous) landing detection.
+
+A falling player lands on the first platform whose top its feet cross
+during the step, at the exact time of impact along its motion, so a fast
+fall or a long step can't skip through a platform. Platforms the player
+already overlaps at the end of the step count as hit at the end of it.
+"""
+import pygame
+
+def landing_query_rect(size, start, end):
+    """Rect covering every position of a size rect moving from start to end (midbottom points)."""
+    start_rect = pygame.Rect((0, 0), size)
+    start_rect.midbottom = start
+    end_rect = pygame.Rect((0, 0), size)
+    end_rect.midbottom = end
+    swept = start_rect.union(end_rect)
+    # One more pixel, for feet that end less than half a pixel past a top
+    swept.height += 1
+    return swept
+
+def time_of_impact(size, start, end, rect, wrapped=False):
+    """
+    Fraction of the step (0 to 1) at which feet moving from start to end
+    land on rect, or None if they don't.
+    """
+    width, height = size
+    x0, y0 = start
+    x1, y1 = end
+    if y0 <= rect.top < y1:
+        t = (rect.top - y0) / (y1 - y0)
+        # Rects are placed on whole pixels, like the player's own rect
+        x = x1 if wrapped else x0 + (x1 - x0) * t
+        probe = pygame.Rect((0, 0), size)
+        probe.midbottom = (x, rect.top)
+        if probe.left < rect.right and probe.right > rect.left:
+            return t
+    end_rect = pygame.Rect((0, 0), size)
+    end_rect.midbottom = end
+    if end_rect.colliderect(rect):
+        return 1.0
+    return None
+
+def first_landing(size, start, end, platforms, wrapped=False):
+    """
+    Return (platform, time of impact) for the platform that feet moving from
+    start to end land on first, or None. Simultaneous hits go to the highest
+    top, then to a platform over the floor, then to the earliest in platforms.
+    """
+    best = None
+    best_key = None
+    for platform in platforms:
+        t = time_of_impact(size, start, end, platform.rect, wrapped)
+        if t is None:
+            continue
+        key = (t, platform.rect.top, getattr(platform, 'is_floor', False))
+        if best is None or key < best_key:
+            best = (platform, t)
+            best_key = key
+    return best
@@ -0,0 +1,49 @@
+"""
+Player contacts with the level, solved once per step.
+
+After the sprites move, solve_contact() runs the one collision query of
+the step and records what the player is standing on. Jumping, scoring and
+moving-platform carry all read the result instead of querying again.
+"""
+from collision import landing_query_rect, first_landing
+
+class Contact:
+    """What the player stood on at the end of the last step."""
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.grounded = False
+        self.support = None
+        # Downward speed when the player hit the support
+        self.impact_velocity = 0.0
+
+    def set(self, support, impact_velocity):
+        self.grounded = True
+        self.support = support
+        self.impact_velocity = impact_velocity
+
+    @property
+    def carry_velocity(self):
+        """Horizontal speed the support gives the player, per physics step."""
+        if self.support is not None and getattr(self.support, 'moving', False):
+            return self.support.velocity
+        return 0.0
+
+def solve_contact(player, platforms, screen_width):
+    """
+    Update player.contact for the step that just ran. Only a falling
+    player can land; its support is the first platform top its feet crossed.
+    """
+    contact = player.contact
+    contact.clear()
+    if player.vel.y <= 0:
+        return contact
+    size = player.rect.size
+    start, end = player.prev_pos, player.pos
+    candidates = platforms.collide(landing_query_rect(size, start, end))
+    wrapped = abs(end.x - start.x) > screen_width / 2
+    hit = first_landing(size, start, end, candidates, wrapped)
+    if hit is not None:
+        contact.set(hit[0], player.vel.y)
+    return contact
@@ -0,0 +1,32 @@
+import pygame
+
+# Input bits for one simulation step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+
+LEFT_KEYS = (pygame.K_LEFT, pygame.K_a)
+RIGHT_KEYS = (pygame.K_RIGHT, pygame.K_d)
+JUMP_KEYS = (pygame.K_SPACE, pygame.K_UP, pygame.K_w)
+
+class KeyboardControls:
+    """Reads the held movement keys from the keyboard."""
+    def held(self):
+        keys = pygame.key.get_pressed()
+        inputs = 0
+        if any(keys[k] for k in LEFT_KEYS):
+            inputs |= INPUT_LEFT
+        if any(keys[k] for k in RIGHT_KEYS):
+            inputs |= INPUT_RIGHT
+        return inputs
+
+class InputState:
+    """
+    Input set by the caller for each simulation step, so the game can be
+    driven without a keyboard (headless simulation, replays, bots).
+    """
+    def __init__(self, inputs=0):
+        self.inputs = inputs
+
+    def held(self):
+        return self.inputs
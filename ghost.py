@@ -0,0 +1,278 @@
+"""
+Ghost runs: the player's path through a game, kept so later games can race
+a translucent copy of it.
+
+A GhostRecorder takes the player's position and animation frame after every
+simulation step. Positions are fixed point, in 1/SUBPIXELS of a pixel. Every
+KEYFRAME_INTERVAL steps there is a keyframe holding the full state; the
+steps in between only hold how far the player moved since the step before
+(zigzag varints) and the frame. The keyframe offsets are indexed after the
+header, so any step is reached by decoding one keyframe and at most
+KEYFRAME_INTERVAL - 1 deltas, however long the run.
+
+File layout:
+
+    b"PLGH", format version (u8)
+    header length (u32 LE), header (JSON: score, steps, colour, tick rate, level)
+    keyframe count (u32 LE), keyframe offsets into the body (u32 LE each)
+    body, one entry per step:
+        keyframe: x, y (i32 LE), frame (u8)
+        delta:    dx, dy (zigzag varints), frame (u8)
+
+The frame byte packs the animation clip, the facing and the frame of the clip.
+"""
+import json
+import os
+import struct
+import pygame
+from typing import NamedTuple
+from settings import *
+from sprites import get_player_clips
+from assets import prepare_surface
+from replay import game_header, encode_varint, decode_varint
+
+MAGIC = b"PLGH"
+FORMAT_VERSION = 1
+KEYFRAME_INTERVAL = 60
+SUBPIXELS = 8
+CLIPS = ('idle', 'walk', 'jump')
+CLIP_IDS = {name: i for i, name in enumerate(CLIPS)}
+KEYFRAME = struct.Struct("<iiB")
+
+# Maps color -> {clip name: (frames facing right, frames facing left)}
+_ghost_frame_cache = {}
+
+class GhostState(NamedTuple):
+    """Where the ghost is at a step, and the player frame it shows."""
+    x: float
+    y: float
+    clip: str
+    facing: int
+    frame: int
+
+def pack_frame(animator):
+    clip = animator.clip
+    frame = (animator.tick // clip.ticks_per_frame) % len(clip)
+    return CLIP_IDS[animator.clip_name] | animator.facing << 2 | frame << 3
+
+def zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+class GhostRecorder:
+    """Keeps the run of the game being played in memory."""
+    def __init__(self, header):
+        self.header = header
+        self.body = bytearray()
+        self.index = []
+        self.steps = 0
+        self.x = self.y = 0
+
+    @classmethod
+    def for_game(cls, game):
+        """Record game, just reset, starting from the player's spawn."""
+        recorder = cls(game_header(game))
+        recorder.record(game.player)
+        return recorder
+
+    def record(self, player):
+        x = round(player.pos.x * SUBPIXELS)
+        y = round(player.pos.y * SUBPIXELS)
+        frame = pack_frame(player.animator)
+        if self.steps % KEYFRAME_INTERVAL == 0:
+            self.index.append(len(self.body))
+            self.body += KEYFRAME.pack(x, y, frame)
+        else:
+            self.body += encode_varint(zigzag(x - self.x))
+            self.body += encode_varint(zigzag(y - self.y))
+            self.body.append(frame)
+        self.x = x
+        self.y = y
+        self.steps += 1
+
+    def run(self, score):
+        """The run so far, for a game that ended on score."""
+        header = dict(self.header, score=score, steps=self.steps, keyframe_interval=KEYFRAME_INTERVAL)
+        return GhostRun(header, list(self.index), bytes(self.body))
+
+class GhostRun:
+    """A stored run: header, keyframe index and body."""
+    def __init__(self, header, index, body):
+        self.header = header
+        self.index = index
+        self.body = body
+
+    @property
+    def score(self):
+        return self.header['score']
+
+    @property
+    def steps(self):
+        return self.header['steps']
+
+    @classmethod
+    def parse(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a ghost run")
+        version, length = struct.unpack_from("<BI", data, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ghost format {version}")
+        pos = 9 + length
+        header = json.loads(data[9:pos])
+        (count,) = struct.unpack_from("<I", data, pos)
+        index = list(struct.unpack_from(f"<{count}I", data, pos + 4))
+        return cls(header, index, data[pos + 4 + 4 * count:])
+
+    def to_bytes(self):
+        header = json.dumps(self.header).encode()
+        return b"".join((MAGIC, struct.pack("<BI", FORMAT_VERSION, len(header)), header,
+                         struct.pack(f"<I{len(self.index)}I", len(self.index), *self.index), self.body))
+
+    def save(self, filename):
+        """Replace filename with this run, so readers never see a partial file."""
+        temp = filename + ".tmp"
+        with open(temp, 'wb') as f:
+            f.write(self.to_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, filename)
+
+    def matches(self, game):
+        """Whether this run was played on game's level at game's tick rate."""
+        header = game_header(game)
+        return all(self.header.get(key) == header[key] for key in ('tick_rate', 'endless', 'seed'))
+
+    def state(self, step):
+        """The ghost's state at step, without decoding the steps before its keyframe."""
+        return GhostPlayback(self, step).state
+
+def load_ghost(filename):
+    """The run stored in filename, or None if there is none (or it can't be read)."""
+    try:
+        with open(filename, 'rb') as f:
+            return GhostRun.parse(f.read())
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+class GhostPlayback:
+    """Decodes a run one step at a time, from any step."""
+    def __init__(self, run, step=0):
+        self.run = run
+        self.interval = run.header['keyframe_interval']
+        self.seek(step)
+
+    def seek(self, step):
+        """Jump to step (clamped to the run)."""
+        run = self.run
+        step = max(0, min(step, run.steps - 1))
+        keyframe = step // self.interval
+        self.x, self.y, self.frame = KEYFRAME.unpack_from(run.body, run.index[keyframe])
+        self.pos = run.index[keyframe] + KEYFRAME.size
+        self.step = keyframe * self.interval
+        while self.step < step:
+            self.advance()
+
+    def advance(self):
+        """Move on one step. Returns False at the end of the run."""
+        if self.step + 1 >= self.run.steps:
+            return False
+        self.step += 1
+        body = self.run.body
+        if self.step % self.interval == 0:
+            self.x, self.y, self.frame = KEYFRAME.unpack_from(body, self.pos)
+            self.pos += KEYFRAME.size
+        else:
+            # Moves under 8 pixels a step take one byte; only decode varints past that
+            pos = self.pos
+            dx = body[pos]
+            if dx < 0x80:
+                pos += 1
+            else:
+                dx, pos = decode_varint(body, pos)
+            dy = body[pos]
+            if dy < 0x80:
+                pos += 1
+            else:
+                dy, pos = decode_varint(body, pos)
+            self.x += (dx >> 1) ^ -(dx & 1)
+            self.y += (dy >> 1) ^ -(dy & 1)
+            self.frame = body[pos]
+            self.pos = pos + 1
+        return True
+
+    @property
+    def state(self):
+        frame = self.frame
+        return GhostState(self.x / SUBPIXELS, self.y / SUBPIXELS, CLIPS[frame & 3], frame >> 2 & 1, frame >> 3)
+
+def get_ghost_frames(color):
+    """Translucent copies of the player frames for color, made once."""
+    key = tuple(color)
+    frames = _ghost_frame_cache.get(key)
+    if frames is None:
+        frames = {}
+        for name, clip in get_player_clips(color).items():
+            frames[name] = tuple(tuple(translucent(image) for image in table) for table in clip.frames)
+        _ghost_frame_cache[key] = frames
+    return frames
+
+def translucent(image):
+    """A copy of image with GHOST_ALPHA multiplied into its alpha channel."""
+    # Per-pixel alpha only: a surface alpha on top would take a slower blit path
+    ghost = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    ghost.blit(image, (0, 0))
+    ghost.fill((255, 255, 255, GHOST_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+    ghost = prepare_surface(ghost)
+    # Run-length encoded, so the transparent parts around the player cost nothing to blit
+    ghost.set_alpha(255, pygame.RLEACCEL)
+    return ghost
+
+class Ghost(pygame.sprite.DirtySprite):
+    """
+    A translucent player following a GhostRun, one step per update(), drawn
+    with the sprites. It leaves the sprite groups when the run ends.
+    """
+    def __init__(self, game, run):
+        super().__init__()
+        self.game = game
+        self.frames = get_ghost_frames(run.header['color'])
+        self.playback = GhostPlayback(run)
+        self.image = self.frames['idle'][0][0]
+        self.rect = self.image.get_rect()
+        # Moves every step, so always redraw it in dirty-rect mode
+        self.dirty = 2
+        self.prev_x = self.playback.x
+        self.prev_y = self.playback.y
+        self.show()
+
+    def update(self, dt=1.0):
+        playback = self.playback
+        self.prev_x = playback.x
+        self.prev_y = playback.y
+        if not playback.advance():
+            self.kill()
+            return
+        self.show()
+
+    def seek(self, step):
+        """Jump to step of the run."""
+        self.playback.seek(step)
+        self.prev_x = self.playback.x
+        self.prev_y = self.playback.y
+        self.show()
+
+    def show(self):
+        playback = self.playback
+        frame = playback.frame
+        self.image = self.frames[CLIPS[frame & 3]][frame >> 2 & 1][frame >> 3]
+        self.rect.midbottom = (playback.x / SUBPIXELS, playback.y / SUBPIXELS)
+
+    def interpolate(self, alpha):
+        """Place the rect alpha of the way through the last step, like Player.interpolate."""
+        x, y = self.playback.x, self.playback.y
+        if alpha < 1.0 and abs(x - self.prev_x) <= self.game.screen_width * SUBPIXELS / 2:
+            x = self.prev_x + (x - self.prev_x) * alpha
+            y = self.prev_y + (y - self.prev_y) * alpha
+        self.rect.midbottom = (x / SUBPIXELS, y / SUBPIXELS)
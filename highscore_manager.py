@@ -1,32 +1,64 @@
-import json
-import os
+from settings import HIGHSCORE_BACKEND, LEADERBOARD_URL, LEADERBOARD_TTL
+from score_store import JournalStore, SqliteStore
+from remote_leaderboard import RemoteStore
 
 HIGHSCORE_FILE = "highscores.json"
+HIGHSCORE_DB = "highscores.db"
+LEADERBOARD_OUTBOX = "leaderboard_outbox.jsonl"
+LEADERBOARD_CACHE = "leaderboard_cache.json"
 MAX_SCORES = 5
 
+def open_store(backend=HIGHSCORE_BACKEND):
+    """
+    The store for a backend name: "json" keeps the top MAX_SCORES in
+    HIGHSCORE_FILE, "sqlite" keeps every run in HIGHSCORE_DB, importing
+    HIGHSCORE_FILE the first time, and "remote" shares the board on the
+    leaderboard server at LEADERBOARD_URL.
+    """
+    if backend == "remote":
+        return RemoteStore(LEADERBOARD_URL, MAX_SCORES, LEADERBOARD_OUTBOX, LEADERBOARD_CACHE, LEADERBOARD_TTL)
+    if backend == "sqlite":
+        store = SqliteStore(HIGHSCORE_DB, MAX_SCORES)
+        store.import_json(HIGHSCORE_FILE)
+        return store
+    if backend == "json":
+        return JournalStore(HIGHSCORE_FILE, MAX_SCORES)
+    raise ValueError(f"Unknown high score backend: {backend!r}")
+
 class HighScoreManager:
     """
     Manages loading, saving, and updating the high score leaderboard.
+    The table lives in memory; the store writes it to disk in the background.
     """
-    def __init__(self, filename=HIGHSCORE_FILE):
+    def __init__(self, filename=HIGHSCORE_FILE, store=None):
         self.filename = filename
+        self.store = store if store is not None else JournalStore(filename, MAX_SCORES)
         self.scores = self.load_scores()
 
     def load_scores(self):
-        if not os.path.exists(self.filename):
-            return []
-        try:
-            with open(self.filename, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
+        return self.store.load()
 
     def save_scores(self):
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.scores, f)
-        except IOError:
-            pass # Handle error appropriately ensuring game doesn't crash
+        """Queue a write of the whole table. Returns immediately."""
+        self.store.save(self.scores)
+
+    def poll(self):
+        """Pick up a table changed elsewhere (on a shared board). Never blocks."""
+        latest = self.store.poll()
+        if latest is not None:
+            self.scores = latest
+
+    def rank(self, score):
+        """The place score would take on the leaderboard (1 is the top)."""
+        return self.store.rank(score)
+
+    def flush(self):
+        """Block until every score added so far is safely on disk."""
+        self.store.flush()
+
+    def close(self):
+        """Flush and stop the background writer. Call before exiting."""
+        self.store.close()
 
     def is_high_score(self, score):
         if score <= 0:
@@ -38,10 +70,11 @@ class HighScoreManager:
 
     def add_score(self, name, score, color=(255, 255, 255)):
         # Add new score
-        self.scores.append({'name': name, 'score': score, 'color': color})
+        entry = {'name': name, 'score': score, 'color': color}
+        self.scores.append(entry)
         # Sort descending by score
         self.scores.sort(key=lambda x: x['score'], reverse=True)
         # Keep top 5
         self.scores = self.scores[:MAX_SCORES]
-        # Save
-        self.save_scores()
+        # Journaled in the background, so this never costs a frame
+        self.store.submit(entry)
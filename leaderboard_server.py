@@ -0,0 +1,127 @@
+"""
+Reference leaderboard server for RemoteStore: one shared table in memory,
+served as JSON over HTTP/1.1 keep-alive. Enough to run several cabinets (or
+the tests) against one board on a local network or loopback.
+
+    GET  /top?n=5                      -> {"scores": [entry, ...]}, best first
+    POST /scores {"scores": [entry...]} -> {"accepted": count}
+
+Entries carry a client-made "uid"; an entry sent again (a retry after a lost
+response) is accepted once.
+
+    python leaderboard_server.py [port]
+"""
+import bisect
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+DEFAULT_PORT = 8765
+MAX_TOP = 100
+
+class LeaderboardServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.lock = threading.Lock()
+        # (-score, arrival) keys, kept sorted, and the entries in the same order
+        self.keys = []
+        self.entries = []
+        self.uids = set()
+        self.arrivals = 0
+        # Counters, so tests can see batching and connection reuse
+        self.connections = 0
+        self.batches = 0
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self))
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        # Short poll interval, so stop() doesn't keep the caller waiting
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def add(self, entries):
+        accepted = 0
+        with self.lock:
+            self.batches += 1
+            for entry in entries:
+                uid = entry.get('uid')
+                if uid is not None and uid in self.uids:
+                    continue
+                self.uids.add(uid)
+                self.arrivals += 1
+                key = (-entry['score'], self.arrivals)
+                i = bisect.bisect(self.keys, key)
+                self.keys.insert(i, key)
+                self.entries.insert(i, entry)
+                accepted += 1
+        return accepted
+
+    def top(self, n):
+        with self.lock:
+            return self.entries[:n]
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so clients can reuse their connections
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with server.lock:
+                server.connections += 1
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path != "/top":
+                return self.reply(404, {"error": "not found"})
+            try:
+                n = min(int(parse_qs(url.query).get('n', ['5'])[0]), MAX_TOP)
+            except ValueError:
+                return self.reply(400, {"error": "bad n"})
+            self.reply(200, {"scores": server.top(n)})
+
+        def do_POST(self):
+            if self.path != "/scores":
+                return self.reply(404, {"error": "not found"})
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                entries = [dict(name=str(e['name']), score=int(e['score']), color=e.get('color'), uid=e.get('uid'))
+                           for e in body['scores']]
+            except (ValueError, KeyError, TypeError):
+                return self.reply(400, {"error": "bad scores"})
+            self.reply(200, {"accepted": server.add(entries)})
+
+        def reply(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass # Quiet; this runs next to the game
+
+    return Handler
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    server = LeaderboardServer("0.0.0.0", port)
+    print(f"Leaderboard on port {port}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,158 @@
+"""
+Endless mode: a seeded generator that lays the level out in fixed-size
+chunks of platform rows, the camera that scrolls up through it, and the
+streamer that keeps only the chunks around the camera alive.
+"""
+import random
+from collections import deque
+from settings import *
+
+START_Y = SCREEN_HEIGHT - 120 # Top of the starting platform
+CHUNK_HEIGHT = CHUNK_ROWS * ROW_SPACING
+LAVA_HEIGHT = 40
+PLATFORM_HEIGHT = 20
+
+class LevelGenerator:
+    """
+    Platform layouts per chunk. Chunk i holds rows i * CHUNK_ROWS + 1 up to
+    (i + 1) * CHUNK_ROWS above the starting platform, and only depends on the
+    seed and i, so chunks can be generated in any order and always come out
+    the same.
+    """
+    def __init__(self, seed):
+        self.seed = seed
+
+    def anchor(self, index):
+        """Where the path of reachable platforms crosses into chunk index."""
+        return random.Random(f"{self.seed}:anchor:{index}").uniform(0, SCREEN_WIDTH)
+
+    def chunk(self, index):
+        """Return (x, y, w, h, moving) for every platform in chunk index, lowest row first."""
+        rng = random.Random(f"{self.seed}:chunk:{index}")
+        start, end = self.anchor(index), self.anchor(index + 1)
+        # Take the short way round, the screen wraps
+        span = (end - start + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+        specs = []
+        if index == 0:
+            specs.append((clamp_x(start - 75, 150), START_Y, 150, PLATFORM_HEIGHT, False))
+
+        for row in range(1, CHUNK_ROWS + 1):
+            y = START_Y - (index * CHUNK_ROWS + row) * ROW_SPACING + rng.randint(-15, 15)
+            # One platform on the path, in reach of the path platform below
+            w = rng.randint(70, 150)
+            moving = rng.random() < 0.2
+            center = (start + span * row / CHUNK_ROWS + rng.uniform(-60, 60)) % SCREEN_WIDTH
+            x = clamp_x(center - w / 2, w * 2 if moving else w)
+            specs.append((x, y, w, PLATFORM_HEIGHT, moving))
+            # Sometimes a spare one elsewhere on the row
+            if rng.random() < 0.5:
+                spare_w = rng.randint(60, 120)
+                spare_x = rng.randint(0, SCREEN_WIDTH - spare_w)
+                if spare_x + spare_w < x or spare_x > x + (w * 2 if moving else w):
+                    specs.append((spare_x, y, spare_w, PLATFORM_HEIGHT, False))
+        return specs
+
+def clamp_x(x, span):
+    """Keep a platform (and the track of a moving one) on screen."""
+    return round(min(max(x, 0), SCREEN_WIDTH - span))
+
+class Camera:
+    """
+    Vertical camera. top is the world y at the top of the screen. It only
+    ever moves up: with the player, and at least LAVA_SPEED per step.
+    """
+    def __init__(self, top=0.0):
+        self.top = self.prev_top = top
+
+    def update(self, target_y, dt=1.0):
+        self.prev_top = self.top
+        self.top = min(self.top - LAVA_SPEED * dt, target_y - SCREEN_HEIGHT * CAMERA_FOLLOW)
+
+    def offset(self, alpha=1.0):
+        """Whole-pixel screen offset, alpha of the way from the previous step to the current one."""
+        return round(self.prev_top + (self.top - self.prev_top) * alpha)
+
+    @property
+    def lava_y(self):
+        return self.top + SCREEN_HEIGHT - LAVA_HEIGHT
+
+class EndlessLevel:
+    """
+    Streams chunks into the game ahead of the camera and evicts them once
+    they have sunk below the lava, so only a few chunks exist at any time
+    however long the run lasts.
+    """
+    def __init__(self, game, seed):
+        self.game = game
+        self.seed = seed
+        self.generator = LevelGenerator(seed)
+        self.camera = Camera()
+        # (chunk index, platforms), lowest chunk first
+        self.chunks = deque()
+        self.next_chunk = 0
+
+        # The lava is the floor, always at the bottom of the screen
+        pool = game.platform_pool
+        self.lava = pool.acquire(0, self.camera.lava_y, SCREEN_WIDTH, LAVA_HEIGHT, is_floor=True)
+        game.add_platform(self.lava)
+        self.stream()
+        self.start_platform = self.chunks[0][1][0]
+
+    def update(self):
+        """Scroll the camera and lava for this step, then stream chunks in and out."""
+        self.camera.update(self.game.player.pos.y, self.game.dt)
+        self.lava.rect.y = self.camera.lava_y
+        self.game.platforms.refresh(self.lava)
+        self.stream()
+
+    def swallowed(self, player):
+        """Whether the lava has risen above the player's feet."""
+        return player.pos.y > self.lava.rect.top
+
+    def stream(self):
+        """Generate chunks up to CHUNK_LOOKAHEAD above the screen, evict chunks sunk in the lava."""
+        limit = self.camera.top - CHUNK_LOOKAHEAD * CHUNK_HEIGHT
+        while START_Y - self.next_chunk * CHUNK_HEIGHT > limit:
+            self.add_chunk()
+
+        lava_top = self.lava.rect.top
+        while self.chunks and all(p.rect.top > lava_top for p in self.chunks[0][1]):
+            self.evict_chunk()
+
+    def add_chunk(self):
+        platforms = [self.game.platform_pool.acquire(*spec) for spec in self.generator.chunk(self.next_chunk)]
+        for platform in platforms:
+            self.game.add_platform(platform)
+        self.chunks.append((self.next_chunk, platforms))
+        self.next_chunk += 1
+
+    def evict_chunk(self):
+        _, platforms = self.chunks.popleft()
+        for platform in platforms:
+            if platform is self.game.last_platform:
+                # The pool may hand it out again as a new platform, which should still score
+                self.game.last_platform = None
+            # Takes it out of the level, and keeps it for the next chunk
+            self.game.platform_pool.release(platform)
+
+    @property
+    def first_chunk(self):
+        """Index of the lowest chunk still in the level."""
+        return self.chunks[0][0] if self.chunks else self.next_chunk
+
+    def platforms(self):
+        """The lava, then every chunk's platforms, lowest chunk first."""
+        return [self.lava] + [p for _, platforms in self.chunks for p in platforms]
+
+    def load_chunks(self, first, end):
+        """
+        Make chunks first to end - 1 the ones in the level, freshly generated
+        (see snapshot.py). Nothing changes if they already are.
+        """
+        if self.first_chunk == first and self.next_chunk == end:
+            return
+        while self.chunks:
+            self.evict_chunk()
+        self.next_chunk = first
+        while self.next_chunk < end:
+            self.add_chunk()
@@ -1,90 +1,270 @@
+from startup import startup_timer, init_pygame
 import pygame
 import sys
+import random
 from settings import *
 from sprites import *
-from highscore_manager import HighScoreManager
+from contacts import solve_contact
+from level_gen import EndlessLevel
+from controls import KeyboardControls, InputState, INPUT_JUMP, JUMP_KEYS
+from highscore_manager import HighScoreManager, open_store
+from rendering import TextRenderer, StaticLayer
+from assets import load_asset
+from preload import BackgroundLoader
+from replay import InputRecorder
+from ghost import Ghost, GhostRecorder, load_ghost
+from scenes import SceneScheduler, ColorSelectScene, DelayScene, WaitForKeyScene, NameEntryScene, GameOverScene
+
+startup_timer.mark("import game modules")
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False):
         # Initialize game window, etc
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(SCREEN_TITLE)
+        # A headless game has no window, clock or keyboard and is only
+        # advanced through step() (see simulation.py)
+        self.headless = headless
+        if headless:
+            self.screen = None
+        else:
+            init_pygame()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(SCREEN_TITLE)
+            startup_timer.mark("open window")
+        self.startup_report = STARTUP_REPORT
         self.clock = pygame.time.Clock()
+        self.scheduler = SceneScheduler(self)
         self.running = True
         self.screen_width = SCREEN_WIDTH
         self.screen_height = SCREEN_HEIGHT
-        self.hs_manager = HighScoreManager()
+        self.hs_manager = HighScoreManager(store=open_store(HIGHSCORE_BACKEND))
+        self.text_renderer = TextRenderer(font_cache_file=FONT_CACHE_FILE)
+        self.dirty_rendering = DIRTY_RECT_RENDERING and not headless
+        self.static_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.player_color = YELLOW
         self.last_platform = None
+        # Endless mode streams a generated level instead of build_level()
+        self.endless = ENDLESS_MODE
+        self.level_seed = LEVEL_SEED
+        self.level = None
+        # Platforms and their surfaces are recycled across restarts
+        self.platform_pool = PlatformPool()
+        self.platforms = PlatformGroup()
+        self.keyboard = KeyboardControls()
+        # Inputs of the current simulation step, read by the player
+        self.input = InputState()
+        self.pending_inputs = 0
+        # Set while a game's inputs are being recorded (see replay.py)
+        self.record_replays = RECORD_REPLAYS
+        self.recorder = None
+        # The run of the top score, raced as a ghost, and the run being played
+        self.ghosts = GHOSTS and not headless
+        self.best_ghost = load_ghost(GHOST_FILE) if self.ghosts else None
+        self.ghost = None
+        self.ghost_recorder = None
+        self.set_tick_rate(SIM_TICK_RATE)
+
+    def set_tick_rate(self, tick_rate):
+        """Run the simulation at tick_rate fixed steps per second."""
+        self.tick_rate = tick_rate
+        self.step_ms = 1000 / tick_rate
+        # Physics constants are tuned per step at PHYSICS_BASE_RATE
+        self.dt = PHYSICS_BASE_RATE / tick_rate
 
     def new(self):
         # Start a new game
+        self.reset()
+        if self.record_replays:
+            self.recorder = InputRecorder.start(self, REPLAY_DIR)
+        try:
+            self.run()
+        finally:
+            if self.recorder is not None:
+                self.recorder.close(self.score)
+                self.recorder = None
+        self.keep_ghost()
+
+    def reset(self):
+        """Build a fresh level without starting the game loop."""
         self.score = 0
-        self.all_sprites = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
+        self.playing = True
+        self.pending_inputs = 0
+        # Hand the previous level's platforms back to the pool
+        self.platform_pool.release_all(self.platforms)
+        # The scrolling endless level is always redrawn in full
+        dirty = self.dirty_rendering and not self.endless
+        if dirty:
+            self.all_sprites = pygame.sprite.LayeredDirty()
+        else:
+            self.all_sprites = pygame.sprite.Group()
         
-        self.player = Player(self, self.player_color)
+        self.player = Player(self, self.player_color, controls=self.input)
         self.all_sprites.add(self.player)
 
-        # Create some platforms
-        p1 = Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, is_floor=True) # Floor
-        
-        # Starting platform near left, just above lava
-        p_start = Platform(50, SCREEN_HEIGHT - 120, 150, 20)
-        
-        p2 = Platform(SCREEN_WIDTH / 2 - 50, SCREEN_HEIGHT * 3 / 4, 100, 20)
-        p3 = Platform(125, SCREEN_HEIGHT - 350, 100, 20, moving=True)
-        p4 = Platform(350, 200, 100, 20)
-        
-        self.platforms.add(p1, p_start, p2, p3, p4)
-        self.all_sprites.add(p1, p_start, p2, p3, p4)
+        if self.endless:
+            # Platforms scroll with the camera, so none go in the static layer
+            self.platforms = PlatformGroup()
+            seed = self.level_seed if self.level_seed is not None else random.randrange(2 ** 32)
+            self.level = EndlessLevel(self, seed)
+            p_start = self.level.start_platform
+        else:
+            self.level = None
+            self.platforms = PlatformGroup(on_change=self.static_layer.invalidate)
+            # Create some platforms
+            platforms, p_start = build_level(self.platform_pool)
+            for p in platforms:
+                self.add_platform(p)
+        # Bake the floor and stationary platforms into the background
+        if not self.headless:
+            self.static_layer.bake(self.platforms if self.level is None else [])
+
+        # HUD labels only go through the sprite pipeline in dirty-rect mode
+        if dirty:
+            self.score_label = HudLabel(self.text_renderer, 22, (SCREEN_WIDTH / 2, 15))
+            self.hs_label = HudLabel(self.text_renderer, 22, (SCREEN_WIDTH - 10, 15), align="topright")
+            self.all_sprites.add(self.score_label, self.hs_label)
         
         # Set player position to start on the safe platform
         # Place directly on top to prevent "falling" logic from triggering score on spawn
-        self.player.pos = pygame.math.Vector2(p_start.rect.centerx, p_start.rect.top)
+        self.player.pos.update(p_start.rect.centerx, p_start.rect.top)
+        self.player.prev_pos.update(self.player.pos)
+        self.player.rect.midbottom = self.player.pos
+        self.player.contact.set(p_start, 0.0)
         self.last_platform = p_start
-        
-        self.run()
+
+        self.ghost = None
+        self.ghost_recorder = None
+        if self.ghosts:
+            self.start_ghosts()
+
+    def start_ghosts(self):
+        """Race the top score's run, if it was played on this level, and record this one."""
+        run = self.best_ghost
+        scores = self.hs_manager.scores
+        if run is not None and scores and run.score == scores[0]['score'] and run.matches(self):
+            self.ghost = Ghost(self, run)
+            self.all_sprites.add(self.ghost)
+        self.ghost_recorder = GhostRecorder.for_game(self)
+
+    def keep_ghost(self):
+        """Keep the run just played if it beat the top score, for later games to race."""
+        if self.ghost_recorder is None:
+            return
+        scores = self.hs_manager.scores
+        if self.score > 0 and (not scores or self.score > scores[0]['score']):
+            self.best_ghost = self.ghost_recorder.run(self.score)
+            try:
+                self.best_ghost.save(GHOST_FILE)
+            except OSError:
+                pass # Still raced for the rest of this session
+        self.ghost_recorder = None
+
+    def add_platform(self, platform):
+        """
+        Add a platform to the level. Moving platforms are drawn as sprites,
+        stationary ones are baked into the static layer, except in endless
+        mode where every platform scrolls and is drawn as a sprite.
+        """
+        self.platforms.add(platform)
+        if platform.moving or self.endless:
+            self.all_sprites.add(platform)
+
+    def world_platforms(self):
+        """Every platform in the level, in an order that only depends on the level's state."""
+        if self.level is not None:
+            return self.level.platforms()
+        return self.platforms.sprites()
+
+    def remove_platform(self, platform):
+        """
+        Remove a platform from the level. Removing a stationary platform
+        (also through self.platforms directly) invalidates the static layer.
+        After moving a stationary platform, call self.platforms.refresh(platform)
+        and self.static_layer.invalidate().
+        """
+        platform.remove(self.platforms, self.all_sprites)
 
     def run(self):
-        # Game Loop
+        """
+        Game Loop. The simulation advances in fixed steps of step_ms, as many
+        as the elapsed time calls for, and every frame renders the state
+        interpolated between the last two steps. A slow machine renders fewer
+        frames instead of slowing the game down, up to MAX_CATCH_UP_STEPS
+        steps per frame.
+        """
         self.playing = True
+        accumulator = 0.0
         while self.playing:
-            self.clock.tick(FPS)
+            accumulator += self.clock.tick(FPS)
             self.events()
-            self.update()
-            self.draw()
+            steps = 0
+            while self.playing and accumulator >= self.step_ms:
+                if steps == MAX_CATCH_UP_STEPS:
+                    # Too far behind to catch up, drop the backlog
+                    accumulator %= self.step_ms
+                    break
+                self.step(self.poll_inputs())
+                accumulator -= self.step_ms
+                steps += 1
+            self.draw(min(1.0, accumulator / self.step_ms))
+
+    def poll_inputs(self):
+        """Inputs for the next step: held keys plus jumps pressed since the last step."""
+        inputs = self.keyboard.held() | self.pending_inputs
+        self.pending_inputs = 0
+        return inputs
+
+    def step(self, inputs=0):
+        """
+        Advance the simulation one fixed step with a mask of INPUT_* bits.
+        The interactive loop and headless simulations both go through here.
+        """
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        self.input.inputs = inputs
+        if inputs & INPUT_JUMP:
+            self.player.jump()
+        self.update()
+        if self.ghost_recorder is not None:
+            self.ghost_recorder.record(self.player)
 
     def update(self):
-        # Game Loop - Update
-        self.all_sprites.update()
+        # Game Loop - Update, one fixed simulation step
+        self.all_sprites.update(self.dt)
+        if self.level is not None:
+            # Scroll, raise the lava and stream chunks before the contact query
+            self.level.update()
+            if self.level.swallowed(self.player):
+                # The lava rose over the player's feet (Game Over)
+                self.playing = False
+                return
         
-        # Check if player hits a platform - only if falling
-        if self.player.vel.y > 0:
-            hits = pygame.sprite.spritecollide(self.player, self.platforms, False)
-            if hits:
-                # Check for floor (Game Over)
-                if getattr(hits[0], 'is_floor', False):
-                    self.playing = False
-                    return
+        # The one collision query of the step: what is the player standing on now?
+        contact = solve_contact(self.player, self.platforms, self.screen_width)
+        if contact.grounded:
+            # Check for floor (Game Over)
+            if getattr(contact.support, 'is_floor', False):
+                self.playing = False
+                return
+            self.land(contact)
 
-                self.player.pos.y = hits[0].rect.top
-                
-                # Only score if we were actually falling (more than just gravity adjustment)
-                # AND if we land on a different platform
-                if self.player.vel.y > PLAYER_GRAVITY:
-                    if hits[0] != self.last_platform:
-                        self.score += SCORE_PER_PLATFORM
-                        self.last_platform = hits[0]
-
-                self.player.vel.y = 0
-                
-                # If platform is moving, move player with it
-                if getattr(hits[0], 'moving', False):
-                    self.player.pos.x += hits[0].velocity
-                
-                self.player.rect.midbottom = self.player.pos
+    def land(self, contact):
+        """Stand the player on the contact's support, scoring it if it's a new platform."""
+        platform = contact.support
+        self.player.pos.y = platform.rect.top
+        
+        # Only score if we were actually falling (more than just gravity adjustment)
+        # AND if we land on a different platform
+        if contact.impact_velocity > PLAYER_GRAVITY * self.dt:
+            if platform != self.last_platform:
+                self.score += SCORE_PER_PLATFORM
+                self.last_platform = platform
+
+        self.player.vel.y = 0
+        
+        # If platform is moving, move player with it
+        self.player.pos.x += contact.carry_velocity * self.dt
+        
+        self.player.rect.midbottom = self.player.pos
 
     def events(self):
         # Game Loop - Events
@@ -95,50 +275,112 @@ class Game:
                     self.playing = False
                 self.running = False
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE or event.key == pygame.K_UP or event.key == pygame.K_w:
-                    self.player.jump()
+                if event.key in JUMP_KEYS:
+                    # Applied by the next simulation step
+                    self.pending_inputs |= INPUT_JUMP
                 if event.key == pygame.K_q:
                      if self.playing:
                         self.playing = False
                      # Do not set running to False here, so we go to Game Over screen
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         """
-        Render the game state to the screen.
+        Render the game state to the screen, alpha of the way from the
+        previous simulation step to the current one.
         """
-        self.screen.fill(BLACK)
+        if alpha < 1.0:
+            self.interpolate(alpha)
+        if self.level is not None:
+            self.draw_scrolling(alpha)
+        elif self.dirty_rendering:
+            self.draw_dirty()
+        else:
+            self.draw_full()
+        if alpha < 1.0:
+            # Collisions work on the simulated positions
+            self.interpolate(1.0)
+
+    def interpolate(self, alpha):
+        self.player.interpolate(alpha)
+        if self.ghost is not None and alpha < 1.0:
+            # Nothing collides with the ghost, so it needn't be put back after drawing
+            self.ghost.interpolate(alpha)
+        for platform in self.platforms:
+            platform.interpolate(alpha)
+
+    def draw_full(self):
+        """
+        Redraw the whole screen.
+        """
+        self.screen.blit(self.static_layer.get(self.platforms), (0, 0))
         self.all_sprites.draw(self.screen)
+        self.draw_hud()
         
+        # *after* drawing everything, flip the display to show the new frame
+        pygame.display.flip()
+
+    def draw_scrolling(self, alpha=1.0):
+        """
+        Redraw the whole screen through the endless mode camera.
+        """
+        offset = self.level.camera.offset(alpha)
+        self.screen.blit(self.static_layer.get([]), (0, 0))
+        self.screen.blits([(s.image, s.rect.move(0, -offset)) for s in self.all_sprites], doreturn=False)
+        self.draw_hud()
+        pygame.display.flip()
+
+    def draw_hud(self):
+        """Draw the score and high score labels."""
         # Draw current score in player's color
         self.draw_text(str(self.score), 22, self.player_color, SCREEN_WIDTH / 2, 15)
         
-        # Draw all-time high score in player's color
-        if self.hs_manager.scores:
-            top_score = self.hs_manager.scores[0]
-            hs_color = top_score.get('color', YELLOW)
-            if isinstance(hs_color, list): hs_color = tuple(hs_color)
-            self.draw_text(f"HS: {top_score['score']}", 22, hs_color, SCREEN_WIDTH - 10, 15, align="topright")
-        
-        # *after* drawing everything, flip the display to show the new frame
-        pygame.display.flip()
+        # Draw all-time high score in its owner's color
+        high_score = self.high_score_label()
+        if high_score:
+            hs_text, hs_color = high_score
+            self.draw_text(hs_text, 22, hs_color, SCREEN_WIDTH - 10, 15, align="topright")
+
+    def draw_dirty(self):
+        """
+        Render only the screen regions that changed since the last frame.
+        Produces the same frame as the full redraw in draw().
+        """
+        self.score_label.set_text(str(self.score), self.player_color)
+        high_score = self.high_score_label()
+        if high_score:
+            self.hs_label.set_text(*high_score)
+        else:
+            self.hs_label.hide()
+
+        if self.static_layer.stale:
+            # Level geometry changed, so the whole background needs repainting
+            self.all_sprites.repaint_rect(self.screen.get_rect())
+        rects = self.all_sprites.draw(self.screen, self.static_layer.get(self.platforms))
+        # Player frames can be wider than the player's rect, so also push
+        # the area that was actually blitted this frame
+        rects.append(self.all_sprites.spritedict[self.player])
+        pygame.display.update(rects)
+
+    def high_score_label(self):
+        """Return the (text, color) of the all-time high score label, or None."""
+        # A shared board changes under us; this only swaps in what was already fetched
+        self.hs_manager.poll()
+        if not self.hs_manager.scores:
+            return None
+        top_score = self.hs_manager.scores[0]
+        hs_color = top_score.get('color', YELLOW)
+        if isinstance(hs_color, list): hs_color = tuple(hs_color)
+        return f"HS: {top_score['score']}", hs_color
 
     def show_start_screen(self):
         """Show the game splash/start screen."""
         self.screen.fill(BLACK)
+        # Load fonts and tint every player colour while the splash plays
+        loader = BackgroundLoader(self.text_renderer).start()
         try:
-            # Load and scale logo
-            # Load and scale logo
-            logo_img = pygame.image.load('logo.png')
-            
-            # User scaling request: fit to screen keeping aspect ratio
-            # Determine scale factor
-            l_rect = logo_img.get_rect()
-            scale_w = SCREEN_WIDTH / l_rect.width
-            scale_h = SCREEN_HEIGHT / l_rect.height
-            scale = min(scale_w, scale_h)
-            
-            new_size = (int(l_rect.width * scale), int(l_rect.height * scale))
-            logo_img = pygame.transform.scale(logo_img, new_size)
+            # Logo comes pre-scaled to fit the screen from the asset pack,
+            # or is scaled from logo.png if the pack is missing or stale
+            logo_img = load_asset('logo.png')
             
             logo_rect = logo_img.get_rect()
             logo_rect.center = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
@@ -150,6 +392,9 @@ class Game:
                 logo_img.set_alpha(alpha)
                 self.screen.blit(logo_img, logo_rect)
                 pygame.display.flip()
+                loader.poll()
+                if alpha == 0:
+                    self.report_startup()
                 
                 # Check for quit during fade
                 for event in pygame.event.get():
@@ -165,61 +410,22 @@ class Game:
             pygame.display.flip()
             self.wait_for_duration(SCREEN_DELAY)
 
-        except pygame.error:
+        except (pygame.error, OSError):
             pass # Fallback if image fails
 
+        # Only waits for whatever the loader has not finished yet
+        loader.finish()
         self.show_color_selection_screen()
 
+    def report_startup(self):
+        """Print the startup timing report once the first frame is on screen."""
+        startup_timer.mark("first frame")
+        if self.startup_report:
+            print(startup_timer.report())
+
     def show_color_selection_screen(self):
         """Show value selection screen."""
-        # Check if user wants to play again (loop handled by main block)
-        # But we need to wait here for a key press
-        self.screen.fill(BLACK)
-        self.draw_text(SCREEN_TITLE, 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
-        self.draw_text("Arrows to move, Space to jump", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 2 / 5)
-        
-        # Determine color name string
-        c_name = "Yellow"
-        if self.player_color == RED: c_name = "Red"
-        elif self.player_color == BLUE: c_name = "Blue"
-        
-        self.draw_text(f"Current Player Color: {c_name}", 22, self.player_color, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-        self.draw_text("Press (R)ed, (B)lue, (Y)ellow to select", 18, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 30)
-        self.draw_text("Press ENTER to play", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4)
-        
-        # Draw version
-        self.draw_text(f"v{VERSION}", 16, WHITE, 10, SCREEN_HEIGHT - 10, align="bottomleft")
-        
-        pygame.display.flip()
-        
-        waiting = True
-        while waiting:
-            self.clock.tick(FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    waiting = False
-                    self.running = False
-                if event.type == pygame.KEYUP:
-                    # 'Q' to quit
-                    if event.key == pygame.K_q:
-                        waiting = False
-                        self.running = False
-                    # Color selection
-                    elif event.key == pygame.K_r:
-                        self.player_color = RED
-                        self.show_color_selection_screen() # Refresh
-                        return # Break this call, let the refreshed call handle loop
-                    elif event.key == pygame.K_b:
-                        self.player_color = BLUE
-                        self.show_color_selection_screen()
-                        return
-                    elif event.key == pygame.K_y:
-                        self.player_color = YELLOW
-                        self.show_color_selection_screen()
-                        return
-                    # Start
-                    elif event.key == pygame.K_RETURN:
-                        waiting = False
+        self.scheduler.run(ColorSelectScene(self))
 
     def show_go_screen(self):
         """
@@ -230,104 +436,50 @@ class Game:
         if not self.running:
             return
             
+        scene = GameOverScene(self)
         # Check for high score
         if self.hs_manager.is_high_score(self.score):
-            self.get_high_score_name()
-            
-        self.screen.fill(BLACK)
-        self.draw_text("GAME OVER", 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 6)
-        self.draw_text("Score: " + str(self.score), 22, self.player_color, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
-        
-        # Show High Scores
-        self.draw_text("HIGH SCORES", 28, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40)
-        y_pos = SCREEN_HEIGHT / 2
-        for i, entry in enumerate(self.hs_manager.scores):
-            entry_color = entry.get('color', YELLOW)
-            # Ensure color is a tuple/list, sometimes json loads as list
-            if isinstance(entry_color, list):
-                entry_color = tuple(entry_color)
-                
-            text = f"{entry['name']}   {entry['score']}"
-            self.draw_text(text, 22, entry_color, SCREEN_WIDTH / 2, y_pos)
-            y_pos += 30
-
-        # Wait for delay before showing restart instructions
-        self.wait_for_duration(SCREEN_DELAY)
-        self.draw_text("Press a key to play again or Q to quit", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 7 / 8)
-        pygame.display.flip()
-
-        self.wait_for_key()
+            scene = NameEntryScene(self, next_scene=scene)
+        self.scheduler.run(scene)
 
     def get_high_score_name(self):
         """
         Input loop for getting the user's initials (3 characters).
         Updates the high score manager with the new entry.
         """
-        name = ""
-        waiting = True
-        while waiting:
-            self.clock.tick(FPS)
-            self.screen.fill(BLACK)
-            self.draw_text("NEW HIGH SCORE!", 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
-            self.draw_text("Enter Initials: " + name, 36, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-            self.draw_text("Press Enter to Submit", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
-            pygame.display.flip()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    waiting = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        if len(name) > 0: # Force at least 1 char? Optional.
-                            self.hs_manager.add_score(name, self.score, self.player_color)
-                            waiting = False
-                    elif event.key == pygame.K_BACKSPACE:
-                        name = name[:-1]
-                    else:
-                        if len(name) < 3 and event.unicode.isalpha():
-                            name += event.unicode.upper()
+        self.scheduler.run(NameEntryScene(self))
 
     def wait_for_duration(self, duration):
         """
         Wait for a specified duration in milliseconds.
         """
-        start_wait = pygame.time.get_ticks()
-        while pygame.time.get_ticks() - start_wait < duration:
-            self.clock.tick(FPS)
-            pygame.event.clear()
+        self.scheduler.run(DelayScene(self, duration))
 
     def wait_for_key(self):
         """Wait for the user to press any key."""
-        waiting = True
-        while waiting:
-            self.clock.tick(FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    waiting = False
-                    self.running = False
-                if event.type == pygame.KEYUP:
-                    if event.key == pygame.K_q:
-                        waiting = False
-                        self.running = False
-                    else:
-                        waiting = False
+        self.scheduler.run(WaitForKeyScene(self))
 
     def draw_text(self, text, size, color, x, y, align="midtop"):
         """Helper to draw text on the screen."""
-        font_name = pygame.font.match_font(FONT_NAME)
-        font = pygame.font.Font(font_name, size)
-        text_surface = font.render(text, True, color)
+        text_surface = self.text_renderer.render(text, size, color)
         text_rect = text_surface.get_rect()
         setattr(text_rect, align, (x, y))
         self.screen.blit(text_surface, text_rect)
 
 if __name__ == "__main__":
     g = Game()
+    if "--startup-report" in sys.argv:
+        g.startup_report = True
+    if "--endless" in sys.argv:
+        g.endless = True
+    if "--record" in sys.argv:
+        g.record_replays = True
     g.show_start_screen()
     while g.running:
         g.new()
         g.show_go_screen()
 
+    # Make sure every high score is on disk
+    g.hs_manager.close()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,198 @@
+"""
+Compact struct-of-arrays platform storage, for levels with far more
+platforms than are worth keeping as sprites. Requires numpy (pip install numpy).
+
+A PlatformStore keeps every platform's geometry, flags and motion in typed
+arrays, one entry per platform, and moves all moving platforms in one
+vectorised pass that gives exactly the positions Platform.update would.
+store[i], iterating the store and collide() give PlatformView handles,
+which read like a Platform to the collision and contact code.
+
+    store = PlatformStore()
+    store.add(0, 560, 800, 40, is_floor=True)
+    store.add(125, 250, 100, 20, moving=True)
+    store.update(dt)
+    hits = store.collide(rect)
+"""
+import numpy as np
+import pygame
+from settings import *
+from batch_physics import round_half_away
+
+MOVING = 1
+FLOOR = 2
+
+# Array name -> dtype. rect_x is the whole-pixel x of the platform's rect
+FIELDS = {
+    'x': np.float64,
+    'prev_x': np.float64,
+    'start_x': np.float64,
+    'velocity': np.float64,
+    'rect_x': np.int32,
+    'y': np.int32,
+    'w': np.int32,
+    'h': np.int32,
+    'flags': np.uint8,
+}
+
+class PlatformStore:
+    """
+    Platforms as parallel arrays. Entries are only ever appended, so an
+    index (and a PlatformView) stays valid until clear().
+    """
+    def __init__(self, capacity=64):
+        self.count = 0
+        for name, dtype in FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.moving_index = None
+
+    @classmethod
+    def from_platforms(cls, platforms):
+        """Store copies of existing Platform sprites."""
+        store = cls(max(len(platforms), 1))
+        for p in platforms:
+            view = store.add(getattr(p, 'start_x', p.rect.x), p.rect.y, p.rect.width, p.rect.height,
+                             p.moving, p.is_floor)
+            if p.moving:
+                # Carry over where it is on its track and which way it's going
+                i = view.index
+                store.x[i], store.prev_x[i], store.velocity[i] = p.x, p.prev_x, p.velocity
+                store.rect_x[i] = p.rect.x
+        return store
+
+    def add(self, x, y, w, h, moving=False, is_floor=False):
+        """Add a platform like Platform(x, y, w, h, moving, is_floor) and return its view."""
+        if self.count == len(self.x):
+            self.reserve(2 * self.count)
+        i = self.count
+        self.x[i] = self.prev_x[i] = self.start_x[i] = x
+        # The same whole pixels Platform's rect would hold
+        self.rect_x[i] = round_half_away(np.float64(x))
+        self.y[i] = round_half_away(np.float64(y))
+        self.w[i] = w
+        self.h[i] = h
+        self.flags[i] = (MOVING if moving else 0) | (FLOOR if is_floor else 0)
+        self.velocity[i] = w / ((PLATFORM_MOVE_DURATION / 1000) * PHYSICS_BASE_RATE) if moving else 0.0
+        self.count += 1
+        self.moving_index = None
+        return PlatformView(self, i)
+
+    def reserve(self, capacity):
+        """Grow every array to hold capacity platforms."""
+        for name, dtype in FIELDS.items():
+            grown = np.zeros(capacity, dtype)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+
+    def clear(self):
+        self.count = 0
+        self.moving_index = None
+
+    def moving(self):
+        """Indices of the moving platforms."""
+        if self.moving_index is None:
+            self.moving_index = np.flatnonzero(self.flags[:self.count] & MOVING)
+        return self.moving_index
+
+    def update(self, dt=1.0, index=None):
+        """Move every moving platform (or those in index) one step, like Platform.update."""
+        m = self.moving() if index is None else index
+        x = self.x[m]
+        start = self.start_x[m]
+        velocity = self.velocity[m]
+        self.prev_x[m] = x
+        x = x + velocity * dt
+        # Overshoot is reflected back, in the same order as Platform.update
+        end = start + self.w[m]
+        over = x > end
+        x = np.where(over, 2 * end - x, x)
+        velocity = np.where(over, -np.abs(velocity), velocity)
+        under = x < start
+        x = np.where(under, 2 * start - x, x)
+        velocity = np.where(under, np.abs(velocity), velocity)
+        self.x[m] = x
+        self.velocity[m] = velocity
+        self.rect_x[m] = round_half_away(x)
+
+    def interpolate(self, alpha, index=None):
+        """Place the rects of moving platforms alpha of the way through the last step."""
+        m = self.moving() if index is None else index
+        x = self.x[m]
+        if alpha < 1.0:
+            prev = self.prev_x[m]
+            x = prev + (x - prev) * alpha
+        self.rect_x[m] = round_half_away(x)
+
+    def collide(self, rect):
+        """Return views of the platforms overlapping rect, in the order they were added."""
+        n = self.count
+        left = self.rect_x[:n]
+        top = self.y[:n]
+        hit = ((left < rect.right) & (left + self.w[:n] > rect.left) &
+               (top < rect.bottom) & (top + self.h[:n] > rect.top))
+        return [PlatformView(self, int(i)) for i in np.flatnonzero(hit)]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return PlatformView(self, index)
+
+    def __iter__(self):
+        return (PlatformView(self, i) for i in range(self.count))
+
+class PlatformView:
+    """
+    A Platform-like handle on one entry of a PlatformStore. rect is a fresh
+    Rect on every access; move the platform through the store, not the rect.
+    """
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, PlatformView) and other.store is self.store and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @property
+    def rect(self):
+        s, i = self.store, self.index
+        return pygame.Rect(int(s.rect_x[i]), int(s.y[i]), int(s.w[i]), int(s.h[i]))
+
+    @property
+    def moving(self):
+        return bool(self.store.flags[self.index] & MOVING)
+
+    @property
+    def is_floor(self):
+        return bool(self.store.flags[self.index] & FLOOR)
+
+    @property
+    def x(self):
+        return float(self.store.x[self.index])
+
+    @property
+    def prev_x(self):
+        return float(self.store.prev_x[self.index])
+
+    @property
+    def start_x(self):
+        return float(self.store.start_x[self.index])
+
+    @property
+    def velocity(self):
+        return float(self.store.velocity[self.index])
+
+    def update(self, dt=1.0):
+        if self.moving:
+            self.store.update(dt, [self.index])
+
+    def interpolate(self, alpha):
+        if self.moving:
+            self.store.interpolate(alpha, [self.index])
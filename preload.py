@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+import pygame
+from settings import *
+from assets import get_asset_pack, load_source
+from rendering import resolve_font_path, UI_FONT_SIZES
+from sprites import PLAYER_IMAGES, PLAYER_COLORS, tint_image, store_player_image, get_player_clips
+
+# Posted by the worker when it stops, whether it finished or failed
+LOADER_FINISHED = 'finished'
+
+class BackgroundLoader:
+    """
+    Decodes images, resolves fonts and pre-tints player sprites on a worker
+    thread while the splash screen plays.
+
+    The worker only produces plain surfaces. Conversion to the display format
+    and installing into the caches happens on the main thread in poll() and
+    finish(), so nothing touches the display from the worker.
+    """
+    def __init__(self, text_renderer, colors=PLAYER_COLORS, fonts=(FONT_NAME,)):
+        self.text_renderer = text_renderer
+        self.colors = [tuple(c) for c in colors]
+        self.fonts = list(fonts)
+        self.results = queue.Queue()
+        self.total = len(self.fonts) + len(PLAYER_IMAGES) * len(self.colors)
+        self.completed = 0
+        self.worker_finished = False
+        self.error = None
+        self.thread = threading.Thread(target=self.work, name="BackgroundLoader", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def work(self):
+        error = None
+        try:
+            self.load_all()
+        except Exception as e:
+            error = e
+        finally:
+            self.results.put((LOADER_FINISHED, None, error))
+
+    def load_all(self):
+        for name in self.fonts:
+            self.results.put(('font', name, resolve_font_path(name, self.text_renderer.font_cache_file)))
+
+        pack = get_asset_pack()
+        for filename in PLAYER_IMAGES:
+            name = f"images/{filename}"
+            try:
+                base = pack.load(name) if pack is not None and name in pack else load_source(name)
+            except (pygame.error, OSError):
+                base = None
+            for color in self.colors:
+                frames = None
+                if base is not None:
+                    image = tint_image(base.copy(), color)
+                    frames = (image, pygame.transform.flip(image, True, False))
+                self.results.put(('player', (filename, color), frames))
+
+    def install(self, item):
+        kind, key, payload = item
+        if kind == LOADER_FINISHED:
+            self.worker_finished = True
+            self.error = payload
+            return
+        if kind == 'font':
+            self.text_renderer.font_paths[key] = payload
+        elif payload is not None:
+            filename, color = key
+            store_player_image(filename, color, *payload)
+        # Failed images are left out; they load synchronously on first use
+        self.completed += 1
+
+    def poll(self):
+        """Install whatever the worker has finished so far, without blocking."""
+        while True:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.install(item)
+        return self.progress()
+
+    def progress(self):
+        """Fraction of items loaded and installed, from 0.0 to 1.0."""
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.completed >= self.total
+
+    def finish(self, timeout=None):
+        """
+        Block until the remaining items are installed (or timeout seconds pass).
+        If the worker stopped early, whatever it skipped is loaded here instead.
+        Returns True if everything was loaded.
+        """
+        self.poll()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done and not self.worker_finished:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            self.install(item)
+        if not self.done and not self.worker_finished:
+            return False
+
+        # Synchronous fallback for anything the worker did not deliver, then
+        # build the fonts on the main thread so the first menu frame doesn't
+        for name in self.fonts:
+            self.text_renderer.font_path(name)
+        for color in self.colors:
+            get_player_clips(color)
+        for size in UI_FONT_SIZES:
+            self.text_renderer.get_font(size)
+        self.completed = self.total
+        return True
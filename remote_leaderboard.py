@@ -0,0 +1,260 @@
+"""
+Shared leaderboard client: a HighScoreManager store backed by a leaderboard
+server (see leaderboard_server.py), so many cabinets share one board.
+
+Nothing on the game thread touches the network or the disk. submit() hands
+the score to a worker thread that first appends it to an on-disk outbox,
+then sends whatever is waiting in batches over pooled keep-alive
+connections. Entries only leave the outbox once the server has taken them,
+so scores made while the server is down are sent when it comes back, even
+after a restart. The top of the board is cached in memory and on disk and
+refreshed in the background every LEADERBOARD_TTL seconds; poll() hands
+the game a fresh table when there is one.
+"""
+import atexit
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+from score_store import top_scores, read_journal, write_atomic
+
+BATCH_SIZE = 50       # Most entries sent in one request
+BATCH_DELAY = 0.05    # Seconds to wait for more scores before sending a batch
+RETRY_DELAYS = (0.5, 1, 2, 5) # Seconds between attempts while the server is unreachable
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections to one server, reused across requests.
+    A connection that fails is dropped, and the next request opens a new one.
+    """
+    def __init__(self, url, size=2, timeout=2.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    def request(self, method, path, payload=None):
+        """Send a JSON request and return the decoded JSON response."""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        with self.slots:
+            try:
+                conn, reused = self.idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = self.open(), False
+            try:
+                status, data = self.send(conn, method, path, body, headers)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if not reused:
+                    raise
+                # The server may have closed an idle connection; one retry on a fresh one
+                conn = self.open()
+                try:
+                    status, data = self.send(conn, method, path, body, headers)
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    raise
+            self.idle.put(conn)
+        if status != 200:
+            raise http.client.HTTPException(f"{method} {path}: HTTP {status}")
+        return json.loads(data)
+
+    def open(self):
+        self.opened += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def send(self, conn, method, path, body, headers):
+        conn.request(method, path, body, headers)
+        response = conn.getresponse()
+        # Read it all, or the connection can't be reused
+        return response.status, response.read()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class RemoteStore:
+    """
+    Store for a shared leaderboard at url. The outbox file keeps unsent
+    scores across restarts; the cache file keeps the last top-limit table
+    seen, so the board shows up straight away, even offline.
+    """
+    def __init__(self, url, limit, outbox_file, cache_file, ttl=30.0, pool_size=2):
+        self.pool = ConnectionPool(url, pool_size)
+        self.limit = limit
+        self.outbox_file = outbox_file
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.incoming = queue.Queue()
+        # Scores in the outbox, not yet taken by the server
+        self.pending = read_journal(outbox_file)
+        self.server_top = read_cache(cache_file)
+        self.fetched_at = None
+        self.table = None # Set when there is something new for poll()
+        self.online = False
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread = None
+
+    def load(self):
+        """The cached board with unsent scores merged in. Never waits on the network."""
+        self.start()
+        with self.lock:
+            return self.merged()
+
+    def merged(self):
+        uids = {e.get('uid') for e in self.server_top}
+        return top_scores(self.server_top + [e for e in self.pending if e['uid'] not in uids], self.limit)
+
+    def submit(self, entry):
+        """Give entry a uid and queue it to be sent. Returns immediately."""
+        entry['uid'] = uuid.uuid4().hex
+        self.incoming.put(dict(entry, color=list(entry['color']) if entry.get('color') is not None else None))
+        self.start()
+        self.wakeup.set()
+
+    def save(self, entries):
+        """Send any entries that weren't submitted yet; the server owns the board."""
+        for entry in entries:
+            if 'uid' not in entry:
+                self.submit(entry)
+
+    def rank(self, score):
+        """Place score would take, as far as the cached top of the board tells."""
+        with self.lock:
+            return 1 + sum(e['score'] > score for e in self.merged())
+
+    def poll(self):
+        """A new table if the board changed since the last poll, else None. Never blocks."""
+        if self.fetched_at is not None and time.monotonic() - self.fetched_at > self.ttl:
+            self.wakeup.set()
+        with self.lock:
+            table, self.table = self.table, None
+        return table
+
+    def flush(self):
+        """Block until every submitted score is in the outbox on disk."""
+        if self.thread is not None:
+            self.incoming.join()
+
+    def wait_sent(self, timeout=None):
+        """Block until the server has every submitted score. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.flush()
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            self.wakeup.set()
+            time.sleep(0.01)
+
+    def close(self):
+        """Write the outbox and stop. Unsent scores go out on the next start."""
+        if self.thread is not None:
+            self.flush()
+            self.stopping = True
+            self.wakeup.set()
+            self.thread.join()
+            self.thread = None
+            atexit.unregister(self.close)
+        self.pool.close()
+
+    def start(self):
+        if self.thread is None:
+            self.stopping = False
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def work(self):
+        retries = 0
+        while not self.stopping:
+            self.take_incoming()
+            try:
+                while self.pending and not self.stopping:
+                    self.send_batch()
+                if self.fetched_at is None or time.monotonic() - self.fetched_at > self.ttl:
+                    self.refresh()
+                self.online = True
+                retries = 0
+                delay = None
+            except (OSError, http.client.HTTPException, ValueError):
+                self.online = False
+                delay = RETRY_DELAYS[min(retries, len(RETRY_DELAYS) - 1)]
+                retries += 1
+            self.wakeup.wait(delay)
+            self.wakeup.clear()
+            if self.pending or not self.incoming.empty():
+                # Give more scores a moment to join the batch
+                time.sleep(BATCH_DELAY)
+        self.take_incoming()
+
+    def take_incoming(self):
+        """Move submitted scores into the outbox, on disk first."""
+        while True:
+            try:
+                entry = self.incoming.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                with open(self.outbox_file, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                pass # Still sent from memory while the game runs
+            with self.lock:
+                self.pending.append(entry)
+                self.table = self.merged()
+            self.incoming.task_done()
+
+    def send_batch(self):
+        batch = self.pending[:BATCH_SIZE]
+        self.pool.request("POST", "/scores", {"scores": batch})
+        with self.lock:
+            self.pending = self.pending[len(batch):]
+            remaining = list(self.pending)
+        write_outbox(self.outbox_file, remaining)
+        # The board has changed, at least by our own scores
+        self.fetched_at = None
+
+    def refresh(self):
+        scores = self.pool.request("GET", f"/top?n={self.limit}")["scores"]
+        with self.lock:
+            self.server_top = scores
+            self.table = self.merged()
+        self.fetched_at = time.monotonic()
+        try:
+            write_atomic(self.cache_file, scores)
+        except OSError:
+            pass
+
+def read_cache(filename):
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def write_outbox(filename, entries):
+    """Replace the outbox with the entries still unsent."""
+    temp = filename + ".tmp"
+    with open(temp, 'w') as f:
+        f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, filename)
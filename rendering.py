@@ -0,0 +1,121 @@
+import json
+import os
+import pygame
+from collections import OrderedDict
+from settings import *
+from assets import prepare_surface
+
+# Every size the menus and HUD draw text at
+UI_FONT_SIZES = (16, 18, 22, 28, 36, 48)
+
+def resolve_font_path(name, cache_file=None):
+    """
+    Resolve a system font name to a font file, remembering the answer in
+    cache_file (if given). The system font list is only scanned again if the
+    cached file goes missing. A font that was not found is not cached, so it
+    is picked up as soon as it is installed.
+    """
+    cache = {}
+    if cache_file:
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    if name in cache:
+        path = cache[name]
+        if path is None or os.path.exists(path):
+            return path
+
+    path = pygame.font.match_font(name)
+    if path is None:
+        return None # Fall back to the default font, and look again next launch
+    cache[name] = path
+    if cache_file:
+        try:
+            tmp_file = cache_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass # Not fatal, we just scan again next time
+    return path
+
+class TextRenderer:
+    """
+    Caches fonts by (name, size) and rendered text surfaces by (text, size, color).
+    HUD labels only change when their value changes, so most frames are cache hits.
+    Font paths are also kept in font_cache_file between runs if one is given.
+    """
+    def __init__(self, font_name=FONT_NAME, max_surfaces=TEXT_CACHE_SIZE, font_cache_file=None):
+        self.font_name = font_name
+        self.font_cache_file = font_cache_file
+        self.max_surfaces = max_surfaces
+        self.font_paths = {}
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font_path(self, name):
+        # match_font scans the system font list, so only do it once per name
+        if name not in self.font_paths:
+            self.font_paths[name] = resolve_font_path(name, self.font_cache_file)
+        return self.font_paths[name]
+
+    def get_font(self, size, name=None):
+        if name is None:
+            name = self.font_name
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(self.font_path(name), size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color):
+        """Return a (cached) antialiased surface for the given text."""
+        key = (text, size, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        # Drop the least recently used surface once we go over the limit
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+class StaticLayer:
+    """
+    Pre-bakes the background and every non-moving platform into one surface,
+    so each frame costs a single blit no matter how many static platforms
+    the level has. Call invalidate() when the level geometry changes.
+    """
+    def __init__(self, size, color=BLACK):
+        self.surface = prepare_surface(pygame.Surface(size))
+        self.color = color
+        self.stale = True
+
+    def bake(self, platforms):
+        self.surface.fill(self.color)
+        for platform in platforms:
+            if not platform.moving:
+                self.surface.blit(platform.image, platform.rect)
+        self.stale = False
+
+    def invalidate(self):
+        self.stale = True
+
+    def get(self, platforms):
+        """Return the baked surface, rebuilding it first if it is stale."""
+        if self.stale:
+            self.bake(platforms)
+        return self.surface
@@ -0,0 +1,201 @@
+"""
+Input recordings: every simulation step's INPUT_* mask, run-length encoded
+in a small binary log, with the settings needed to play the run back
+exactly through the headless simulation.
+
+File layout:
+
+    b"PLRP", format version (u8)
+    header length (u32 LE), header (JSON: game version, tick rate, physics
+        settings, player colour, level seed)
+    runs: mask (u8), step count (unsigned LEB128 varint), repeated
+    END (u8), summary length (u32 LE), summary (JSON: steps, score)
+
+The runs are streamed as they end, so a recording cut short by a crash
+still plays back up to its last complete run. Held inputs change a few
+times a second, so a minute of play takes a few KB at most.
+
+    python replay.py recording.rply    # play back at full speed and check the score
+"""
+import json
+import os
+import struct
+import sys
+import time
+from settings import *
+
+MAGIC = b"PLRP"
+FORMAT_VERSION = 1
+END = 0xFF # Never a valid input mask
+
+# Settings a run depends on; a recording only plays back under the same values
+REPLAY_SETTINGS = ('VERSION', 'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'PHYSICS_BASE_RATE', 'PLAYER_ACC',
+                   'PLAYER_FRICTION', 'PLAYER_GRAVITY', 'PLAYER_JUMP', 'SCORE_PER_PLATFORM',
+                   'PLATFORM_MOVE_DURATION', 'CHUNK_ROWS', 'ROW_SPACING', 'CHUNK_LOOKAHEAD',
+                   'CAMERA_FOLLOW', 'LAVA_SPEED')
+
+def current_settings():
+    module = sys.modules['settings']
+    return {name: getattr(module, name) for name in REPLAY_SETTINGS}
+
+def game_header(game):
+    """The header for a recording of game, taken right after its reset()."""
+    return {
+        'settings': current_settings(),
+        'tick_rate': game.tick_rate,
+        'color': list(game.player_color),
+        'endless': game.level is not None,
+        'seed': game.level.seed if game.level is not None else None,
+    }
+
+class InputRecorder:
+    """
+    Writes one run per change of input to a binary file object. record()
+    only compares and counts until the input changes, so it costs next to
+    nothing per step.
+    """
+    def __init__(self, file, header):
+        self.file = file
+        data = json.dumps(header).encode()
+        file.write(MAGIC + struct.pack("<BI", FORMAT_VERSION, len(data)) + data)
+        self.inputs = None
+        self.count = 0
+        self.steps = 0
+
+    @classmethod
+    def open(cls, path, game):
+        return cls(open(path, 'wb'), game_header(game))
+
+    @classmethod
+    def start(cls, game, directory):
+        """Record game, just reset, to a new timestamped file in directory."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}.rply")
+        return cls.open(path, game)
+
+    def record(self, inputs):
+        if inputs == self.inputs:
+            self.count += 1
+            return
+        self.write_run()
+        self.inputs = inputs
+        self.count = 1
+
+    def write_run(self):
+        if self.count:
+            self.file.write(bytes((self.inputs,)) + encode_varint(self.count))
+            # A few small writes a second; keeps a crashed game's recording up to date
+            self.file.flush()
+            self.steps += self.count
+
+    def close(self, score):
+        """End the recording with the number of steps and the final score."""
+        self.write_run()
+        self.count = 0
+        data = json.dumps({'steps': self.steps, 'score': score}).encode()
+        self.file.write(struct.pack("<BI", END, len(data)) + data)
+        self.file.close()
+
+def encode_varint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+class Recording:
+    """A parsed recording: header, (mask, count) runs and the summary (None if cut short)."""
+    def __init__(self, header, runs, summary):
+        self.header = header
+        self.runs = runs
+        self.summary = summary
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.parse(f.read())
+
+    @classmethod
+    def parse(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not an input recording")
+        version, length = struct.unpack_from("<BI", data, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording format {version}")
+        pos = 9 + length
+        header = json.loads(data[9:pos])
+        runs = []
+        summary = None
+        while pos < len(data):
+            mask = data[pos]
+            if mask == END:
+                if pos + 5 <= len(data):
+                    (length,) = struct.unpack_from("<I", data, pos + 1)
+                    summary = json.loads(data[pos + 5:pos + 5 + length])
+                break
+            count, pos = decode_varint(data, pos + 1)
+            if count is None:
+                break # Cut short mid-run
+            runs.append((mask, count))
+        return cls(header, runs, summary)
+
+    def inputs(self):
+        """Every step's input mask, in order."""
+        for mask, count in self.runs:
+            for _ in range(count):
+                yield mask
+
+    @property
+    def steps(self):
+        return sum(count for _, count in self.runs)
+
+    def check_settings(self):
+        """Raise ValueError if this game's settings differ from the recorded ones."""
+        recorded = self.header['settings']
+        different = [name for name, value in current_settings().items() if recorded.get(name) != value]
+        if different:
+            raise ValueError(f"Recorded with different settings: {', '.join(different)}")
+
+    def simulation(self):
+        """A reset Simulation set up like the recorded game."""
+        from simulation import Simulation
+        self.check_settings()
+        header = self.header
+        sim = Simulation(tuple(header['color']), header['tick_rate'], header['endless'], header['seed'])
+        sim.reset()
+        return sim
+
+    def play(self):
+        """Play the run back as fast as possible and return its final StepState."""
+        sim = self.simulation()
+        state = sim.state()
+        for state in sim.run(self.inputs()):
+            pass
+        return state
+
+def decode_varint(data, pos):
+    """Return (value, next position), or (None, pos) if the data ends first."""
+    value = shift = 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+    return None, pos
+
+if __name__ == "__main__":
+    recording = Recording.load(sys.argv[1])
+    start = time.perf_counter()
+    state = recording.play()
+    elapsed = time.perf_counter() - start
+    real_time = state.tick / recording.header['tick_rate']
+    print(f"{state.tick} steps ({real_time:.0f} s of play) in {elapsed:.2f} s, "
+          f"{real_time / max(elapsed, 1e-9):.0f}x real time")
+    print(f"score {state.score}")
+    if recording.summary is not None:
+        ok = recording.summary['score'] == state.score and recording.summary['steps'] == state.tick
+        print(f"recorded score {recording.summary['score']}: {'matches' if ok else 'DOES NOT MATCH'}")
+        sys.exit(0 if ok else 1)
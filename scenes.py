@@ -0,0 +1,224 @@
+import pygame
+from settings import *
+
+class Scene:
+    """
+    A static screen run by the SceneScheduler.
+
+    Scenes are only redrawn when they set needs_redraw, and they hand over
+    control by calling finish() with the next scene (or None to return to
+    the caller) instead of calling each other recursively.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.needs_redraw = True
+        self.done = False
+        self.next_scene = None
+        self.deadline = None
+
+    def finish(self, next_scene=None):
+        self.done = True
+        self.next_scene = next_scene
+
+    def set_timeout(self, duration):
+        """Call on_timeout() after duration milliseconds without blocking events."""
+        self.deadline = pygame.time.get_ticks() + duration
+
+    def time_left(self):
+        if self.deadline is None:
+            return None
+        return max(0, self.deadline - pygame.time.get_ticks())
+
+    def on_enter(self):
+        """Called by the scheduler when the scene becomes the active scene."""
+        pass
+
+    def draw(self, screen):
+        pass
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.game.running = False
+            self.finish()
+
+    def on_timeout(self):
+        self.deadline = None
+
+class SceneScheduler:
+    """
+    Runs scenes by blocking on pygame.event.wait, so a static screen uses no
+    CPU until an event arrives or the scene's timeout expires.
+    """
+    def __init__(self, game):
+        self.game = game
+
+    def run(self, scene):
+        if scene is not None:
+            scene.on_enter()
+        while scene is not None:
+            if scene.needs_redraw:
+                scene.draw(self.game.screen)
+                pygame.display.flip()
+                scene.needs_redraw = False
+
+            time_left = scene.time_left()
+            if time_left == 0:
+                scene.on_timeout()
+            else:
+                event = pygame.event.wait() if time_left is None else pygame.event.wait(time_left)
+                if event.type == pygame.WINDOWEXPOSED:
+                    scene.needs_redraw = True
+                elif event.type != pygame.NOEVENT:
+                    scene.handle_event(event)
+
+            if scene.done:
+                scene = scene.next_scene
+                if scene is not None:
+                    scene.on_enter()
+
+class DelayScene(Scene):
+    """Keep the current screen up for duration ms, discarding input meanwhile."""
+    def __init__(self, game, duration):
+        super().__init__(game)
+        self.needs_redraw = False
+        self.duration = duration
+
+    def on_enter(self):
+        self.set_timeout(self.duration)
+
+    def handle_event(self, event):
+        pass
+
+    def on_timeout(self):
+        super().on_timeout()
+        self.finish()
+
+class WaitForKeyScene(Scene):
+    """Wait for any key. Q quits."""
+    def __init__(self, game):
+        super().__init__(game)
+        self.needs_redraw = False
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_q:
+                self.game.running = False
+            self.finish()
+
+class ColorSelectScene(Scene):
+    """Title screen where the player picks a colour and presses ENTER to play."""
+    COLOR_KEYS = {pygame.K_r: RED, pygame.K_b: BLUE, pygame.K_y: YELLOW}
+
+    def draw(self, screen):
+        game = self.game
+        screen.fill(BLACK)
+        game.draw_text(SCREEN_TITLE, 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
+        game.draw_text("Arrows to move, Space to jump", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 2 / 5)
+
+        # Determine color name string
+        c_name = "Yellow"
+        if game.player_color == RED: c_name = "Red"
+        elif game.player_color == BLUE: c_name = "Blue"
+
+        game.draw_text(f"Current Player Color: {c_name}", 22, game.player_color, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        game.draw_text("Press (R)ed, (B)lue, (Y)ellow to select", 18, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 30)
+        game.draw_text("Press ENTER to play", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4)
+
+        # Draw version
+        game.draw_text(f"v{VERSION}", 16, WHITE, 10, SCREEN_HEIGHT - 10, align="bottomleft")
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type == pygame.KEYUP:
+            # 'Q' to quit
+            if event.key == pygame.K_q:
+                self.game.running = False
+                self.finish()
+            # Color selection, redraw only if it actually changed
+            elif event.key in self.COLOR_KEYS:
+                color = self.COLOR_KEYS[event.key]
+                if color != self.game.player_color:
+                    self.game.player_color = color
+                    self.needs_redraw = True
+            # Start
+            elif event.key == pygame.K_RETURN:
+                self.finish()
+
+class NameEntryScene(Scene):
+    """Input for the player's initials (3 characters) after a new high score."""
+    def __init__(self, game, next_scene=None):
+        super().__init__(game)
+        self.name = ""
+        self.after = next_scene
+
+    def draw(self, screen):
+        screen.fill(BLACK)
+        self.game.draw_text("NEW HIGH SCORE!", 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
+        self.game.draw_text("Enter Initials: " + self.name, 36, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.game.draw_text("Press Enter to Submit", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
+
+    def handle_event(self, event):
+        super().handle_event(event)
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_RETURN:
+            if len(self.name) > 0: # Force at least 1 char? Optional.
+                self.game.hs_manager.add_score(self.name, self.game.score, self.game.player_color)
+                self.finish(self.after)
+        elif event.key == pygame.K_BACKSPACE:
+            if self.name:
+                self.name = self.name[:-1]
+                self.needs_redraw = True
+        elif len(self.name) < 3 and event.unicode.isalpha():
+            self.name += event.unicode.upper()
+            self.needs_redraw = True
+
+class GameOverScene(Scene):
+    """
+    Final score and leaderboard. The restart prompt only appears after
+    SCREEN_DELAY so a held key doesn't skip straight past the screen.
+    """
+    def __init__(self, game):
+        super().__init__(game)
+        self.show_prompt = False
+
+    def on_enter(self):
+        # Start the delay only once the screen is actually showing
+        self.set_timeout(SCREEN_DELAY)
+
+    def draw(self, screen):
+        game = self.game
+        screen.fill(BLACK)
+        game.draw_text("GAME OVER", 48, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 6)
+        game.draw_text("Score: " + str(game.score), 22, game.player_color, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4)
+
+        # Show High Scores
+        game.draw_text("HIGH SCORES", 28, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40)
+        y_pos = SCREEN_HEIGHT / 2
+        for entry in game.hs_manager.scores:
+            entry_color = entry.get('color', YELLOW)
+            # Ensure color is a tuple/list, sometimes json loads as list
+            if isinstance(entry_color, list):
+                entry_color = tuple(entry_color)
+
+            text = f"{entry['name']}   {entry['score']}"
+            game.draw_text(text, 22, entry_color, SCREEN_WIDTH / 2, y_pos)
+            y_pos += 30
+
+        if self.show_prompt:
+            game.draw_text("Press a key to play again or Q to quit", 22, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 7 / 8)
+
+    def on_timeout(self):
+        super().on_timeout()
+        self.show_prompt = True
+        self.needs_redraw = True
+
+    def handle_event(self, event):
+        if not self.show_prompt:
+            return # Input is ignored until the prompt shows, like the original delay
+        super().handle_event(event)
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_q:
+                self.game.running = False
+            self.finish()
@@ -0,0 +1,392 @@
+"""
+Persistence backends for HighScoreManager.
+
+A store loads the saved entries once at startup and takes new ones with
+submit(), which never blocks on disk, or a whole replacement table with
+save(). rank() gives the place a score would take, and poll() a newer
+table if someone else changed it. flush() waits until everything submitted
+is durable; close() flushes and shuts the store down.
+
+JournalStore keeps the top entries in highscores.json (the default);
+SqliteStore keeps every run, with per-colour, daily and personal boards.
+RemoteStore (remote_leaderboard.py) shares one board between cabinets.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import date
+
+COMPACT_EVERY = 32 # Journal entries before they are folded into the snapshot
+
+def top_scores(entries, limit):
+    """The limit highest entries, highest first (earliest first among ties)."""
+    return sorted(entries, key=lambda x: x['score'], reverse=True)[:limit]
+
+class JournalStore:
+    """
+    The table lives in a JSON snapshot (the original highscores.json format)
+    plus an append-only journal of the entries submitted since, one JSON
+    line each. A background thread appends and fsyncs journal lines, and
+    every COMPACT_EVERY entries (and on close) writes a new snapshot to a
+    temporary file and renames it over the old one.
+
+    A crash can at worst tear the journal's last line, which loading drops.
+    The snapshot is only ever replaced whole. Entries carry an id, so those
+    replayed from a journal that was compacted but not yet emptied are not
+    counted twice.
+    """
+    def __init__(self, filename, limit):
+        self.filename = filename
+        self.journal_file = filename + ".journal"
+        self.limit = limit
+        self.queue = queue.Queue()
+        self.thread = None
+        # The writer thread's own copy of the table, for compaction
+        self.table = []
+        self.journaled = 0
+        self.next_id = 0
+
+    def load(self):
+        """Return the saved table: the snapshot with the journal replayed over it."""
+        self.flush()
+        table = read_snapshot(self.filename)
+        seen = {entry.get('id') for entry in table}
+        journal = read_journal(self.journal_file)
+        table += [entry for entry in journal if entry.get('id') not in seen]
+        self.table = top_scores(table, self.limit)
+        self.journaled = len(journal)
+        self.next_id = max((entry.get('id', -1) for entry in table), default=-1) + 1
+        return [dict(entry) for entry in self.table]
+
+    def submit(self, entry):
+        """Give entry an id and queue it to be journaled. Returns immediately."""
+        entry['id'] = self.next_id
+        self.next_id += 1
+        self.start()
+        self.queue.put(('append', dict(entry)))
+
+    def rank(self, score):
+        """Place score would take in the kept table."""
+        return 1 + sum(entry['score'] > score for entry in self.table)
+
+    def poll(self):
+        """Only this game changes the table, so there is never a newer one."""
+        return None
+
+    def save(self, entries):
+        """Queue a snapshot of entries, replacing the whole table."""
+        self.start()
+        self.queue.put(('save', [dict(entry) for entry in entries]))
+
+    def flush(self):
+        """Block until every submitted entry is on disk."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Flush, fold the journal into the snapshot and stop the writer thread."""
+        if self.thread is None:
+            return
+        self.queue.put(('save', None))
+        self.queue.put(('stop', None))
+        self.thread.join()
+        self.thread = None
+        atexit.unregister(self.close)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+            # Nothing submitted is lost on a normal exit
+            atexit.register(self.close)
+
+    def work(self):
+        while True:
+            op, data = self.queue.get()
+            try:
+                if op == 'stop':
+                    return
+                if op == 'append':
+                    self.append(data)
+                else:
+                    if data is not None:
+                        self.table = data
+                    self.compact()
+            except OSError:
+                pass # Keep the game running; the entry stays in memory
+            finally:
+                self.queue.task_done()
+
+    def append(self, entry):
+        self.table = top_scores(self.table + [entry], self.limit)
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journaled += 1
+        if self.journaled >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        write_atomic(self.filename, self.table)
+        # A crash here leaves journal entries the snapshot already holds,
+        # which load() skips by id
+        if self.journaled:
+            open(self.journal_file, 'w').close()
+            self.journaled = 0
+
+def read_snapshot(filename):
+    try:
+        with open(filename, 'r') as f:
+            entries = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return []
+    return entries if isinstance(entries, list) else []
+
+def read_journal(filename):
+    """Return the journal's entries, cutting off a line torn by a crash."""
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return []
+    entries = []
+    good = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            break
+        good += len(line)
+    if good < len(data):
+        # Later appends must start on a fresh line
+        with open(filename, 'r+b') as f:
+            f.truncate(good)
+    return entries
+
+def write_atomic(filename, data):
+    """Replace filename with data as JSON, so readers see the old or the new file, never a partial one."""
+    temp = filename + ".tmp"
+    with open(temp, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, filename)
+
+class RankIndex:
+    """
+    How many scores there are of each value, in a Fenwick tree, so adding a
+    score and ranking one are both O(log of the highest score).
+    Scores are non-negative integers.
+    """
+    def __init__(self, scores=()):
+        self.size = 1024
+        self.tree = [0] * (self.size + 1)
+        self.total = 0
+        for score in scores:
+            self.add(score)
+
+    def add(self, score):
+        while score >= self.size:
+            # Doubling only adds nodes over the new half, plus the root over everything
+            self.tree += [0] * self.size
+            self.size *= 2
+            self.tree[self.size] = self.total
+        i = score + 1
+        while i <= self.size:
+            self.tree[i] += 1
+            i += i & -i
+        self.total += 1
+
+    def count_at_most(self, score):
+        i = min(score + 1, self.size)
+        count = 0
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return count
+
+    def rank(self, score):
+        """1-based place score would take: one more than the number of higher scores."""
+        if score < 0:
+            return self.total + 1
+        return self.total - self.count_at_most(score) + 1
+
+class SqliteStore:
+    """
+    Keeps every run in an sqlite3 database, indexed by score overall, per
+    player colour, per day and per name, for boards and personal bests.
+    Inserts go through a writer thread in batched transactions; ranks come
+    from in-memory RankIndexes (built per board on first use), so they
+    count submitted scores straight away. page() and best() read the
+    database, so they see a submitted score once it is written (flush()).
+    """
+    def __init__(self, filename, limit):
+        self.filename = filename
+        self.limit = limit
+        self.queue = queue.Queue()
+        self.thread = None
+        self.db = sqlite3.connect(filename)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+        self.next_id = self.db.execute("SELECT COALESCE(MAX(id), -1) + 1 FROM scores").fetchone()[0]
+        # Board (color, day) -> RankIndex; None matches any
+        self.indexes = {}
+
+    def load(self):
+        """Return the top limit entries."""
+        return self.page(self.limit)
+
+    def submit(self, entry):
+        """Give entry an id and day and queue it to be stored. Returns immediately."""
+        entry['id'] = self.next_id
+        self.next_id += 1
+        entry.setdefault('day', date.today().isoformat())
+        row = (entry['id'], entry['name'], entry['score'], color_key(entry.get('color')), entry['day'])
+        for (color, day), index in self.indexes.items():
+            if color in (None, row[3]) and day in (None, row[4]):
+                index.add(row[2])
+        self.start()
+        self.queue.put(row)
+
+    def save(self, entries):
+        """Store any entries that aren't stored yet. Every run is kept, so nothing is replaced."""
+        for entry in entries:
+            if 'id' not in entry:
+                self.submit(entry)
+
+    def rank(self, score, color=None, day=None):
+        """Place score would take overall, or on the board for color and/or day."""
+        board = (None if color is None else color_key(color), day)
+        index = self.indexes.get(board)
+        if index is None:
+            self.flush()
+            where, args = board_filter(*board)
+            index = RankIndex(row[0] for row in self.db.execute(f"SELECT score FROM scores {where}", args))
+            self.indexes[board] = index
+        return index.rank(score)
+
+    def poll(self):
+        return None
+
+    def page(self, limit, after=None, color=None, day=None):
+        """
+        Up to limit entries, best first, starting after the entry after
+        (the last one of the previous page). Costs the same on any page.
+        """
+        where, args = board_filter(None if color is None else color_key(color), day)
+        if after is not None:
+            # The bare score bound lets sqlite seek straight to it in the index
+            where += (" AND " if where else "WHERE ") + "score <= ? AND NOT (score = ? AND id <= ?)"
+            args += [after['score'], after['score'], after['id']]
+        rows = self.db.execute(f"SELECT * FROM scores {where} ORDER BY score DESC, id LIMIT ?", args + [limit])
+        return [row_entry(row) for row in rows]
+
+    def best(self, name):
+        """name's personal best entry, or None."""
+        row = self.db.execute("SELECT * FROM scores WHERE name = ? ORDER BY score DESC, id LIMIT 1",
+                              (name,)).fetchone()
+        return row_entry(row) if row is not None else None
+
+    def import_json(self, filename):
+        """
+        Copy a JSON high-score table (and its journal) in, once per database.
+        Returns how many entries were imported.
+        """
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():
+            return 0
+        entries = JournalStore(filename, None).load()
+        today = date.today().isoformat()
+        with self.db:
+            self.db.executemany("INSERT INTO scores (name, score, color, day) VALUES (?, ?, ?, ?)",
+                                [(e['name'], e['score'], color_key(e.get('color')), today) for e in entries])
+            self.db.execute("INSERT INTO meta VALUES ('imported', ?)", (filename,))
+        self.next_id = self.db.execute("SELECT COALESCE(MAX(id), -1) + 1 FROM scores").fetchone()[0]
+        self.indexes.clear()
+        return len(entries)
+
+    def flush(self):
+        """Block until every submitted entry is in the database."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Flush, stop the writer thread and close the database."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+            atexit.unregister(self.close)
+        self.db.close()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def work(self):
+        db = sqlite3.connect(self.filename)
+        try:
+            while True:
+                rows = [self.queue.get()]
+                # Everything queued meanwhile goes in the same transaction
+                while True:
+                    try:
+                        rows.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = rows[-1] is None
+                try:
+                    with db:
+                        db.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?)", [r for r in rows if r is not None])
+                except sqlite3.Error:
+                    pass # Keep the game running; the scores stay in memory
+                finally:
+                    for _ in rows:
+                        self.queue.task_done()
+                if stop:
+                    return
+        finally:
+            db.close()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    color TEXT,
+    day TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_color ON scores (color, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_day ON scores (day, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score DESC, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def color_key(color):
+    return json.dumps(list(color)) if color is not None else None
+
+def board_filter(color, day):
+    """SQL WHERE clause and arguments for a board."""
+    clauses, args = [], []
+    if color is not None:
+        clauses.append("color = ?")
+        args.append(color)
+    if day is not None:
+        clauses.append("day = ?")
+        args.append(day)
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+def row_entry(row):
+    return {'name': row['name'], 'score': row['score'],
+            'color': json.loads(row['color']) if row['color'] is not None else None,
+            'id': row['id'], 'day': row['day']}
@@ -2,13 +2,44 @@
 SCREEN_TITLE = "Platformer"
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60                      # Render frame cap; the simulation runs at SIM_TICK_RATE
 FONT_NAME = 'Cascadia Code'
 SCREEN_DELAY = 2000
 VERSION = "0.4.0"
 PLATFORM_MOVE_DURATION = 1000
+PLAYER_WALK_FRAME_DURATION = 200
+DIRTY_RECT_RENDERING = False  # Only redraw changed screen regions (for low-end boards)
+TEXT_CACHE_SIZE = 64          # Max rendered text surfaces kept by the text renderer
+ASSET_PACK_FILE = "assets.pack"
+FONT_CACHE_FILE = "font_cache.json"  # Resolved font paths, so startup skips the font scan
+FAST_STARTUP = True           # Only initialise the pygame subsystems the game uses
+STARTUP_REPORT = False        # Print startup timings (also: python main.py --startup-report)
+SIM_TICK_RATE = 60            # Fixed simulation steps per second, independent of rendering
+MAX_CATCH_UP_STEPS = 5        # Max simulation steps per rendered frame before dropping the backlog
+GRID_CELL_SIZE = 128          # Cell size of the platform spatial index, in pixels
+HIGHSCORE_BACKEND = "json"    # "json": top 5 in highscores.json, "sqlite": every run in highscores.db,
+                              # "remote": board shared between cabinets on LEADERBOARD_URL
+LEADERBOARD_URL = "http://127.0.0.1:8765"  # Leaderboard server (see leaderboard_server.py)
+LEADERBOARD_TTL = 30          # Seconds before the cached shared board is refreshed
+RECORD_REPLAYS = False        # Record every game's inputs to REPLAY_DIR (also: python main.py --record)
+REPLAY_DIR = "replays"        # Where recordings go; play one back with python replay.py <file>
+GHOSTS = True                 # Race a translucent ghost of the top high score's run
+GHOST_FILE = "ghost.bin"      # The top high score's run, kept for the ghost
+GHOST_ALPHA = 96              # Ghost opacity, 0-255
+
+# Endless Mode
+ENDLESS_MODE = False    # Vertically scrolling generated level (also: python main.py --endless)
+LEVEL_SEED = None       # Seed of the generated level, None for a new level every game
+CHUNK_ROWS = 6          # Platform rows per generated chunk
+ROW_SPACING = 100       # Vertical distance between platform rows
+CHUNK_LOOKAHEAD = 1     # Chunks kept generated above the top of the screen
+CAMERA_FOLLOW = 0.4     # Scroll up when the player is higher than this fraction of the screen
+LAVA_SPEED = 0.5        # The screen (and lava) scrolls up at least this many pixels per step
 
 # Player Properties
+# Speeds and accelerations are per step at PHYSICS_BASE_RATE steps per second,
+# and are scaled when the simulation runs at another tick rate
+PHYSICS_BASE_RATE = 60
 PLAYER_ACC = 0.5        # Horizontal acceleration
 PLAYER_FRICTION = -0.12 # Friction (negative to oppose movement)
 PLAYER_GRAVITY = 0.8    # Vertical acceleration (gravity)
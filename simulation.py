@@ -0,0 +1,84 @@
+"""
+Headless simulation of the game, for balancing and regression checks.
+
+A Simulation runs the same Game.step() as the interactive game loop, but
+without a window, clock or keyboard, so it steps as fast as the CPU allows
+and gives exactly the results the game would for the same inputs.
+
+    sim = Simulation()
+    sim.reset()
+    for state in sim.run(input_masks):
+        ...
+"""
+from typing import NamedTuple, Tuple
+from settings import *
+from main import Game
+from snapshot import WorldSnapshot
+
+class StepState(NamedTuple):
+    """World state after a simulation step."""
+    tick: int
+    pos: Tuple[float, float]
+    vel: Tuple[float, float]
+    platforms: Tuple[Tuple[int, int], ...] # Moving platform positions
+    score: int
+    game_over: bool
+
+class Simulation:
+    def __init__(self, color=YELLOW, tick_rate=SIM_TICK_RATE, endless=False, seed=None):
+        self.game = Game(headless=True)
+        self.game.player_color = color
+        # An endless level with a fixed seed replays the same way every time
+        self.game.endless = endless
+        self.game.level_seed = seed
+        self.game.set_tick_rate(tick_rate)
+        self.tick = 0
+
+    def reset(self):
+        """Start a new session and return its initial state."""
+        self.game.reset()
+        self.tick = 0
+        return self.state()
+
+    def step(self, inputs=0):
+        """Advance one step with a mask of INPUT_* bits and return the new state."""
+        self.game.step(inputs)
+        self.tick += 1
+        return self.state()
+
+    def snapshot(self, into=None):
+        """
+        Capture the world after the current step, into the WorldSnapshot
+        into (reusing its buffer) or a new one, and return the snapshot.
+        """
+        snapshot = into if into is not None else WorldSnapshot(self.game)
+        snapshot.capture(self.tick)
+        return snapshot
+
+    def restore(self, snapshot):
+        """Go back (or forward) to a snapshot of this session and return its state."""
+        self.tick = snapshot.restore()
+        return self.state()
+
+    def run(self, input_source, max_steps=None):
+        """
+        Step through an iterable of input masks (a list, a generator driven by
+        a bot...) until it runs out, the game is over or max_steps is reached,
+        yielding the state after each step.
+        """
+        for inputs in input_source:
+            if not self.game.playing or (max_steps is not None and self.tick >= max_steps):
+                break
+            yield self.step(inputs)
+
+    def state(self):
+        game = self.game
+        player = game.player
+        return StepState(
+            self.tick,
+            (player.pos.x, player.pos.y),
+            (player.vel.x, player.vel.y),
+            tuple(p.rect.topleft for p in game.platforms if p.moving),
+            game.score,
+            not game.playing,
+        )
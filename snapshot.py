@@ -0,0 +1,216 @@
+"""
+World snapshots: the complete state of a game in progress, packed into a
+pre-allocated buffer, so it can be taken every step and restored in
+microseconds. For retrying from a checkpoint, rewinding, and rollback.
+
+A snapshot holds the player (position, velocity, acceleration, animation,
+contact), every moving platform's position and direction, the score, the
+last platform scored, the inputs of the step, the endless level's camera
+and chunk range, and where the ghost is in its run. Stationary platforms
+never change, and endless-mode chunks are regenerated from the level seed,
+so neither is stored. Platforms are referred to by their place in
+Game.world_platforms().
+
+A snapshot belongs to the game session it was taken in: restoring it after
+the game was reset raises ValueError. Input and ghost recordings keep
+everything that was played; they are not rewound.
+
+    snapshot = WorldSnapshot(game)
+    snapshot.capture()
+    ...
+    snapshot.restore()
+"""
+import struct
+from ghost import CLIPS, CLIP_IDS
+
+# tick, player pos/prev_pos/vel/acc, contact impact velocity, camera top/prev_top,
+# score, inputs, pending inputs, flags, animation clip and facing, animation tick,
+# last platform, support, first and next chunk, ghost step, moving platform count
+HEADER = struct.Struct("<I8dd2diBBBBIiiiiiI")
+# x, prev_x, velocity, rect.x of a moving platform
+PLATFORM = struct.Struct("<dddi")
+
+PLAYING = 1
+WALKING = 2
+JUMPING = 4
+GROUNDED = 8
+
+class WorldSnapshot:
+    """One snapshot of game's world. capture() overwrites it in place."""
+    def __init__(self, game, moving_capacity=16):
+        self.game = game
+        self.buffer = bytearray(HEADER.size + moving_capacity * PLATFORM.size)
+        self.size = 0
+        # The platforms of the session the snapshot was taken in
+        self.session = None
+
+    @property
+    def data(self):
+        """The snapshot's bytes, e.g. to send or store."""
+        return memoryview(self.buffer)[:self.size]
+
+    def load(self, data):
+        """Take the bytes of a snapshot of this game's session (from data)."""
+        if len(data) > len(self.buffer):
+            self.buffer = bytearray(len(data))
+        self.buffer[:len(data)] = data
+        self.size = len(data)
+        self.session = self.game.platforms
+
+    def capture(self, tick=0):
+        """Take a snapshot of the world as it is after a step."""
+        game = self.game
+        player = game.player
+        contact = player.contact
+        animator = player.animator
+        level = game.level
+        platforms = game.world_platforms()
+        ghost = game.ghost
+        pos, prev_pos, vel, acc = player.pos, player.prev_pos, player.vel, player.acc
+
+        offset = HEADER.size
+        buffer = self.buffer
+        for platform in platforms:
+            if platform.moving:
+                if offset + PLATFORM.size > len(buffer):
+                    buffer.extend(bytes(len(buffer)))
+                PLATFORM.pack_into(buffer, offset, platform.x, platform.prev_x, platform.velocity, platform.rect.x)
+                offset += PLATFORM.size
+
+        flags = ((PLAYING if game.playing else 0) | (WALKING if player.walking else 0) |
+                 (JUMPING if player.jumping else 0) | (GROUNDED if contact.grounded else 0))
+        HEADER.pack_into(
+            buffer, 0, tick,
+            pos.x, pos.y, prev_pos.x, prev_pos.y, vel.x, vel.y, acc.x, acc.y,
+            contact.impact_velocity,
+            level.camera.top if level is not None else 0.0,
+            level.camera.prev_top if level is not None else 0.0,
+            game.score, game.input.inputs, game.pending_inputs, flags,
+            CLIP_IDS[animator.clip_name] | animator.facing << 2, animator.tick,
+            index_of(platforms, game.last_platform), index_of(platforms, contact.support),
+            level.first_chunk if level is not None else 0,
+            level.next_chunk if level is not None else 0,
+            ghost.playback.step if ghost is not None and ghost.alive() else -1,
+            (offset - HEADER.size) // PLATFORM.size)
+        self.size = offset
+        self.session = game.platforms
+
+    def restore(self):
+        """Put the world back as it was at capture() and return the tick captured."""
+        game = self.game
+        if self.session is None or game.platforms is not self.session:
+            raise ValueError("Snapshot is not of this game session")
+        (tick, pos_x, pos_y, prev_x, prev_y, vel_x, vel_y, acc_x, acc_y, impact_velocity,
+         camera_top, camera_prev_top, score, inputs, pending_inputs, flags, animation, animation_tick,
+         last_platform, support, first_chunk, next_chunk, ghost_step, moving) = HEADER.unpack_from(self.buffer, 0)
+
+        level = game.level
+        if level is not None:
+            level.camera.top = camera_top
+            level.camera.prev_top = camera_prev_top
+            level.load_chunks(first_chunk, next_chunk)
+            lava = level.lava
+            lava_y = lava.rect.y
+            lava.rect.y = level.camera.lava_y
+            if lava.rect.y != lava_y:
+                game.platforms.refresh(lava)
+
+        platforms = game.world_platforms()
+        offset = HEADER.size
+        end = offset + moving * PLATFORM.size
+        for platform in platforms:
+            if platform.moving:
+                if offset == end:
+                    raise ValueError("Snapshot has fewer moving platforms than the level")
+                platform.x, platform.prev_x, platform.velocity, rect_x = PLATFORM.unpack_from(self.buffer, offset)
+                if platform.rect.x != rect_x:
+                    # Only re-filed in the spatial index when it has moved
+                    platform.rect.x = rect_x
+                    platform.grid.move(platform)
+                offset += PLATFORM.size
+        if offset != end:
+            raise ValueError("Snapshot has more moving platforms than the level")
+
+        player = game.player
+        player.pos.x = pos_x
+        player.pos.y = pos_y
+        player.prev_pos.x = prev_x
+        player.prev_pos.y = prev_y
+        player.vel.x = vel_x
+        player.vel.y = vel_y
+        player.acc.x = acc_x
+        player.acc.y = acc_y
+        player.rect.midbottom = player.pos
+        player.walking = bool(flags & WALKING)
+        player.jumping = bool(flags & JUMPING)
+        animator = player.animator
+        animator.clip_name = CLIPS[animation & 3]
+        animator.clip = animator.clips[animator.clip_name]
+        animator.facing = animation >> 2
+        animator.tick = animation_tick
+        player.image = animator.image
+
+        contact = player.contact
+        if flags & GROUNDED:
+            contact.set(platforms[support], impact_velocity)
+        else:
+            contact.clear()
+            contact.impact_velocity = impact_velocity
+        game.last_platform = platforms[last_platform] if last_platform >= 0 else None
+        game.score = score
+        game.playing = bool(flags & PLAYING)
+        game.input.inputs = inputs
+        game.pending_inputs = pending_inputs
+
+        ghost = game.ghost
+        if ghost is not None:
+            if ghost_step >= 0:
+                ghost.seek(ghost_step)
+                if not ghost.alive():
+                    game.all_sprites.add(ghost)
+            else:
+                ghost.kill()
+        return tick
+
+def index_of(platforms, platform):
+    if platform is None:
+        return -1
+    for i, p in enumerate(platforms):
+        if p is platform:
+            return i
+    return -1
+
+class SnapshotRing:
+    """
+    A snapshot of each of the last size steps, in buffers allocated up front,
+    for rewinding and rollback.
+    """
+    def __init__(self, game, size):
+        self.snapshots = [WorldSnapshot(game) for _ in range(size)]
+        self.count = 0
+        # Snapshots that can still be rewound to
+        self.available = 0
+
+    def __len__(self):
+        return self.available
+
+    def push(self, tick=0):
+        """Snapshot the world after a step, replacing the oldest snapshot when full."""
+        self.snapshots[self.count % len(self.snapshots)].capture(tick)
+        self.count += 1
+        self.available = min(self.available + 1, len(self.snapshots))
+
+    def rewind(self, steps=0):
+        """
+        Restore the snapshot pushed steps pushes before the latest one and
+        forget the ones after it. Returns its tick.
+        """
+        if not 0 <= steps < len(self):
+            raise IndexError(f"Can rewind at most {len(self) - 1} steps")
+        self.count -= steps
+        self.available -= steps
+        return self.snapshots[(self.count - 1) % len(self.snapshots)].restore()
+
+    def clear(self):
+        self.count = 0
+        self.available = 0
@@ -0,0 +1,55 @@
+class UniformGrid:
+    """
+    Broad-phase index of sprite rects in square cells of cell_size pixels.
+    A query only looks at the sprites in the cells its rect touches, so its
+    cost depends on how crowded that area is, not on the total count.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        # sprite -> (x0, y0, x1, y1) cell range it is filed under
+        self.bounds = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.left + max(rect.width, 1) - 1) // size,
+                (rect.top + max(rect.height, 1) - 1) // size)
+
+    def insert(self, sprite):
+        bounds = self.cell_range(sprite.rect)
+        self.bounds[sprite] = bounds
+        x0, y0, x1, y1 = bounds
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), set()).add(sprite)
+
+    def remove(self, sprite):
+        x0, y0, x1, y1 = self.bounds.pop(sprite)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                cell.discard(sprite)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def move(self, sprite):
+        """Re-file a sprite after its rect moved. Only touches the cells if it changed cells."""
+        if self.cell_range(sprite.rect) != self.bounds[sprite]:
+            self.remove(sprite)
+            self.insert(sprite)
+
+    def query(self, rect):
+        """Return the set of sprites whose rects overlap rect."""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = set()
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(s for s in cell if rect.colliderect(s.rect))
+        return found
+
+    def __len__(self):
+        return len(self.bounds)
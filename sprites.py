@@ -1,88 +1,161 @@
 import pygame
-import os
+from typing import NamedTuple
 from settings import *
+from assets import load_asset, prepare_surface
+from animation import AnimationClip, Animator, FACING_LEFT, FACING_RIGHT
+from controls import KeyboardControls, INPUT_LEFT, INPUT_RIGHT
+from spatial_index import UniformGrid
+from contacts import Contact
 
-class Player(pygame.sprite.Sprite):
-    def __init__(self, game, color=YELLOW):
+PLAYER_IMAGES = ('p1_idle.png', 'p1_walk1.png', 'p1_walk2.png', 'p1_jump.png')
+PLAYER_COLORS = (RED, BLUE, YELLOW)
+
+WALK_FRAME_TICKS = max(1, round(PLAYER_WALK_FRAME_DURATION / 1000 * SIM_TICK_RATE))
+
+# Tinted player frames shared by every Player and game session.
+# Maps (filename, color) -> (image, image flipped horizontally)
+_player_image_cache = {}
+# Maps color -> {clip name: AnimationClip} built from the cached frames
+_player_clip_cache = {}
+
+def load_image(filename):
+    try:
+        # Served from the asset pack when it is up to date
+        return load_asset(f"images/{filename}")
+    except (pygame.error, OSError):
+        # Fallback if image missing - create colored block
+        image = pygame.Surface((30, 40))
+        image.fill(WHITE)
+        return image
+
+def tint_image(image, color):
+    """Tint an image in place by multiplying its RGB channels with color."""
+    tint_surf = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    tint_surf.fill(color)
+    image.blit(tint_surf, (0, 0), special_flags=pygame.BLEND_MULT)
+    return image
+
+def get_player_image(filename, color):
+    """
+    Return the (right facing, left facing) tinted frames for filename.
+    Frames are loaded and tinted once, then shared from the cache.
+    """
+    key = (filename, tuple(color))
+    frames = _player_image_cache.get(key)
+    if frames is None:
+        image = tint_image(load_image(filename), color)
+        frames = (image, pygame.transform.flip(image, True, False))
+        _player_image_cache[key] = frames
+    return frames
+
+def store_player_image(filename, color, image, flipped):
+    """Add frames that were loaded and tinted elsewhere (e.g. on a loader thread)."""
+    _player_image_cache[(filename, tuple(color))] = (prepare_surface(image), prepare_surface(flipped))
+
+def prewarm_player_images(colors=PLAYER_COLORS):
+    """Load and tint every player frame for all selectable colours in one pass."""
+    for color in colors:
+        for filename in PLAYER_IMAGES:
+            get_player_image(filename, color)
+
+def get_player_clips(color):
+    """Return the idle/walk/jump animation clips for a player colour."""
+    key = tuple(color)
+    clips = _player_clip_cache.get(key)
+    if clips is None:
+        idle = get_player_image('p1_idle.png', color)
+        walk = [get_player_image(f, color) for f in ('p1_walk1.png', 'p1_walk2.png')]
+        jump = get_player_image('p1_jump.png', color)
+        clips = {
+            # The idle frame always faces right
+            'idle': AnimationClip([idle[0]]),
+            'walk': AnimationClip([f[0] for f in walk], [f[1] for f in walk], WALK_FRAME_TICKS),
+            'jump': AnimationClip([jump[0]], [jump[1]]),
+        }
+        _player_clip_cache[key] = clips
+    return clips
+
+def clear_player_image_cache():
+    _player_image_cache.clear()
+    _player_clip_cache.clear()
+
+class Player(pygame.sprite.DirtySprite):
+    def __init__(self, game, color=YELLOW, controls=None):
         super().__init__()
         self.game = game
         self.player_color = color
+        # Source of the held movement inputs, the keyboard unless given
+        self.controls = controls if controls is not None else KeyboardControls()
         self.load_images()
         
-        self.image = self.standing_frame
+        self.image = self.animator.image
         self.rect = self.image.get_rect()
+        # The player changes every frame, so always redraw it in dirty-rect mode
+        self.dirty = 2
         
         # Position and velocity
         # 'pos' tracks exact float position for physics, 'rect' tracks integer position for drawing
         self.pos = pygame.math.Vector2(10, 385)  # Start above the ground
+        # Position at the previous simulation step, for interpolated rendering
+        self.prev_pos = pygame.math.Vector2(self.pos)
         self.vel = pygame.math.Vector2(0, 0)
         self.acc = pygame.math.Vector2(0, 0)
         
         self.walking = False
         self.jumping = False
-        self.current_frame = 0
-        self.last_update = 0
+        # What the player is standing on, solved by the game each step
+        self.contact = Contact()
 
     def load_images(self):
-        self.standing_frame = self.get_image('p1_idle.png')
-        self.walk_frames_r = [self.get_image('p1_walk1.png'), self.get_image('p1_walk2.png')]
-        self.walk_frames_l = [pygame.transform.flip(frame, True, False) for frame in self.walk_frames_r]
-        self.jump_frame = self.get_image('p1_jump.png')
-        
-    def get_image(self, filename):
-        img_path = os.path.join('images', filename)
-        try:
-            image = pygame.image.load(img_path).convert_alpha()
-        except pygame.error:
-             # Fallback if image missing - create colored block
-            image = pygame.Surface((30, 40))
-            image.fill(WHITE)
-
-        # Tint the image with the player's color
-        # We can use BLEND_MULT or BLEND_RGBA_MULT if using alpha
-        # Simple approach: Create a surface of same size, fill with color, blend
-        tint_surf = pygame.Surface(image.get_size()).convert_alpha()
-        tint_surf.fill(self.player_color)
-        image.blit(tint_surf, (0, 0), special_flags=pygame.BLEND_MULT)
-        
-        return image
+        # All frames come from the shared per-colour clip tables
+        self.animator = Animator(get_player_clips(self.player_color), 'idle')
 
     def jump(self):
         """
         Make the player jump if they are standing on a platform.
         """
-        # Look 1 pixel down to see if there is a platform
-        self.rect.y += 1
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
-        self.rect.y -= 1
-        
-        # If we hit something below, we can jump
-        if hits:
+        if self.contact.grounded:
             self.vel.y = -PLAYER_JUMP
 
-    def update(self):
+    def update(self, dt=1.0):
         """
-        Update the player's position based on inputs and physics.
+        Advance the player by one simulation step based on inputs and physics.
+        dt is the step length in physics steps (1.0 at PHYSICS_BASE_RATE).
+        Works on the vectors' components in place, so a step allocates no
+        objects that outlive it.
         """
+        pos, vel, acc, prev_pos = self.pos, self.vel, self.acc, self.prev_pos
+        prev_pos.x = pos_x = pos.x
+        prev_pos.y = pos_y = pos.y
         self.animate()
         
         # Apply Gravity constantly
-        self.acc = pygame.math.Vector2(0, PLAYER_GRAVITY)
+        acc_x = 0.0
+        acc_y = PLAYER_GRAVITY
         
-        # Check keys for horizontal movement
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.acc.x = -PLAYER_ACC
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.acc.x = PLAYER_ACC
+        # Check inputs for horizontal movement
+        held = self.controls.held()
+        if held & INPUT_LEFT:
+            acc_x = -PLAYER_ACC
+        if held & INPUT_RIGHT:
+            acc_x = PLAYER_ACC
 
         # Apply friction to Acc ( Friction * Velocity )
         # This creates a max speed and slows player down when input releases
-        self.acc.x += self.vel.x * PLAYER_FRICTION
+        vel_x = vel.x
+        vel_y = vel.y
+        acc_x += vel_x * PLAYER_FRICTION
+        acc.x = acc_x
+        acc.y = acc_y
         
-        # Physics Equations of Motion
-        self.vel += self.acc
-        self.pos += self.vel + 0.5 * self.acc
+        # Physics Equations of Motion. Under constant acceleration every tick
+        # rate lands on the same path (at dt=1 this is the original
+        # pos += vel + 0.5 * acc after the velocity update)
+        k = 1 + 0.5 * dt
+        pos.x = pos_x + (vel_x + acc_x * k) * dt
+        pos.y = pos_y + (vel_y + acc_y * k) * dt
+        vel.x = vel_x + acc_x * dt
+        vel.y = vel_y + acc_y * dt
         
         # Wrap around the screen (teleport to other side)
         if self.pos.x > self.game.screen_width:
@@ -93,76 +166,238 @@ class Player(pygame.sprite.Sprite):
         # Update the rectangle position (for drawing collisions)
         self.rect.midbottom = self.pos
 
+    def interpolate(self, alpha):
+        """Place the rect alpha of the way from the previous step to the current one."""
+        if alpha >= 1.0 or abs(self.pos.x - self.prev_pos.x) > self.game.screen_width / 2:
+            # Current step, or wrapped around the screen (don't sweep across it)
+            self.rect.midbottom = self.pos
+        else:
+            self.rect.midbottom = self.prev_pos.lerp(self.pos, alpha)
+
     def animate(self):
-        now = pygame.time.get_ticks()
-        
+        """
+        Pick the clip for the current movement state and advance it by one tick.
+        """
         # Check if we are walking
-        if self.vel.x != 0:
-            self.walking = True
-        else:
-            self.walking = False
+        self.walking = self.vel.x != 0
             
         # Check if jumping (in air)
         # Simple check: if vertical velocity is significant
-        if abs(self.vel.y) > 0.5: # small threshold
-            self.jumping = True
-        else:
-            self.jumping = False
+        self.jumping = abs(self.vel.y) > 0.5 # small threshold
 
-        # Show Jump Frame
         if self.jumping:
-            self.image = self.jump_frame
-            # Flip based on direction
-            if self.vel.x < 0:
-                self.image = pygame.transform.flip(self.jump_frame, True, False)
-        
-        # Show Walk Animation
+            clip = 'jump'
         elif self.walking:
-            if now - self.last_update > 200: # 200ms per frame
-                self.last_update = now
-                self.current_frame = (self.current_frame + 1) % len(self.walk_frames_l)
-                if self.vel.x > 0:
-                    self.image = self.walk_frames_r[self.current_frame]
-                else:
-                    self.image = self.walk_frames_l[self.current_frame]
-                    
-        # Show Idle Frame
-        if not self.jumping and not self.walking:
-            self.image = self.standing_frame
-
-class Platform(pygame.sprite.Sprite):
+            clip = 'walk'
+        else:
+            clip = 'idle'
+
+        facing = FACING_LEFT if self.vel.x < 0 else FACING_RIGHT
+        self.image = self.animator.update(clip, facing)
+
+class Platform(pygame.sprite.DirtySprite):
     """
     Represents static level geometry that the player can stand on.
+    Platforms never draw on their image, so it can be shared (see PlatformPool).
     """
-    def __init__(self, x, y, w, h, moving=False, is_floor=False):
+    def __init__(self, x, y, w, h, moving=False, is_floor=False, image=None):
         super().__init__()
-        self.image = pygame.Surface((w, h))
-        if is_floor:
-            self.image.fill(RED)
-        else:
-            self.image.fill(GREEN)
+        # Spatial index of the PlatformGroup this platform is in, if any
+        self.grid = None
+        self.reset(x, y, w, h, moving, is_floor, image)
+
+    def reset(self, x, y, w, h, moving=False, is_floor=False, image=None):
+        """(Re)initialise the platform, so a pooled instance can be reused."""
+        if image is None:
+            image = pygame.Surface((w, h))
+            image.fill(RED if is_floor else GREEN)
+        self.image = image
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.is_floor = is_floor
         
         self.moving = moving
+        self.dirty = 2 if moving else 1
         if self.moving:
             self.start_x = x
-            # Distance to travel is equal to width. 
-            # Speed = Distance / Time (in frames approx, or pixels per update)
-            # Duration is in ms. Updates per second is FPS.
-            # Total frames = (Duration / 1000) * FPS
-            # Speed = Width / Total frames
-            total_frames = (PLATFORM_MOVE_DURATION / 1000) * FPS
-            self.velocity = w / total_frames
+            # Exact position; the rect only holds whole pixels
+            self.x = self.prev_x = float(x)
+            # Distance to travel is equal to width, in PLATFORM_MOVE_DURATION ms.
+            # Speed is in pixels per physics step, so it doesn't depend on FPS:
+            # Steps = (Duration / 1000) * PHYSICS_BASE_RATE
+            # Speed = Width / Steps
+            total_steps = (PLATFORM_MOVE_DURATION / 1000) * PHYSICS_BASE_RATE
+            self.velocity = w / total_steps
             
-    def update(self):
+    def update(self, dt=1.0):
         if self.moving:
-            self.rect.x += self.velocity
+            self.prev_x = self.x
+            self.x += self.velocity * dt
             
-            # Check bounds (move right by width, so range is [start_x, start_x + width])
-            if self.rect.x > self.start_x + self.rect.width:
+            # Check bounds (move right by width, so range is [start_x, start_x + width]).
+            # Overshoot is reflected back, so the path doesn't depend on the tick rate
+            end_x = self.start_x + self.rect.width
+            if self.x > end_x:
+                self.x = 2 * end_x - self.x
                 self.velocity = -abs(self.velocity)
-            if self.rect.x < self.start_x:
+            if self.x < self.start_x:
+                self.x = 2 * self.start_x - self.x
                 self.velocity = abs(self.velocity)
+
+            self.rect.x = self.x
+            if self.grid is not None:
+                self.grid.move(self)
+
+    def interpolate(self, alpha):
+        """Place the rect alpha of the way from the previous step to the current one."""
+        if self.moving:
+            self.rect.x = self.x if alpha >= 1.0 else self.prev_x + (self.x - self.prev_x) * alpha
+
+class PlatformGroup(pygame.sprite.Group):
+    """
+    The level's platforms. Calls on_change whenever a stationary platform is
+    added or removed, so baked level geometry never goes stale.
+
+    Platforms are also kept in a spatial index for collide(). Moving
+    platforms re-file themselves when they change cells; call refresh()
+    after moving any other platform by hand.
+    """
+    def __init__(self, *platforms, on_change=None, cell_size=GRID_CELL_SIZE):
+        self.on_change = on_change
+        self.grid = UniformGrid(cell_size)
+        # Insertion order, so collide() returns hits in the same order as spritecollide
+        self.order = {}
+        self.next_order = 0
+        super().__init__(*platforms)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        self.grid.insert(sprite)
+        sprite.grid = self.grid
+        self.changed(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        del self.order[sprite]
+        self.grid.remove(sprite)
+        sprite.grid = None
+        self.changed(sprite)
+
+    def collide(self, rect):
+        """Return the platforms overlapping rect, in the order they were added."""
+        hits = self.grid.query(rect)
+        if len(hits) > 1:
+            return sorted(hits, key=self.order.__getitem__)
+        return list(hits)
+
+    def refresh(self, platform):
+        self.grid.move(platform)
+
+    def changed(self, sprite):
+        if self.on_change is not None and not getattr(sprite, 'moving', False):
+            self.on_change()
+
+class PoolStats(NamedTuple):
+    created: int  # Platforms ever constructed
+    reused: int   # Acquisitions served from the free list
+    in_use: int
+    free: int
+    surfaces: int # Distinct shared surfaces
+
+class PlatformPool:
+    """
+    Recycles Platform sprites, and shares their surfaces between all platforms
+    of the same (width, height, colour). Once warm, rebuilding the level on a
+    restart or streaming new chunks in creates no sprites or surfaces.
+    """
+    def __init__(self):
+        self.free = []
+        self.surfaces = {}
+        self.created = 0
+        self.reused = 0
+
+    def surface(self, w, h, color):
+        key = (w, h, color)
+        image = self.surfaces.get(key)
+        if image is None:
+            image = pygame.Surface((w, h))
+            image.fill(color)
+            self.surfaces[key] = image
+        return image
+
+    def acquire(self, x, y, w, h, moving=False, is_floor=False):
+        """Return a platform set up like Platform(x, y, w, h, moving, is_floor)."""
+        image = self.surface(w, h, RED if is_floor else GREEN)
+        if self.free:
+            platform = self.free.pop()
+            platform.reset(x, y, w, h, moving, is_floor, image)
+            self.reused += 1
+        else:
+            platform = Platform(x, y, w, h, moving, is_floor, image)
+            self.created += 1
+        return platform
+
+    def release(self, platform):
+        """Take a platform out of every group and keep it for reuse."""
+        platform.kill()
+        self.free.append(platform)
+
+    def release_all(self, platforms):
+        for platform in list(platforms):
+            self.release(platform)
+
+    def stats(self):
+        return PoolStats(self.created, self.reused, self.created - len(self.free),
+                         len(self.free), len(self.surfaces))
+
+def build_level(pool=None):
+    """
+    Create the level's platforms, from pool if given. Returns
+    (platforms, starting platform).
+    """
+    make = pool.acquire if pool is not None else Platform
+    p1 = make(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, is_floor=True) # Floor
+    
+    # Starting platform near left, just above lava
+    p_start = make(50, SCREEN_HEIGHT - 120, 150, 20)
+    
+    p2 = make(SCREEN_WIDTH / 2 - 50, SCREEN_HEIGHT * 3 / 4, 100, 20)
+    p3 = make(125, SCREEN_HEIGHT - 350, 100, 20, moving=True)
+    p4 = make(350, 200, 100, 20)
+    return [p1, p_start, p2, p3, p4], p_start
+
+class HudLabel(pygame.sprite.DirtySprite):
+    """
+    A text label drawn through the sprite pipeline (used by dirty-rect rendering).
+    The text is only re-rendered and marked dirty when its value changes.
+    """
+    def __init__(self, text_renderer, size, pos, align="midtop"):
+        super().__init__()
+        self.text_renderer = text_renderer
+        self.size = size
+        self.pos = pos
+        self.align = align
+        self.value = None
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect()
+        self.visible = 0
+
+    def set_text(self, text, color):
+        value = (text, tuple(color))
+        if value == self.value:
+            return
+        self.value = value
+        self.image = self.text_renderer.render(text, self.size, color)
+        self.rect = self.image.get_rect()
+        setattr(self.rect, self.align, self.pos)
+        self.visible = 1
+        self.dirty = 1
+
+    def hide(self):
+        if self.visible:
+            self.value = None
+            self.visible = 0
+            self.dirty = 1
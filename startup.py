@@ -0,0 +1,49 @@
+"""
+Fast startup helpers: selective pygame initialisation and a startup timing report.
+
+Import this module before anything else so the report covers module imports.
+"""
+import time
+_process_start = time.perf_counter()
+
+import pygame
+from settings import *
+
+class StartupTimer:
+    """
+    Records named startup phases and reports the time spent in each one.
+    """
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        lines = ["Startup timings:"]
+        previous = self.start
+        for label, at in self.marks:
+            lines.append(f"  {label:<24}{(at - previous) * 1000:8.1f} ms {(at - self.start) * 1000:8.1f} ms")
+            previous = at
+        return "\n".join(lines)
+
+startup_timer = StartupTimer(_process_start)
+startup_timer.mark("import pygame")
+
+def init_pygame(fast=FAST_STARTUP):
+    """
+    Initialise pygame. The fast path only starts what the game uses (display,
+    font and the event queue) and skips audio, joystick and the rest.
+    """
+    if not fast:
+        pygame.init()
+        startup_timer.mark("pygame.init")
+        return
+
+    # Video also brings up SDL's event queue
+    pygame.display.init()
+    pygame.font.init()
+    # get_ticks() reports 0 until SDL's timer has been started
+    pygame.time.wait(0)
+    startup_timer.mark("display/font/event init")
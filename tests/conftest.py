@@ -12,3 +12,17 @@ def pygame_init():
     pygame.display.set_mode((1, 1))
     yield
     pygame.quit()
+
+@pytest.fixture(autouse=True)
+def font_cache_file(tmp_path, monkeypatch):
+    """Keep games created by tests away from the real font cache."""
+    path = str(tmp_path / "font_cache.json")
+    monkeypatch.setattr("main.FONT_CACHE_FILE", path)
+    return path
+
+@pytest.fixture(autouse=True)
+def ghost_file(tmp_path, monkeypatch):
+    """Keep ghost runs of games played by tests away from the real one."""
+    path = str(tmp_path / "ghost.bin")
+    monkeypatch.setattr("main.GHOST_FILE", path)
+    return path
@@ -0,0 +1,64 @@
+import pygame
+from unittest.mock import patch
+from animation import AnimationClip, Animator, FACING_LEFT, FACING_RIGHT
+from sprites import Player, get_player_clips, WALK_FRAME_TICKS
+from settings import *
+
+class MockGame:
+    def __init__(self):
+        self.platforms = pygame.sprite.Group()
+        self.screen_width = SCREEN_WIDTH
+        self.screen_height = SCREEN_HEIGHT
+
+def make_frames(n):
+    return [pygame.Surface((i + 1, 1)) for i in range(n)]
+
+def test_clip_frame_table():
+    right, left = make_frames(2), make_frames(2)
+    clip = AnimationClip(right, left, ticks_per_frame=3)
+    assert len(clip) == 2
+    assert clip.frame(FACING_RIGHT, 0) is right[0]
+    assert clip.frame(FACING_RIGHT, 2) is right[0]
+    assert clip.frame(FACING_RIGHT, 3) is right[1]
+    assert clip.frame(FACING_LEFT, 6) is left[0]
+
+def test_clip_without_left_frames_reuses_right():
+    frames = make_frames(1)
+    clip = AnimationClip(frames)
+    assert clip.frame(FACING_LEFT, 0) is frames[0]
+
+def test_animator_advances_on_ticks():
+    frames = make_frames(2)
+    clips = {'idle': AnimationClip(frames[:1]), 'walk': AnimationClip(frames, ticks_per_frame=2)}
+    animator = Animator(clips, 'idle')
+
+    seen = [animator.update('walk', FACING_RIGHT) for _ in range(5)]
+    assert seen == [frames[0], frames[0], frames[1], frames[1], frames[0]]
+
+    # Switching clips restarts playback
+    assert animator.update('idle', FACING_RIGHT) is frames[0]
+    assert animator.update('walk', FACING_RIGHT) is frames[0]
+
+def test_player_airborne_left_uses_cached_flipped_frame():
+    p = Player(MockGame())
+    p.vel.x = -2
+    p.vel.y = 5
+    with patch('pygame.transform.flip') as mock_flip:
+        p.animate()
+        p.animate()
+    mock_flip.assert_not_called()
+    assert p.image is get_player_clips(YELLOW)['jump'].frames[FACING_LEFT][0]
+
+@patch('pygame.time.get_ticks')
+def test_player_walk_cycle_is_deterministic(mock_get_ticks):
+    p = Player(MockGame())
+    p.vel.x = 2
+    walk = get_player_clips(YELLOW)['walk']
+    images = []
+    for _ in range(WALK_FRAME_TICKS * 2):
+        p.animate()
+        images.append(p.image)
+
+    mock_get_ticks.assert_not_called()
+    assert images[0] is walk.frames[FACING_RIGHT][0]
+    assert images[WALK_FRAME_TICKS] is walk.frames[FACING_RIGHT][1]
@@ -0,0 +1,60 @@
+import os
+import shutil
+import pygame
+import pytest
+import assets
+from assets import AssetPack, ASSETS, build_asset_pack, load_asset, load_source, reset_asset_pack
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def asset_dir(tmp_path, monkeypatch):
+    # Work on a copy of the images so sources can be touched safely
+    for name in ASSETS:
+        os.makedirs(tmp_path / os.path.dirname(name), exist_ok=True)
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    reset_asset_pack()
+    yield tmp_path
+    reset_asset_pack()
+
+def test_pack_round_trip(asset_dir):
+    build_asset_pack("test.pack")
+    pack = AssetPack("test.pack")
+    assert pack.is_stale() is False
+    for name in ASSETS:
+        packed = pack.load(name)
+        source = load_source(name)
+        assert packed.get_size() == source.get_size()
+        fmt = "RGBA" if source.get_flags() & pygame.SRCALPHA else "RGB"
+        assert pygame.image.tobytes(packed, fmt) == pygame.image.tobytes(source, fmt)
+
+def test_logo_is_prescaled(asset_dir):
+    build_asset_pack("test.pack")
+    width, height = AssetPack("test.pack").load('logo.png').get_size()
+    assert width <= assets.SCREEN_WIDTH and height <= assets.SCREEN_HEIGHT
+    assert width == assets.SCREEN_WIDTH or height == assets.SCREEN_HEIGHT
+
+def test_pack_stale_when_source_changes(asset_dir):
+    build_asset_pack("test.pack")
+    with open('images/p1_idle.png', 'ab') as f:
+        f.write(b'\0')
+    assert AssetPack("test.pack").is_stale() is True
+
+def test_load_asset_falls_back_without_pack(asset_dir, monkeypatch):
+    monkeypatch.setattr(assets, 'get_asset_pack', lambda path=None: None)
+    image = load_asset('images/p1_jump.png')
+    assert image.get_size() == load_source('images/p1_jump.png').get_size()
+
+def test_load_asset_ignores_stale_pack(asset_dir):
+    build_asset_pack(assets.ASSET_PACK_FILE)
+    os.utime('logo.png', ns=(1, 1))
+    assert assets.get_asset_pack() is None
+    assert load_asset('logo.png').get_size() == load_source('logo.png').get_size()
+
+def test_asset_packs_cached_per_path(asset_dir):
+    build_asset_pack("a.pack")
+    first = assets.get_asset_pack("a.pack")
+    assert first is not None
+    assert assets.get_asset_pack("a.pack") is first
+    assert assets.get_asset_pack("missing.pack") is None
@@ -0,0 +1,75 @@
+import random
+import pytest
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from simulation import Simulation
+from settings import *
+
+np = pytest.importorskip("numpy")
+from batch_physics import BatchPhysics, round_half_away
+
+CHOICES = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_LEFT | INPUT_JUMP, INPUT_RIGHT | INPUT_JUMP)
+
+def random_script(rng, steps):
+    # Hold each input for a while so agents actually reach platforms
+    script = []
+    while len(script) < steps:
+        script += [rng.choice(CHOICES)] * rng.randint(1, 30)
+    return script[:steps]
+
+def test_round_half_away_matches_pygame_rects():
+    import pygame
+    values = np.array([10.5, 11.5, -0.5, -1.5, 2.4999999, 0.49999999999999994, 7.0])
+    rect = pygame.Rect(0, 0, 1, 1)
+    expected = []
+    for v in values:
+        rect.x = float(v)
+        expected.append(rect.x)
+    assert round_half_away(values).tolist() == expected
+
+@pytest.mark.parametrize("tick_rate", [60, 120])
+def test_batch_matches_scalar_player(tick_rate):
+    rng = random.Random(tick_rate)
+    steps = 600
+    scripts = [random_script(rng, steps) for _ in range(32)]
+
+    env = BatchPhysics(len(scripts), tick_rate=tick_rate)
+    env.reset()
+    actions = np.array(scripts).T
+    batch = []
+    for t in range(steps):
+        obs, rewards, done, info = env.step(actions[t])
+        batch.append((obs, info['score'], done))
+
+    scored = 0
+    for i, script in enumerate(scripts):
+        sim = Simulation(tick_rate=tick_rate)
+        sim.reset()
+        states = list(sim.run(script))
+        for t, state in enumerate(states):
+            obs, score, done = batch[t]
+            assert tuple(obs[i]) == state.pos + state.vel, f"player {i} step {t}"
+            assert score[i] == state.score
+            assert done[i] == state.game_over
+        # A finished player stays frozen
+        if states[-1].game_over:
+            assert tuple(batch[-1][0][i]) == states[-1].pos + states[-1].vel
+        scored += states[-1].score > 0
+    assert scored > 0
+
+def test_rewards_are_points_scored_this_step():
+    env = BatchPhysics(1)
+    env.reset()
+    total = 0
+    for action in [INPUT_JUMP] + [INPUT_RIGHT] * 40 + [0] * 60:
+        _, rewards, _, info = env.step([action])
+        total += rewards[0]
+    assert total == info['score'][0] > 0
+
+def test_reset_restores_start_state():
+    env = BatchPhysics(3)
+    start = env.reset()
+    for _ in range(50):
+        env.step([INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP])
+    assert (env.reset() == start).all()
+    assert not env.done.any()
+    assert (env.score == 0).all()
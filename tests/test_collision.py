@@ -0,0 +1,78 @@
+import pygame
+import pytest
+from collision import time_of_impact, first_landing, landing_query_rect
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from simulation import Simulation
+from settings import *
+
+SIZE = (22, 40)
+L, R, J = INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+
+def test_time_of_impact_on_crossing_top():
+    rect = pygame.Rect(0, 100, 100, 20)
+    assert time_of_impact(SIZE, (50, 90), (50, 130), rect) == 0.25
+    # Standing exactly on top counts as landing at the start of the step
+    assert time_of_impact(SIZE, (50, 100), (50, 101), rect) == 0.0
+    # Passing beside the platform, or rising through it
+    assert time_of_impact(SIZE, (150, 90), (150, 130), rect) is None
+    assert time_of_impact(SIZE, (50, 130), (50, 90), rect) is None
+
+def test_time_of_impact_uses_position_at_impact():
+    rect = pygame.Rect(0, 100, 100, 20)
+    # Over the platform when the feet cross its top, past it by the end of the step
+    assert time_of_impact(SIZE, (60, 90), (160, 130), rect) == 0.25
+
+def test_fast_fall_cannot_tunnel():
+    thin = pygame.Rect(0, 100, 100, 20)
+    # 200px in one step, far past the platform by the end of it
+    assert time_of_impact(SIZE, (50, 60), (50, 260), thin) == 0.2
+    assert landing_query_rect(SIZE, (50, 60), (50, 260)).colliderect(thin)
+
+def test_first_surface_hit_wins():
+    near, far = pygame.sprite.Sprite(), pygame.sprite.Sprite()
+    near.rect = pygame.Rect(0, 100, 100, 20)
+    far.rect = pygame.Rect(0, 150, 100, 20)
+    assert first_landing(SIZE, (50, 60), (50, 200), [far, near]) == (near, 40 / 140)
+
+def test_large_step_lands_in_game():
+    sim = Simulation(tick_rate=30)
+    sim.reset()
+    game = sim.game
+    platform = list(game.platforms)[2]
+    game.player.pos = pygame.math.Vector2(platform.rect.centerx, platform.rect.top - 10)
+    game.player.vel.y = 40 # more than 80px in a 30 Hz step
+    sim.step()
+    assert game.player.pos.y == platform.rect.top
+    assert game.player.vel.y == 0
+
+# (duration in sixths of a second, input); jump only on the segment's first step
+SCRIPTS = [
+    [(6, R | J), (1, 0), (2, R | J), (3, L), (2, L), (6, J), (6, 0), (6, R | J), (6, R | J), (1, L), (6, 0), (3, R | J)],
+    [(2, R), (2, J), (2, R), (1, 0), (1, L | J), (6, R | J), (2, 0), (6, J), (3, L), (1, L), (2, 0), (2, J)],
+]
+
+def landings(script, tick_rate):
+    sim = Simulation(tick_rate=tick_rate)
+    sim.reset()
+    game = sim.game
+    order = list(game.platforms)
+    seen = []
+    real_land = game.land
+    def land(contact):
+        real_land(contact)
+        if not seen or seen[-1] != order.index(contact.support):
+            seen.append(order.index(contact.support))
+    game.land = land
+
+    inputs = []
+    for sixths, mask in script:
+        steps = sixths * tick_rate // 6
+        inputs += [mask] + [mask & ~J] * (steps - 1)
+    states = list(sim.run(inputs))
+    return seen, states[-1].score, states[-1].game_over
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_same_landings_at_30_60_and_120_hz(script):
+    results = [landings(script, rate) for rate in (30, 60, 120)]
+    assert results[0] == results[1] == results[2]
+    assert len(results[0][0]) >= 3
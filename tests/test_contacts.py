@@ -0,0 +1,67 @@
+import pygame
+import pytest
+from unittest.mock import patch
+from controls import INPUT_JUMP
+from simulation import Simulation
+from sprites import Platform, PlatformGroup
+from settings import *
+
+@pytest.fixture
+def sim():
+    sim = Simulation()
+    sim.reset()
+    return sim
+
+def test_contact_records_support_and_carry(sim):
+    game = sim.game
+    game.platforms.empty()
+    moving = Platform(100, 300, 100, 20, moving=True)
+    game.add_platform(moving)
+    game.player.pos = pygame.math.Vector2(150, 290)
+    game.player.vel.y = 10
+
+    sim.step()
+    contact = game.player.contact
+    assert contact.grounded is True
+    assert contact.support is moving
+    assert contact.carry_velocity == moving.velocity
+    assert game.score == SCORE_PER_PLATFORM
+
+def test_start_platform_is_initial_support(sim):
+    contact = sim.game.player.contact
+    assert contact.grounded and contact.support is sim.game.last_platform
+    assert contact.carry_velocity == 0.0
+
+def test_one_collision_query_per_step(sim):
+    platforms = sim.game.platforms
+    with patch.object(platforms, 'collide', wraps=platforms.collide) as mock_collide:
+        sim.step()
+        assert mock_collide.call_count == 1
+        # The jump reads the contact instead of probing the platforms,
+        # and a rising player can't land
+        sim.step(INPUT_JUMP)
+        assert mock_collide.call_count == 1
+    assert sim.game.player.vel.y < 0
+
+def test_airborne_player_cannot_jump(sim):
+    sim.step(INPUT_JUMP)
+    sim.step()
+    vel_y = sim.game.player.vel.y
+    assert sim.game.player.contact.grounded is False
+    sim.step(INPUT_JUMP)
+    assert sim.game.player.vel.y > vel_y # only gravity, no second jump
+
+@pytest.mark.parametrize("floor_first", [True, False])
+def test_simultaneous_hits_resolve_the_same_in_any_order(sim, floor_first):
+    game = sim.game
+    game.platforms.empty()
+    floor = Platform(0, 300, SCREEN_WIDTH, 40, is_floor=True)
+    ledge = Platform(100, 300, 100, 20)
+    for platform in ((floor, ledge) if floor_first else (ledge, floor)):
+        game.add_platform(platform)
+    game.player.pos = pygame.math.Vector2(150, 290)
+    game.player.vel.y = 10
+
+    sim.step()
+    assert game.player.contact.support is ledge
+    assert game.playing is True
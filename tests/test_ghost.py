@@ -0,0 +1,127 @@
+import random
+from unittest.mock import MagicMock
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from ghost import GhostRecorder, GhostPlayback, KEYFRAME_INTERVAL, SUBPIXELS, load_ghost, zigzag, unzigzag
+from main import Game
+from simulation import Simulation
+from settings import *
+from tests.test_simulation import SCRIPT
+
+def random_script(seed, steps):
+    rng = random.Random(seed)
+    return [rng.choice((0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP | INPUT_LEFT, INPUT_JUMP | INPUT_RIGHT))
+            for _ in range(steps)]
+
+def record(sim, script):
+    """Play script, returning the run recorded and the player's (x, y, clip, facing) after each step."""
+    sim.reset()
+    game = sim.game
+    recorder = GhostRecorder.for_game(game)
+    path = [player_state(game.player)]
+    for _ in sim.run(script):
+        recorder.record(game.player)
+        path.append(player_state(game.player))
+    return recorder.run(game.score), path
+
+def player_state(player):
+    return player.pos.x, player.pos.y, player.animator.clip_name, player.animator.facing
+
+def test_zigzag_round_trip():
+    for value in (0, 1, -1, 63, -64, 6400, -6400):
+        assert unzigzag(zigzag(value)) == value
+
+def test_run_follows_the_player():
+    run, path = record(Simulation(endless=True, seed=4), random_script(1, 1500))
+    assert run.steps == len(path)
+    assert len(run.index) == (run.steps + KEYFRAME_INTERVAL - 1) // KEYFRAME_INTERVAL
+    playback = GhostPlayback(run)
+    for step, (x, y, clip, facing) in enumerate(path):
+        state = playback.state
+        assert abs(state.x - x) <= 0.5 / SUBPIXELS
+        assert abs(state.y - y) <= 0.5 / SUBPIXELS
+        assert (state.clip, state.facing) == (clip, facing)
+        assert playback.advance() == (step < len(path) - 1)
+
+def test_seek_matches_playing_through():
+    run, _ = record(Simulation(), SCRIPT)
+    playback = GhostPlayback(run)
+    states = [playback.state]
+    while playback.advance():
+        states.append(playback.state)
+    rng = random.Random(2)
+    for step in rng.sample(range(run.steps), 50) + [0, run.steps - 1]:
+        assert run.state(step) == states[step]
+    # Scrubbing backwards and past the end
+    playback.seek(5)
+    assert playback.state == states[5]
+    playback.seek(10 ** 6)
+    assert playback.state == states[-1]
+
+def test_run_is_compact_and_round_trips(tmp_path):
+    run, _ = record(Simulation(endless=True, seed=4), random_script(3, 3600))
+    path = str(tmp_path / "ghost.bin")
+    run.save(path)
+    loaded = load_ghost(path)
+    assert (loaded.header, loaded.index, loaded.body) == (run.header, run.index, run.body)
+    # Well under 5 bytes a step
+    assert len(run.body) < 5 * run.steps
+    assert load_ghost(str(tmp_path / "missing.bin")) is None
+
+def play(game, inputs):
+    """Play one game through the real loop with inputs held throughout."""
+    game.keyboard = MagicMock()
+    game.keyboard.held.return_value = inputs
+    game.clock = MagicMock()
+    game.clock.tick.return_value = game.step_ms
+    game.new()
+
+def test_best_run_is_raced_by_later_games(ghost_file):
+    game = Game()
+    game.hs_manager.scores = []
+    play(game, INPUT_RIGHT | INPUT_JUMP)
+    assert game.score > 0
+    recorded = load_ghost(ghost_file)
+    assert recorded.score == game.score
+    game.hs_manager.scores = [{'name': 'AAA', 'score': game.score, 'color': list(game.player_color)}]
+
+    game.reset()
+    ghost = game.ghost
+    assert ghost in game.all_sprites
+    # The player's frames, faded
+    player_alpha = max(game.player.image.get_at((x, y)).a for x in range(10) for y in range(10, 30))
+    ghost_alpha = max(ghost.image.get_at((x, y)).a for x in range(10) for y in range(10, 30))
+    assert 0 < ghost_alpha <= GHOST_ALPHA < player_alpha
+    expected = ghost.rect.copy()
+    for step in range(1, 100):
+        game.step(0)
+        state = recorded.state(step)
+        expected.midbottom = (state.x, state.y)
+        assert ghost.rect == expected
+
+    # Lower scores keep the best run
+    play(game, INPUT_LEFT)
+    assert load_ghost(ghost_file).body == recorded.body
+
+def test_ghost_leaves_when_its_run_ends():
+    game = Game()
+    game.best_ghost, _ = record(Simulation(), [INPUT_RIGHT] * 1000)
+    game.hs_manager.scores = [{'name': 'AAA', 'score': game.best_ghost.score, 'color': list(YELLOW)}]
+    game.reset()
+    assert game.ghost.alive()
+    for _ in range(game.best_ghost.steps - 1):
+        game.step(0)
+    assert game.ghost.alive()
+    game.step(0)
+    assert not game.ghost.alive()
+
+def test_ghost_only_races_its_own_level():
+    game = Game()
+    game.best_ghost, _ = record(Simulation(endless=True, seed=1), SCRIPT)
+    game.hs_manager.scores = [{'name': 'AAA', 'score': game.best_ghost.score, 'color': list(YELLOW)}]
+    game.endless = True
+    game.level_seed = 2
+    game.reset()
+    assert game.ghost is None
+    game.level_seed = 1
+    game.reset()
+    assert game.ghost is not None
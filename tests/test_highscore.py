@@ -1,7 +1,9 @@
 import pytest
 import os
 import json
+import threading
 from highscore_manager import HighScoreManager
+from score_store import COMPACT_EVERY
 
 TEST_FILE = "test_highscores.json"
 
@@ -11,8 +13,10 @@ def manager():
         os.remove(TEST_FILE)
     mgr = HighScoreManager(TEST_FILE)
     yield mgr
-    if os.path.exists(TEST_FILE):
-        os.remove(TEST_FILE)
+    mgr.close()
+    for name in (TEST_FILE, TEST_FILE + ".journal"):
+        if os.path.exists(name):
+            os.remove(name)
 
 def test_empty_init(manager):
     assert manager.scores == []
@@ -25,6 +29,7 @@ def test_add_score(manager):
     assert manager.scores[0]['name'] == "AAA"
     
     # Verify persistence
+    manager.flush()
     mgr2 = HighScoreManager(TEST_FILE)
     assert len(mgr2.scores) == 1
     assert mgr2.scores[0]['score'] == 100
@@ -35,6 +40,7 @@ def test_add_score_with_color(manager):
     assert manager.scores[0]['color'] == list(color) or manager.scores[0]['color'] == tuple(color)
     
     # Persistence
+    manager.flush()
     mgr2 = HighScoreManager(TEST_FILE)
     loaded_color = mgr2.scores[0]['color']
     # JSON loads tuples as lists
@@ -61,3 +67,75 @@ def test_score_sorting_and_trimming(manager):
     assert len(manager.scores) == 5
     assert manager.scores[0]['score'] == 60
     assert manager.scores[-1]['score'] == 20
+
+def submit_scores(manager, scores):
+    for i, score in enumerate(scores):
+        manager.add_score(f"P{i}", score)
+
+def test_add_score_does_not_wait_for_disk(tmp_path):
+    filename = str(tmp_path / "scores.json")
+    manager = HighScoreManager(filename)
+    release = threading.Event()
+    real_append = manager.store.append
+    def slow_append(entry):
+        release.wait(5)
+        real_append(entry)
+    manager.store.append = slow_append
+    manager.add_score("AAA", 100)
+    assert manager.scores[0]['score'] == 100
+    assert not os.path.exists(filename + ".journal")
+    release.set()
+    manager.flush()
+    assert [e['score'] for e in HighScoreManager(filename).scores] == [100]
+    manager.close()
+
+def test_journal_compacts_into_snapshot(tmp_path):
+    filename = str(tmp_path / "scores.json")
+    manager = HighScoreManager(filename)
+    submit_scores(manager, range(10, 10 * (COMPACT_EVERY + 3), 10))
+    manager.flush()
+    # The snapshot is still a plain JSON list, and the journal only holds what came after it
+    with open(filename) as f:
+        assert len(json.load(f)) == 5
+    with open(filename + ".journal") as f:
+        assert len(f.readlines()) == 2
+    assert HighScoreManager(filename).scores == json.loads(json.dumps(manager.scores))
+    manager.close()
+    assert os.path.getsize(filename + ".journal") == 0
+
+def test_torn_journal_line_is_dropped(tmp_path):
+    filename = str(tmp_path / "scores.json")
+    manager = HighScoreManager(filename)
+    submit_scores(manager, [50, 40])
+    manager.flush()
+    with open(filename + ".journal", "a") as f:
+        f.write('{"name": "P2", "sco') # Crash mid-write
+    manager = HighScoreManager(filename)
+    assert [e['score'] for e in manager.scores] == [50, 40]
+    # New entries start on a fresh line
+    manager.add_score("NEW", 45)
+    manager.flush()
+    assert [e['score'] for e in HighScoreManager(filename).scores] == [50, 45, 40]
+    manager.close()
+
+def test_crash_between_snapshot_and_journal_reset_counts_once(tmp_path):
+    filename = str(tmp_path / "scores.json")
+    manager = HighScoreManager(filename)
+    submit_scores(manager, [30, 20])
+    manager.flush()
+    with open(filename + ".journal") as f:
+        journal = f.read()
+    manager.close()
+    # The snapshot was replaced, but the journal never got emptied
+    with open(filename + ".journal", "w") as f:
+        f.write(journal)
+    assert [e['score'] for e in HighScoreManager(filename).scores] == [30, 20]
+
+def test_legacy_snapshot_loads(tmp_path):
+    filename = str(tmp_path / "scores.json")
+    with open(filename, "w") as f:
+        json.dump([{'name': 'OLD', 'score': 70, 'color': [255, 0, 0]}], f)
+    manager = HighScoreManager(filename)
+    manager.add_score("NEW", 80)
+    manager.close()
+    assert [e['name'] for e in HighScoreManager(filename).scores] == ["NEW", "OLD"]
@@ -0,0 +1,82 @@
+import pygame
+import pytest
+from level_gen import LevelGenerator, Camera, CHUNK_HEIGHT, START_Y
+from main import Game
+from simulation import Simulation
+from controls import INPUT_RIGHT, INPUT_JUMP
+from settings import *
+
+SCRIPT = [INPUT_JUMP] + [INPUT_RIGHT] * 40 + [0] * 60
+
+def test_same_seed_same_chunks():
+    a, b = LevelGenerator(7), LevelGenerator(7)
+    # Chunks don't depend on the order they are generated in
+    assert [a.chunk(i) for i in range(5)] == [b.chunk(i) for i in reversed(range(5))][::-1]
+    assert LevelGenerator(8).chunk(1) != a.chunk(1)
+
+def test_chunks_fit_the_screen_and_their_rows():
+    generator = LevelGenerator(3)
+    for index in range(20):
+        for x, y, w, h, moving in generator.chunk(index):
+            assert 0 <= x and x + (2 * w if moving else w) <= SCREEN_WIDTH
+            bottom = START_Y - index * CHUNK_HEIGHT
+            assert bottom - CHUNK_HEIGHT - 15 <= y <= bottom + (15 if index else 0)
+
+def test_start_platform_is_first_in_chunk_zero():
+    x, y, w, h, moving = LevelGenerator(1).chunk(0)[0]
+    assert y == START_Y and not moving
+
+def test_seeded_runs_replay_identically():
+    runs = []
+    for _ in range(2):
+        sim = Simulation(endless=True, seed=11)
+        sim.reset()
+        runs.append(list(sim.run(SCRIPT)))
+    assert runs[0] == runs[1]
+
+def test_camera_follows_player_up():
+    camera = Camera()
+    camera.update(target_y=100)
+    assert camera.top == 100 - SCREEN_HEIGHT * CAMERA_FOLLOW
+    # Never scrolls back down, and always rises at least LAVA_SPEED
+    top = camera.top
+    camera.update(target_y=1000)
+    assert camera.top == top - LAVA_SPEED
+    assert camera.offset(0.0) == round(top)
+
+def test_streaming_keeps_a_bounded_number_of_chunks():
+    sim = Simulation(endless=True, seed=5)
+    sim.reset()
+    level = sim.game.level
+    counts = []
+    for _ in range(200):
+        level.camera.top -= 50
+        level.lava.rect.y = level.camera.lava_y
+        level.stream()
+        counts.append(len(sim.game.platforms))
+    # 10,000px climbed: many chunks generated, most of them evicted again
+    assert level.next_chunk > 15
+    assert level.chunks[0][0] > 10
+    assert len(level.chunks) <= CHUNK_LOOKAHEAD + 3
+    assert max(counts) < 3 * CHUNK_ROWS * (CHUNK_LOOKAHEAD + 3)
+
+def test_lava_ends_the_game():
+    sim = Simulation(endless=True, seed=5)
+    sim.reset()
+    states = list(sim.run([0] * 1000))
+    assert states[-1].game_over
+    # Standing still, the lava reaches the start platform's top
+    assert states[-1].tick == pytest.approx((SCREEN_HEIGHT - 40 - START_Y) / LAVA_SPEED, abs=2)
+
+def test_scrolling_draw_applies_camera_offset():
+    game = Game()
+    game.endless = True
+    game.level_seed = 9
+    game.reset()
+    level = game.level
+    level.camera.top = level.camera.prev_top = -50
+    game.draw()
+    platform = level.start_platform
+    assert game.screen.get_at((platform.rect.left + 2, platform.rect.top + 50 + 2))[:3] == GREEN
+    # The scrolling level is always redrawn in full
+    assert not isinstance(game.all_sprites, pygame.sprite.LayeredDirty)
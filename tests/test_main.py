@@ -86,5 +86,69 @@ def test_jump_event(mock_event_get, game):
     game.player.jump = MagicMock()
     
     game.events()
+    # The jump is applied by the next simulation step
+    game.player.jump.assert_not_called()
+    game.step(game.poll_inputs())
     
     game.player.jump.assert_called_once()
+
+def run_frames(game, frame_times):
+    """Run the game loop with a clock reporting frame_times (ms), counting simulation steps."""
+    game.run = MagicMock()
+    game.new()
+    del game.run
+    game.clock = MagicMock()
+    game.clock.tick.side_effect = frame_times
+    steps = []
+    alphas = []
+    real_update = game.update
+    def update():
+        steps.append(len(alphas))
+        real_update()
+    def draw(alpha=1.0):
+        alphas.append(alpha)
+        if len(alphas) == len(frame_times):
+            game.playing = False
+    game.update = update
+    game.draw = draw
+    game.events = MagicMock()
+    game.run()
+    return [steps.count(i) for i in range(len(frame_times))], alphas
+
+def test_fixed_timestep_runs_steps_for_elapsed_time(game):
+    game.set_tick_rate(50) # 20 ms steps
+    # Slow frames run several steps, fast frames may run none
+    steps, alphas = run_frames(game, [50, 5, 5, 5, 20])
+    assert steps == [2, 0, 1, 0, 1]
+    assert alphas == pytest.approx([0.5, 0.75, 0.0, 0.25, 0.25])
+
+def test_fixed_timestep_caps_catch_up(game):
+    game.set_tick_rate(60)
+    steps, alphas = run_frames(game, [1000, 10])
+    assert steps[0] == MAX_CATCH_UP_STEPS
+    # The backlog was dropped instead of being worked off over later frames
+    assert steps[1] <= 1
+
+def test_render_interpolates_between_steps(game):
+    game.run = MagicMock()
+    game.new()
+    player = game.player
+    player.prev_pos = pygame.math.Vector2(100, 300)
+    player.pos = pygame.math.Vector2(110, 300)
+    seen = []
+    game.draw_full = lambda: seen.append(player.rect.midbottom)
+    game.draw(0.5)
+    assert seen == [(105, 300)]
+    # Simulation state is left untouched by rendering
+    assert player.rect.midbottom == (110, 300)
+
+def test_platform_speed_independent_of_tick_rate():
+    from sprites import Platform
+    travelled = []
+    for rate in (30, 60, 120):
+        platform = Platform(0, 0, 100, 20, moving=True)
+        dt = PHYSICS_BASE_RATE / rate
+        for _ in range(rate // 2): # half a second
+            platform.update(dt)
+        travelled.append(platform.x)
+    assert travelled == pytest.approx([50, 50, 50])
@@ -0,0 +1,81 @@
+import random
+import pygame
+import pytest
+from collision import first_landing
+from contacts import Contact
+from sprites import Platform, PlatformGroup, build_level
+from settings import *
+
+np = pytest.importorskip("numpy")
+from platform_store import PlatformStore
+
+def random_platforms(rng, n):
+    return [Platform(rng.randint(0, 700) + rng.choice((0, 0.5, 0.25)), rng.randint(0, 600),
+                     rng.randint(10, 150), 20, moving=rng.random() < 0.5)
+            for _ in range(n)]
+
+def test_view_reads_like_a_platform():
+    store = PlatformStore()
+    view = store.add(0, 0, 100, 20, moving=True)
+    sprite = Platform(0, 0, 100, 20, moving=True)
+    assert view.rect == sprite.rect
+    assert (view.moving, view.is_floor, view.start_x, view.velocity) == \
+           (sprite.moving, sprite.is_floor, sprite.start_x, sprite.velocity)
+    view.update()
+    sprite.update()
+    assert view.rect == sprite.rect and view.x == sprite.x
+
+@pytest.mark.parametrize("dt", [0.5, 1.0, 2.0])
+def test_vectorised_update_matches_platform_update(dt):
+    platforms = random_platforms(random.Random(dt), 200)
+    store = PlatformStore.from_platforms(platforms)
+    for _ in range(500):
+        store.update(dt)
+        for p in platforms:
+            p.update(dt)
+    for p, view in zip(platforms, store):
+        assert view.rect == p.rect
+        if p.moving:
+            assert (view.x, view.prev_x, view.velocity) == (p.x, p.prev_x, p.velocity)
+
+def test_interpolate_matches_platform():
+    platforms = random_platforms(random.Random(3), 50)
+    store = PlatformStore.from_platforms(platforms)
+    store.update()
+    for p in platforms:
+        p.update()
+    store.interpolate(0.3)
+    for p, view in zip(platforms, store):
+        p.interpolate(0.3)
+        assert view.rect == p.rect
+
+def test_collide_matches_platform_group():
+    rng = random.Random(5)
+    platforms = random_platforms(rng, 300)
+    store = PlatformStore.from_platforms(platforms)
+    group = PlatformGroup(*platforms)
+    for _ in range(100):
+        rect = pygame.Rect(rng.randint(-50, 800), rng.randint(-50, 600), rng.randint(1, 200), rng.randint(1, 200))
+        assert [v.index for v in store.collide(rect)] == [platforms.index(p) for p in group.collide(rect)]
+
+def test_views_work_with_collision_and_contacts():
+    platforms, p_start = build_level()
+    store = PlatformStore.from_platforms(platforms)
+    moving = store[3]
+    size = (22, 40)
+    start = (moving.rect.centerx, moving.rect.top - 10)
+    end = (moving.rect.centerx, moving.rect.top + 10)
+    platform, t = first_landing(size, start, end, store.collide(moving.rect.inflate(0, 40)))
+    assert platform == moving and t == 0.5
+    contact = Contact()
+    contact.set(platform, 5.0)
+    assert contact.carry_velocity == platforms[3].velocity
+
+def test_store_grows_and_keeps_entries():
+    store = PlatformStore(capacity=2)
+    views = [store.add(i, i * 2, 10, 20, is_floor=i == 0) for i in range(100)]
+    assert len(store) == 100
+    assert [v.rect.topleft for v in store] == [(i, i * 2) for i in range(100)]
+    assert views[0].is_floor and not views[1].is_floor
+    with pytest.raises(IndexError):
+        store[100]
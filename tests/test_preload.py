@@ -0,0 +1,69 @@
+import pygame
+from unittest.mock import patch
+import sprites
+from preload import BackgroundLoader
+from rendering import TextRenderer, UI_FONT_SIZES
+from sprites import PLAYER_IMAGES, get_player_image, clear_player_image_cache
+from settings import *
+
+def test_loader_installs_fonts_and_tinted_frames():
+    clear_player_image_cache()
+    renderer = TextRenderer()
+    loader = BackgroundLoader(renderer, colors=(RED, BLUE)).start()
+    assert loader.finish(timeout=10) is True
+    assert loader.progress() == 1.0
+    assert FONT_NAME in renderer.font_paths
+
+    # Everything is cached, so creating players does no loading
+    with patch('sprites.load_image') as mock_load:
+        for filename in PLAYER_IMAGES:
+            get_player_image(filename, RED)
+            get_player_image(filename, BLUE)
+    mock_load.assert_not_called()
+
+def test_loader_frames_match_synchronous_path():
+    clear_player_image_cache()
+    BackgroundLoader(TextRenderer(), colors=(YELLOW,)).start().finish(timeout=10)
+    threaded = [get_player_image(f, YELLOW) for f in PLAYER_IMAGES]
+
+    clear_player_image_cache()
+    direct = [get_player_image(f, YELLOW) for f in PLAYER_IMAGES]
+    for (a_right, a_left), (b_right, b_left) in zip(threaded, direct):
+        assert pygame.image.tobytes(a_right, "RGBA") == pygame.image.tobytes(b_right, "RGBA")
+        assert pygame.image.tobytes(a_left, "RGBA") == pygame.image.tobytes(b_left, "RGBA")
+
+def test_poll_does_not_block():
+    loader = BackgroundLoader(TextRenderer(), colors=(RED,))
+    # Worker not started yet: nothing to install, and poll returns immediately
+    assert loader.poll() == 0.0
+    assert loader.done is False
+    assert loader.finish(timeout=0) is False
+
+def test_finish_falls_back_when_worker_fails():
+    clear_player_image_cache()
+    renderer = TextRenderer(font_cache_file=None)
+    loader = BackgroundLoader(renderer, colors=(RED,))
+    with patch('preload.tint_image', side_effect=RuntimeError("boom")):
+        loader.start()
+        assert loader.finish(timeout=10) is True
+    assert isinstance(loader.error, RuntimeError)
+    assert loader.progress() == 1.0
+    # Frames the worker never delivered were loaded synchronously
+    with patch('sprites.load_image') as mock_load:
+        for filename in PLAYER_IMAGES:
+            get_player_image(filename, RED)
+    mock_load.assert_not_called()
+
+def test_finish_without_timeout_returns_when_worker_fails():
+    renderer = TextRenderer(font_cache_file=None)
+    loader = BackgroundLoader(renderer, colors=(RED,))
+    with patch('preload.resolve_font_path', side_effect=OSError("no fonts")):
+        loader.start()
+        assert loader.finish() is True
+    assert FONT_NAME in renderer.font_paths
+
+def test_finish_builds_ui_fonts_on_main_thread():
+    renderer = TextRenderer(font_cache_file=None)
+    BackgroundLoader(renderer, colors=(RED,)).start().finish(timeout=10)
+    for size in UI_FONT_SIZES:
+        assert (FONT_NAME, size) in renderer.fonts
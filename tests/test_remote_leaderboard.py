@@ -0,0 +1,109 @@
+import json
+import time
+import pytest
+from highscore_manager import HighScoreManager, MAX_SCORES
+from leaderboard_server import LeaderboardServer
+from remote_leaderboard import RemoteStore, ConnectionPool
+
+@pytest.fixture
+def server():
+    server = LeaderboardServer().start()
+    yield server
+    server.stop()
+
+def make_store(tmp_path, url, name="cab", ttl=30.0):
+    return RemoteStore(url, MAX_SCORES, str(tmp_path / f"{name}_outbox.jsonl"),
+                       str(tmp_path / f"{name}_cache.json"), ttl=ttl)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+def test_scores_reach_the_shared_board(tmp_path, server):
+    manager = HighScoreManager(store=make_store(tmp_path, server.url))
+    manager.add_score("AAA", 100, (255, 0, 0))
+    assert manager.scores[0]['score'] == 100 # Straight away, locally
+    assert manager.store.wait_sent(5)
+    assert [(e['name'], e['score'], e['color']) for e in server.top(5)] == [("AAA", 100, [255, 0, 0])]
+    manager.close()
+
+def test_submissions_are_batched_over_pooled_connections(tmp_path, server):
+    store = make_store(tmp_path, server.url)
+    manager = HighScoreManager(store=store)
+    for i in range(40):
+        manager.add_score(f"P{i}", i + 1)
+    assert store.wait_sent(5)
+    assert len(server.entries) == 40
+    assert server.batches <= 4
+    for i in range(5):
+        manager.add_score("MORE", 100 + i)
+        assert store.wait_sent(5)
+    # Everything went over the connection opened first
+    assert store.pool.opened == 1 and server.connections == 1
+    manager.close()
+
+def test_other_cabinets_scores_show_after_ttl(tmp_path, server):
+    ours = HighScoreManager(store=make_store(tmp_path, server.url, "ours", ttl=0.1))
+    theirs = HighScoreManager(store=make_store(tmp_path, server.url, "theirs"))
+    theirs.add_score("BBB", 500)
+    assert theirs.store.wait_sent(5)
+    def seen():
+        ours.poll()
+        return ours.scores and ours.scores[0]['name'] == "BBB"
+    wait_for(seen)
+    ours.close()
+    theirs.close()
+
+def test_offline_scores_are_sent_on_reconnect(tmp_path):
+    server = LeaderboardServer().start()
+    host, port = server.httpd.server_address
+    url = server.url
+    server.stop()
+
+    store = make_store(tmp_path, url)
+    manager = HighScoreManager(store=store)
+    manager.add_score("OFF", 70)
+    manager.flush()
+    assert not store.wait_sent(0.3)
+    # Polling the board never waits on the dead server
+    start = time.perf_counter()
+    manager.poll()
+    assert time.perf_counter() - start < 0.01
+    manager.close()
+    with open(tmp_path / "cab_outbox.jsonl") as f:
+        assert [json.loads(line)['name'] for line in f] == ["OFF"]
+
+    # Back online, and the game restarted: the outbox goes out
+    server = LeaderboardServer(host, port).start()
+    try:
+        store = make_store(tmp_path, url)
+        manager = HighScoreManager(store=store)
+        assert manager.scores[0]['name'] == "OFF"
+        assert store.wait_sent(5)
+        assert [e['name'] for e in server.top(5)] == ["OFF"]
+        assert (tmp_path / "cab_outbox.jsonl").read_text() == ""
+        manager.close()
+    finally:
+        server.stop()
+
+def test_cached_board_loads_offline(tmp_path, server):
+    store = make_store(tmp_path, server.url)
+    manager = HighScoreManager(store=store)
+    manager.add_score("CCC", 300)
+    assert store.wait_sent(5)
+    wait_for(lambda: json.loads((tmp_path / "cab_cache.json").read_text() or "[]"))
+    manager.close()
+
+    offline = make_store(tmp_path, "http://127.0.0.1:9")
+    assert [e['name'] for e in HighScoreManager(store=offline).scores] == ["CCC"]
+    offline.close()
+
+def test_resent_batch_is_counted_once(server):
+    pool = ConnectionPool(server.url)
+    batch = {"scores": [{"name": "DUP", "score": 10, "color": None, "uid": "u1"}]}
+    assert pool.request("POST", "/scores", batch) == {"accepted": 1}
+    assert pool.request("POST", "/scores", batch) == {"accepted": 0}
+    assert len(server.top(5)) == 1
+    pool.close()
@@ -0,0 +1,170 @@
+import pygame
+from unittest.mock import MagicMock, patch
+from main import Game
+from rendering import TextRenderer, StaticLayer, resolve_font_path
+from sprites import Platform
+from settings import *
+
+def test_font_cached_by_name_and_size():
+    renderer = TextRenderer()
+    assert renderer.get_font(22) is renderer.get_font(22)
+    assert renderer.get_font(22) is not renderer.get_font(48)
+
+@patch('pygame.font.match_font', return_value=None)
+def test_font_lookup_only_once(mock_match_font):
+    renderer = TextRenderer(font_cache_file=None)
+    for size in (16, 22, 48):
+        renderer.render("HS: 10", size, WHITE)
+    mock_match_font.assert_called_once_with(FONT_NAME)
+
+def test_font_path_persisted_between_runs(tmp_path):
+    cache_file = str(tmp_path / "fonts.json")
+    font_file = tmp_path / "cascadia.ttf"
+    font_file.write_bytes(b"")
+    with patch('pygame.font.match_font', return_value=str(font_file)) as mock_match_font:
+        assert resolve_font_path(FONT_NAME, cache_file) == str(font_file)
+        assert resolve_font_path(FONT_NAME, cache_file) == str(font_file)
+        # A fresh renderer (next launch) reads the cached path
+        assert TextRenderer(font_cache_file=cache_file).font_path(FONT_NAME) == str(font_file)
+    mock_match_font.assert_called_once()
+
+def test_font_path_rechecked_when_missing(tmp_path):
+    cache_file = str(tmp_path / "fonts.json")
+    with patch('pygame.font.match_font', return_value=str(tmp_path / "gone.ttf")):
+        resolve_font_path(FONT_NAME, cache_file)
+    with patch('pygame.font.match_font', return_value=None) as mock_match_font:
+        assert resolve_font_path(FONT_NAME, cache_file) is None
+    mock_match_font.assert_called_once_with(FONT_NAME)
+
+def test_missing_font_is_not_persisted(tmp_path):
+    cache_file = tmp_path / "fonts.json"
+    with patch('pygame.font.match_font', return_value=None) as mock_match_font:
+        assert resolve_font_path(FONT_NAME, str(cache_file)) is None
+        assert resolve_font_path(FONT_NAME, str(cache_file)) is None
+    assert mock_match_font.call_count == 2
+    assert not cache_file.exists()
+
+    # Installed later: found on the next launch
+    font_file = tmp_path / "cascadia.ttf"
+    font_file.write_bytes(b"")
+    with patch('pygame.font.match_font', return_value=str(font_file)):
+        assert resolve_font_path(FONT_NAME, str(cache_file)) == str(font_file)
+
+def test_game_uses_configured_font_cache(font_cache_file):
+    game = Game()
+    assert game.text_renderer.font_cache_file == font_cache_file
+
+def test_unchanged_text_is_not_rerendered():
+    renderer = TextRenderer()
+    first = renderer.render("10", 22, YELLOW)
+    second = renderer.render("10", 22, YELLOW)
+    assert first is second
+    assert renderer.misses == 1
+    assert renderer.hits == 1
+
+    # A new value (or colour) renders a new surface
+    assert renderer.render("20", 22, YELLOW) is not first
+    assert renderer.render("10", 22, [255, 0, 0]) is not first
+
+def test_surface_cache_is_bounded_lru():
+    renderer = TextRenderer(max_surfaces=3)
+    renderer.render("a", 22, WHITE)
+    renderer.render("b", 22, WHITE)
+    renderer.render("c", 22, WHITE)
+    renderer.render("a", 22, WHITE) # 'a' is now most recently used
+    renderer.render("d", 22, WHITE) # evicts 'b'
+
+    assert len(renderer.surfaces) == 3
+    assert ("b", 22, WHITE) not in renderer.surfaces
+    assert ("a", 22, WHITE) in renderer.surfaces
+
+def render_frames(dirty, frames=30):
+    game = Game()
+    game.dirty_rendering = dirty
+    game.run = MagicMock()
+    game.new()
+    captured = []
+    for _ in range(frames):
+        game.update()
+        game.draw()
+        captured.append(pygame.image.tobytes(game.screen, "RGB"))
+    return captured
+
+def test_dirty_rect_frames_match_full_redraw():
+    full = render_frames(dirty=False)
+    dirty = render_frames(dirty=True)
+    assert len(full) == len(dirty)
+    for i, (a, b) in enumerate(zip(full, dirty)):
+        assert a == b, f"frame {i} differs"
+
+def test_dirty_rect_updates_only_changed_regions():
+    game = Game()
+    game.dirty_rendering = True
+    game.run = MagicMock()
+    game.new()
+    game.all_sprites._use_update = True
+    game.draw() # first frame after level build
+
+    with patch('pygame.display.update') as mock_update:
+        game.update()
+        game.draw()
+    rects = mock_update.call_args[0][0]
+    screen_area = SCREEN_WIDTH * SCREEN_HEIGHT
+    assert sum(r.width * r.height for r in rects) < screen_area / 4
+
+def test_static_layer_bakes_only_stationary_platforms():
+    layer = StaticLayer((200, 200))
+    static = Platform(10, 10, 50, 20)
+    moving = Platform(10, 100, 50, 20, moving=True)
+    layer.bake([static, moving])
+
+    assert layer.stale is False
+    assert layer.surface.get_at((20, 15))[:3] == GREEN
+    assert layer.surface.get_at((20, 105))[:3] == BLACK
+
+def test_static_layer_rebuilt_only_when_invalidated():
+    layer = StaticLayer((200, 200))
+    platforms = [Platform(10, 10, 50, 20)]
+    surface = layer.get(platforms)
+
+    platforms.append(Platform(100, 100, 50, 20))
+    assert layer.get(platforms).get_at((110, 105))[:3] == BLACK # still cached
+
+    layer.invalidate()
+    assert layer.get(platforms) is surface
+    assert surface.get_at((110, 105))[:3] == GREEN
+
+def test_game_keeps_static_platforms_out_of_sprite_pass():
+    game = Game()
+    game.run = MagicMock()
+    game.new()
+    dynamic = [s for s in game.all_sprites if isinstance(s, Platform)]
+    assert dynamic and all(p.moving for p in dynamic)
+    assert game.static_layer.stale is False
+
+    game.add_platform(Platform(600, 100, 50, 20))
+    assert game.static_layer.stale is True
+
+def test_full_redraw_does_not_build_hud_sprites():
+    game = Game()
+    game.dirty_rendering = False
+    game.run = MagicMock()
+    with patch('main.HudLabel') as mock_label:
+        game.new()
+    mock_label.assert_not_called()
+
+def test_removing_platforms_invalidates_static_layer():
+    game = Game()
+    game.run = MagicMock()
+    game.new()
+    static = [p for p in game.platforms if not p.moving][1]
+    game.static_layer.get(game.platforms)
+
+    game.remove_platform(static)
+    assert game.static_layer.stale is True
+    assert static not in game.platforms
+    baked = game.static_layer.get(game.platforms)
+    assert baked.get_at(static.rect.center)[:3] == BLACK
+
+    game.platforms.empty()
+    assert game.static_layer.stale is True
@@ -0,0 +1,92 @@
+import io
+import random
+import pytest
+from unittest.mock import MagicMock
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from main import Game
+from replay import InputRecorder, Recording, game_header, encode_varint, decode_varint
+from simulation import Simulation
+from tests.test_simulation import SCRIPT
+
+def record(sim, script):
+    """Step sim through script while recording, and return the recording's bytes and the states."""
+    sim.reset()
+    buffer = io.BytesIO()
+    buffer.close = lambda: None # Keep the bytes readable after the recorder closes
+    sim.game.recorder = InputRecorder(buffer, game_header(sim.game))
+    states = list(sim.run(script))
+    sim.game.recorder.close(sim.game.score)
+    return buffer.getvalue(), states
+
+def test_varint_round_trip():
+    for value in (0, 1, 127, 128, 300, 2 ** 21, 2 ** 40):
+        data = encode_varint(value)
+        assert decode_varint(data, 0) == (value, len(data))
+    assert decode_varint(encode_varint(300)[:1], 0)[0] is None
+
+def test_recording_is_run_length_encoded():
+    data, states = record(Simulation(), SCRIPT)
+    recording = Recording.parse(data)
+    assert recording.runs == [(INPUT_JUMP, 1), (INPUT_RIGHT, 40), (0, 60), (INPUT_LEFT, len(states) - 101)]
+    assert list(recording.inputs()) == SCRIPT[:len(states)]
+    assert recording.summary == {'steps': len(states), 'score': states[-1].score}
+
+def test_replay_reproduces_the_run():
+    data, states = record(Simulation(), SCRIPT)
+    assert Recording.parse(data).play() == states[-1]
+    assert states[-1].score > 0
+
+def test_replay_keeps_the_endless_level_and_tick_rate():
+    rng = random.Random(3)
+    script = [rng.choice((0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP | INPUT_RIGHT)) for _ in range(2000)]
+    data, states = record(Simulation(tick_rate=120, endless=True, seed=99), script)
+    recording = Recording.parse(data)
+    assert recording.header['seed'] == 99
+    assert recording.header['tick_rate'] == 120
+    assert recording.play() == states[-1]
+
+def test_replay_refuses_other_settings(monkeypatch):
+    data, _ = record(Simulation(), SCRIPT)
+    monkeypatch.setattr("settings.PLAYER_JUMP", 25)
+    with pytest.raises(ValueError, match="PLAYER_JUMP"):
+        Recording.parse(data).play()
+
+def test_cut_short_recording_plays_its_complete_runs():
+    data, states = record(Simulation(), SCRIPT)
+    # Lose the summary and the last run's count
+    recording = Recording.parse(data[:data.rindex(bytes((INPUT_LEFT,))) + 1])
+    assert recording.summary is None
+    assert recording.steps == 101
+    assert recording.play() == states[100]
+
+def test_minute_of_play_is_small():
+    # A restless player changing input about ten times a second
+    rng = random.Random(1)
+    script = []
+    while len(script) < 60 * 60:
+        script += [rng.choice((0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP))] * rng.randint(1, 12)
+    sim = Simulation(endless=True, seed=5)
+    sim.reset()
+    buffer = io.BytesIO()
+    recorder = InputRecorder(buffer, game_header(sim.game))
+    for inputs in script[:60 * 60]:
+        recorder.record(inputs)
+    recorder.write_run()
+    assert len(buffer.getvalue()) < 2048
+
+def test_game_records_each_game(tmp_path, monkeypatch):
+    monkeypatch.setattr("main.REPLAY_DIR", str(tmp_path))
+    game = Game()
+    game.record_replays = True
+    game.keyboard = MagicMock()
+    game.keyboard.held.return_value = INPUT_LEFT
+    game.clock = MagicMock()
+    game.clock.tick.return_value = game.step_ms
+    game.new()
+    assert game.recorder is None
+    (path,) = tmp_path.iterdir()
+    recording = Recording.load(str(path))
+    assert recording.summary['score'] == game.score
+    state = recording.play()
+    assert state.game_over
+    assert state.tick == recording.summary['steps']
@@ -0,0 +1,100 @@
+import pygame
+import pytest
+from unittest.mock import MagicMock, patch
+import scenes
+from main import Game
+from scenes import SceneScheduler, ColorSelectScene, DelayScene, GameOverScene, NameEntryScene
+from settings import *
+
+@pytest.fixture
+def game():
+    pygame.event.clear()
+    g = Game()
+    yield g
+    pygame.event.clear()
+
+def post_key(event_type, key, unicode=""):
+    pygame.event.post(pygame.event.Event(event_type, key=key, unicode=unicode))
+
+def post_key_later(delay, event_type, key):
+    # Arrives after the scene's input delay, like a real key press would
+    pygame.time.set_timer(pygame.event.Event(event_type, key=key, unicode=""), delay, loops=1)
+
+def test_color_changes_do_not_recurse(game):
+    keys = [pygame.K_r, pygame.K_b, pygame.K_y]
+    for i in range(600):
+        post_key(pygame.KEYUP, keys[i % 3])
+    post_key(pygame.KEYUP, pygame.K_r)
+    post_key(pygame.KEYUP, pygame.K_RETURN)
+
+    scene = ColorSelectScene(game)
+    scene.draw = MagicMock(wraps=scene.draw)
+    game.scheduler.run(scene) # would overflow the stack if each change recursed
+
+    assert game.player_color == RED
+    assert game.running is True
+    # One redraw per actual change (600 from the cycle, then R) plus the first frame
+    assert scene.draw.call_count == 602
+
+def test_repeated_color_key_does_not_redraw(game):
+    post_key(pygame.KEYUP, pygame.K_y) # already yellow
+    post_key(pygame.KEYUP, pygame.K_RETURN)
+    scene = ColorSelectScene(game)
+    scene.draw = MagicMock()
+    game.scheduler.run(scene)
+    scene.draw.assert_called_once()
+
+def test_quit_from_color_selection(game):
+    post_key(pygame.KEYUP, pygame.K_q)
+    game.show_color_selection_screen()
+    assert game.running is False
+
+def test_static_scene_blocks_instead_of_polling(game):
+    post_key(pygame.KEYUP, pygame.K_RETURN)
+    with patch('pygame.event.wait', wraps=pygame.event.wait) as mock_wait, \
+            patch('pygame.event.get') as mock_get:
+        game.show_color_selection_screen()
+    mock_get.assert_not_called()
+    assert mock_wait.call_count == 1
+
+def test_delay_scene_times_out(game):
+    start = pygame.time.get_ticks()
+    game.wait_for_duration(50)
+    assert pygame.time.get_ticks() - start >= 50
+
+def test_name_entry_then_game_over(game, monkeypatch):
+    monkeypatch.setattr(scenes, 'SCREEN_DELAY', 50)
+    game.score = 50
+    game.hs_manager = MagicMock()
+    game.hs_manager.scores = []
+    for ch in "abcd":
+        post_key(pygame.KEYDOWN, getattr(pygame, f"K_{ch}"), ch)
+    post_key(pygame.KEYDOWN, pygame.K_RETURN)
+    post_key_later(150, pygame.KEYUP, pygame.K_SPACE)
+
+    over = GameOverScene(game)
+    game.scheduler.run(NameEntryScene(game, next_scene=over))
+    game.hs_manager.add_score.assert_called_once_with("ABC", 50, YELLOW)
+    assert over.show_prompt is True
+    assert over.done is True
+    assert game.running is True
+
+def test_game_over_delay_starts_after_name_entry(game, monkeypatch):
+    monkeypatch.setattr(scenes, 'SCREEN_DELAY', 100)
+    game.score = 50
+    game.hs_manager = MagicMock()
+    game.hs_manager.scores = []
+    over = GameOverScene(game)
+    entry = NameEntryScene(game, next_scene=over)
+
+    # A slow typist: the name entry outlasts the game over delay
+    pygame.time.wait(150)
+    post_key(pygame.KEYDOWN, pygame.K_a, "a")
+    post_key(pygame.KEYDOWN, pygame.K_RETURN)
+    post_key(pygame.KEYUP, pygame.K_RETURN) # must not close the leaderboard
+    post_key_later(200, pygame.KEYUP, pygame.K_SPACE)
+
+    start = pygame.time.get_ticks()
+    game.scheduler.run(entry)
+    assert pygame.time.get_ticks() - start >= 100
+    assert over.done is True
@@ -0,0 +1,89 @@
+import json
+import random
+import pytest
+from highscore_manager import HighScoreManager, MAX_SCORES
+from score_store import RankIndex, SqliteStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteStore(str(tmp_path / "scores.db"), MAX_SCORES)
+    yield store
+    store.close()
+
+def submit(store, name, score, color=(255, 255, 0), day="2026-10-18"):
+    entry = {'name': name, 'score': score, 'color': color, 'day': day}
+    store.submit(entry)
+    return entry
+
+def test_rank_index_matches_counting():
+    rng = random.Random(4)
+    scores = [rng.randrange(0, 5000, 10) for _ in range(500)]
+    index = RankIndex()
+    for i, score in enumerate(scores):
+        index.add(score)
+        probe = rng.randrange(-10, 6000)
+        assert index.rank(probe) == 1 + sum(s > probe for s in scores[:i + 1])
+
+def test_rank_counts_scores_before_they_are_written(store):
+    submit(store, "A", 100)
+    store.flush()
+    assert store.rank(150) == 1
+    submit(store, "B", 200)
+    # Ranked from memory, without waiting for the writer
+    assert store.rank(150) == 2
+    assert store.rank(100) == 2
+    assert store.rank(50) == 3
+
+def test_boards_by_color_and_day(store):
+    submit(store, "Y", 300, color=(255, 255, 0))
+    submit(store, "R", 200, color=(255, 0, 0))
+    submit(store, "R", 100, color=(255, 0, 0), day="2026-10-19")
+    assert store.rank(150, color=(255, 0, 0)) == 2
+    assert store.rank(150, day="2026-10-18") == 3
+    submit(store, "R2", 250, color=[255, 0, 0])
+    assert store.rank(150, color=(255, 0, 0)) == 3
+    store.flush()
+    assert [e['name'] for e in store.page(10, color=(255, 0, 0))] == ["R2", "R", "R"]
+    assert [e['score'] for e in store.page(10, day="2026-10-19")] == [100]
+    assert store.best("R")['score'] == 200
+    assert store.best("nobody") is None
+
+def test_pages_continue_after_the_last_entry(store):
+    scores = [50, 70, 70, 70, 10, 90, 30]
+    for i, score in enumerate(scores):
+        submit(store, f"P{i}", score)
+    store.flush()
+    seen = []
+    page = store.page(2)
+    while page:
+        seen += page
+        page = store.page(2, after=page[-1])
+    # Ties keep submission order
+    assert [(e['score'], e['name']) for e in seen] == [
+        (90, "P5"), (70, "P1"), (70, "P2"), (70, "P3"), (50, "P0"), (30, "P6"), (10, "P4")]
+
+def test_scores_persist_and_manager_sees_top(tmp_path):
+    filename = str(tmp_path / "scores.db")
+    manager = HighScoreManager(store=SqliteStore(filename, MAX_SCORES))
+    for score in range(10, 110, 10):
+        manager.add_score("AAA", score)
+    assert manager.rank(55) == 6
+    manager.close()
+
+    manager = HighScoreManager(store=SqliteStore(filename, MAX_SCORES))
+    # Only the top 5 are on the board, but every run is kept
+    assert [e['score'] for e in manager.scores] == [100, 90, 80, 70, 60]
+    assert manager.rank(55) == 6
+    assert manager.store.page(20)[-1]['score'] == 10
+    manager.close()
+
+def test_import_json_once(tmp_path, store):
+    legacy = tmp_path / "highscores.json"
+    legacy.write_text(json.dumps([{'name': 'OLD', 'score': 70, 'color': [255, 0, 0]},
+                                  {'name': 'OLD', 'score': 40, 'color': [255, 0, 0]}]))
+    assert store.import_json(str(legacy)) == 2
+    assert store.import_json(str(legacy)) == 0
+    assert [e['score'] for e in store.load()] == [70, 40]
+    submit(store, "NEW", 50)
+    store.flush()
+    assert [e['name'] for e in store.load()] == ["OLD", "NEW", "OLD"]
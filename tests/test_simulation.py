@@ -0,0 +1,116 @@
+import pygame
+from unittest.mock import MagicMock, patch
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from main import Game
+from simulation import Simulation
+from settings import *
+
+# Jump up to the right, wait, then walk left until falling into the lava
+SCRIPT = [INPUT_JUMP] + [INPUT_RIGHT] * 40 + [0] * 60 + [INPUT_LEFT] * 300
+
+def test_headless_game_opens_no_window():
+    with patch('pygame.display.set_mode') as mock_set_mode:
+        sim = Simulation()
+        sim.reset()
+        sim.step(INPUT_RIGHT)
+    mock_set_mode.assert_not_called()
+    assert sim.game.screen is None
+
+def test_simulation_is_deterministic():
+    runs = []
+    for _ in range(2):
+        sim = Simulation()
+        sim.reset()
+        runs.append(list(sim.run(SCRIPT)))
+    assert runs[0] == runs[1]
+
+def test_simulation_stops_at_game_over():
+    sim = Simulation()
+    start = sim.reset()
+    assert start.game_over is False
+    states = list(sim.run([INPUT_RIGHT] * 1000))
+    assert states[-1].game_over is True
+    assert len(states) < 1000
+    assert all(not s.game_over for s in states[:-1])
+
+def test_simulation_respects_max_steps():
+    sim = Simulation()
+    sim.reset()
+    assert len(list(sim.run([0] * 100, max_steps=10))) == 10
+
+def run_interactive(script):
+    """Play script through the real game loop, one step per frame, posting jump key presses."""
+    game = Game()
+    game.hs_manager.scores = []
+    held = {'inputs': 0}
+    game.keyboard = MagicMock()
+    game.keyboard.held.side_effect = lambda: held['inputs']
+    frames = iter(script)
+    states = []
+
+    def tick(fps):
+        inputs = next(frames, None)
+        if inputs is None:
+            game.playing = False
+            return 0
+        held['inputs'] = inputs & (INPUT_LEFT | INPUT_RIGHT)
+        if inputs & INPUT_JUMP:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return game.step_ms
+    game.clock = MagicMock()
+    game.clock.tick.side_effect = tick
+
+    real_update = game.update
+    def update():
+        real_update()
+        player = game.player
+        states.append(((player.pos.x, player.pos.y), (player.vel.x, player.vel.y), game.score, not game.playing))
+    game.update = update
+    pygame.event.clear()
+    game.new()
+    return states
+
+def test_simulation_matches_interactive_game():
+    interactive = run_interactive(SCRIPT)
+
+    sim = Simulation()
+    sim.reset()
+    headless = [(s.pos, s.vel, s.score, s.game_over) for s in sim.run(SCRIPT)]
+
+    assert headless == interactive
+    assert headless[-1][2] > 0
+    assert headless[-1][3] is True
+
+def test_steps_allocate_nothing_that_outlives_them():
+    import gc
+    import tracemalloc
+    # Jump, land back on the start platform and shuffle about. The loop lasts
+    # two trips of the moving platform, so the whole world repeats with it
+    loop = [INPUT_JUMP] + [0] * 79 + [INPUT_LEFT] * 5 + [0] * 75 + [INPUT_RIGHT] * 5 + [0] * 75
+    sim = Simulation()
+    sim.reset()
+    game = sim.game
+    player = game.player
+    vectors = player.pos, player.vel, player.acc
+    def run(loops):
+        for _ in range(loops):
+            for inputs in loop:
+                game.step(inputs)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # Warm caches and free lists while traced, so what they replace is too
+        run(10)
+        before = tracemalloc.take_snapshot()
+        run(20)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    assert game.playing
+    # Integrated in place, never replaced
+    assert all(a is b for a, b in zip((player.pos, player.vel, player.acc), vectors))
+    # Everything but this test and tracemalloc's own bookkeeping
+    game_code = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(game_code).compare_to(before.filter_traces(game_code), 'filename')
+    assert sum(stat.size_diff for stat in diff) == 0
+    assert sum(stat.count_diff for stat in diff) == 0
@@ -0,0 +1,165 @@
+import random
+import pytest
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from ghost import GhostRecorder
+from main import Game
+from simulation import Simulation
+from snapshot import WorldSnapshot, SnapshotRing
+from tests.test_simulation import SCRIPT
+
+def random_script(seed, steps):
+    rng = random.Random(seed)
+    script = []
+    while len(script) < steps:
+        script += [rng.choice((0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP | INPUT_LEFT, INPUT_JUMP | INPUT_RIGHT))] * rng.randint(1, 20)
+    return script[:steps]
+
+def world(game):
+    """Everything a snapshot should bring back, for comparing."""
+    player = game.player
+    animator = player.animator
+    platforms = game.world_platforms()
+    return (
+        tuple(player.pos), tuple(player.prev_pos), tuple(player.vel), tuple(player.acc), player.rect.topleft,
+        player.walking, player.jumping, animator.clip_name, animator.facing, animator.tick, player.image,
+        player.contact.grounded, platforms.index(player.contact.support) if player.contact.support else None,
+        player.contact.impact_velocity,
+        tuple((p.rect.topleft, p.x, p.prev_x, p.velocity) if p.moving else p.rect.topleft for p in platforms),
+        platforms.index(game.last_platform) if game.last_platform in platforms else None,
+        game.score, game.playing,
+    )
+
+def test_restore_replays_identically():
+    sim = Simulation()
+    sim.reset()
+    list(sim.run(SCRIPT[:50]))
+    snapshot = sim.snapshot()
+    before = world(sim.game)
+    first = list(sim.run(SCRIPT[50:]))
+    assert first[-1].game_over
+
+    assert sim.restore(snapshot).tick == 50
+    assert world(sim.game) == before
+    # Retry from the checkpoint, more than once
+    assert list(sim.run(SCRIPT[50:])) == first
+    sim.restore(snapshot)
+    assert list(sim.run(SCRIPT[50:])) == first
+
+def test_restore_brings_back_streamed_chunks():
+    # Hop about on the start platform until the lava gets there
+    script = ([INPUT_JUMP] + [0] * 79 + [INPUT_LEFT] * 5 + [0] * 75 + [INPUT_RIGHT] * 5 + [0] * 75) * 5
+    reference = Simulation(endless=True, seed=7)
+    reference.reset()
+    expected = list(reference.run(script))
+    assert len(expected) > 120
+
+    sim = Simulation(endless=True, seed=7)
+    sim.reset()
+    list(sim.run(script[:100]))
+    snapshot = sim.snapshot()
+    before = world(sim.game)
+    level = sim.game.level
+    chunks = [i for i, _ in level.chunks]
+    # Scroll far up, so the chunks in the snapshot are evicted
+    for _ in range(50):
+        level.camera.top -= 50
+        level.update()
+    assert level.first_chunk > chunks[-1]
+
+    sim.restore(snapshot)
+    assert [i for i, _ in level.chunks] == chunks
+    assert world(sim.game) == before
+    assert list(sim.run(script[100:])) == expected[100:]
+
+def test_rollback_every_step():
+    # Resimulate each step from the snapshot before it, like a rollback client
+    script = random_script(2, 600)
+    reference = Simulation(endless=True, seed=3)
+    reference.reset()
+    expected = list(reference.run(script))
+
+    sim = Simulation(endless=True, seed=3)
+    sim.reset()
+    snapshot = WorldSnapshot(sim.game)
+    states = []
+    for inputs in script[:len(expected)]:
+        sim.snapshot(into=snapshot)
+        sim.step(INPUT_LEFT)
+        sim.restore(snapshot)
+        states.append(sim.step(inputs))
+    assert states == expected
+
+def test_snapshot_bytes_round_trip():
+    sim = Simulation()
+    sim.reset()
+    list(sim.run(SCRIPT[:80]))
+    data = bytes(sim.snapshot().data)
+    # Header and the one moving platform
+    assert len(data) < 200
+    expected = list(sim.run(SCRIPT[80:]))
+
+    received = WorldSnapshot(sim.game)
+    received.load(data)
+    sim.restore(received)
+    assert list(sim.run(SCRIPT[80:])) == expected
+
+def test_restore_after_game_over_resumes():
+    sim = Simulation()
+    sim.reset()
+    snapshot = sim.snapshot()
+    list(sim.run([INPUT_RIGHT] * 1000))
+    assert not sim.game.playing
+    assert not sim.restore(snapshot).game_over
+
+def test_snapshot_of_another_session_is_refused():
+    sim = Simulation()
+    sim.reset()
+    snapshot = sim.snapshot()
+    with pytest.raises(ValueError):
+        WorldSnapshot(sim.game).restore()
+    sim.reset()
+    with pytest.raises(ValueError):
+        sim.restore(snapshot)
+
+def test_ring_rewinds():
+    sim = Simulation()
+    sim.reset()
+    ring = SnapshotRing(sim.game, 30)
+    states = []
+    for inputs in SCRIPT[:100]:
+        states.append(sim.step(inputs))
+        ring.push(sim.tick)
+    assert len(ring) == 30
+    sim.tick = ring.rewind(10)
+    assert sim.state() == states[89]
+    assert sim.tick == 90
+    sim.tick = ring.rewind(0)
+    assert sim.state() == states[89]
+    # The older snapshots are still there
+    sim.tick = ring.rewind(29 - 10)
+    assert sim.state() == states[70]
+    with pytest.raises(IndexError):
+        ring.rewind(11)
+
+def test_restore_puts_the_ghost_back():
+    game = Game()
+    sim = Simulation()
+    sim.reset()
+    recorder = GhostRecorder.for_game(sim.game)
+    for _ in sim.run(SCRIPT):
+        recorder.record(sim.game.player)
+    game.best_ghost = recorder.run(sim.game.score)
+    game.hs_manager.scores = [{'name': 'AAA', 'score': sim.game.score, 'color': list(game.player_color)}]
+    game.reset()
+    for inputs in SCRIPT[:40]:
+        game.step(inputs)
+    snapshot = WorldSnapshot(game)
+    snapshot.capture()
+    rect = game.ghost.rect.copy()
+    for _ in range(len(SCRIPT)):
+        game.step(0)
+    assert not game.ghost.alive()
+    snapshot.restore()
+    assert game.ghost.alive()
+    assert game.ghost.playback.step == 40
+    assert game.ghost.rect == rect
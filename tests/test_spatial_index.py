@@ -0,0 +1,50 @@
+import random
+import pygame
+from unittest.mock import patch
+from spatial_index import UniformGrid
+from sprites import Platform, PlatformGroup
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x, y, w, h):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, w, h)
+        self.moving = False
+
+def random_boxes(rng, n):
+    return [Box(rng.randint(-500, 2000), rng.randint(-500, 2000), rng.randint(1, 300), rng.randint(1, 60)) for _ in range(n)]
+
+def test_collide_matches_spritecollide():
+    rng = random.Random(3)
+    group = PlatformGroup(*random_boxes(rng, 300), cell_size=64)
+    probe = pygame.sprite.Sprite()
+    for _ in range(500):
+        probe.rect = pygame.Rect(rng.randint(-600, 2100), rng.randint(-600, 2100), rng.randint(0, 200), rng.randint(0, 200))
+        assert group.collide(probe.rect) == pygame.sprite.spritecollide(probe, group, False)
+
+def test_grid_removes_empty_cells():
+    grid = UniformGrid(32)
+    box = Box(0, 0, 100, 10)
+    grid.insert(box)
+    assert len(grid.cells) == 4
+    grid.remove(box)
+    assert grid.cells == {} and len(grid) == 0
+
+def test_moving_platform_refiles_only_when_changing_cells():
+    platform = Platform(0, 0, 100, 20, moving=True)
+    group = PlatformGroup(platform, cell_size=128)
+    with patch.object(group.grid, 'insert', wraps=group.grid.insert) as mock_insert:
+        for _ in range(30):
+            platform.update()
+            assert group.collide(platform.rect) == [platform]
+    # 30 steps of ~1.7px cross a cell boundary once
+    assert mock_insert.call_count == 1
+    assert group.collide(pygame.Rect(0, 0, 1, 1)) == []
+
+def test_removed_platforms_leave_the_index():
+    a, b = Platform(0, 0, 50, 20), Platform(0, 0, 50, 20, moving=True)
+    group = PlatformGroup(a, b)
+    a.kill()
+    assert group.collide(pygame.Rect(0, 0, 10, 10)) == [b]
+    group.empty()
+    assert len(group.grid) == 0
+    b.update() # no longer indexed, must not fail
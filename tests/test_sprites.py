@@ -1,7 +1,8 @@
 import pytest
 import pygame
+import sprites
 from unittest.mock import patch, MagicMock
-from sprites import Player, Platform
+from sprites import Player, Platform, PlatformGroup, PlatformPool, PoolStats, get_player_image, prewarm_player_images, clear_player_image_cache, PLAYER_IMAGES
 from settings import *
 
 def test_platform_init():
@@ -66,3 +67,65 @@ def test_player_screen_wrap():
     p.pos.x = -10
     p.update()
     assert p.pos.x == SCREEN_WIDTH
+
+def test_player_images_shared_between_instances():
+    game = MockGame()
+    clear_player_image_cache()
+    with patch('sprites.load_image', wraps=sprites.load_image) as mock_load:
+        p1 = Player(game, color=RED)
+        p2 = Player(game, color=RED)
+    assert mock_load.call_count == len(PLAYER_IMAGES)
+    assert p1.image is p2.image
+    assert p1.animator.clips is p2.animator.clips
+
+def test_player_images_cached_per_color():
+    assert get_player_image('p1_idle.png', RED) is not get_player_image('p1_idle.png', BLUE)
+    right, left = get_player_image('p1_idle.png', list(RED))
+    assert right is get_player_image('p1_idle.png', RED)[0]
+    assert left.get_size() == right.get_size()
+
+def test_prewarm_avoids_loading_on_restart():
+    clear_player_image_cache()
+    prewarm_player_images()
+    with patch('sprites.load_image') as mock_load, patch('pygame.transform.flip') as mock_flip:
+        for color in (RED, BLUE, YELLOW):
+            Player(MockGame(), color=color)
+    mock_load.assert_not_called()
+    mock_flip.assert_not_called()
+
+def test_pool_reuses_platforms_and_shares_surfaces():
+    pool = PlatformPool()
+    a = pool.acquire(0, 0, 100, 20)
+    b = pool.acquire(200, 0, 100, 20, moving=True)
+    assert a.image is b.image
+    assert pool.acquire(0, 0, 100, 40, is_floor=True).image is not a.image
+
+    pool.release(b)
+    c = pool.acquire(300, 50, 100, 20)
+    assert c is b
+    assert (c.rect.topleft, c.moving, c.dirty) == ((300, 50), False, 1)
+    assert pool.stats() == PoolStats(created=3, reused=1, in_use=3, free=0, surfaces=2)
+
+def test_released_platform_leaves_its_groups():
+    pool = PlatformPool()
+    group = PlatformGroup()
+    platform = pool.acquire(0, 0, 100, 20)
+    group.add(platform)
+    pool.release(platform)
+    assert not group and platform.grid is None
+    assert group.collide(pygame.Rect(0, 0, 100, 20)) == []
+
+@pytest.mark.parametrize("endless", [False, True])
+def test_warm_pool_restarts_without_new_sprites_or_surfaces(endless):
+    from simulation import Simulation
+    sim = Simulation(endless=endless, seed=3)
+    sim.reset()
+    pool = sim.game.platform_pool
+    created, surfaces = pool.stats().created, pool.stats().surfaces
+    with patch('pygame.Surface', side_effect=AssertionError("new surface")):
+        for _ in range(3):
+            sim.reset()
+            list(sim.run([0] * 50))
+    assert pool.stats().created == created
+    assert pool.stats().surfaces == surfaces
+    assert pool.stats().reused >= 3 * created
@@ -0,0 +1,25 @@
+import pygame
+from unittest.mock import patch
+from startup import StartupTimer, init_pygame
+
+def test_fast_init_skips_unused_subsystems():
+    with patch('pygame.init') as mock_init, patch('pygame.display.init') as mock_display, \
+            patch('pygame.font.init') as mock_font:
+        init_pygame(fast=True)
+    mock_init.assert_not_called()
+    mock_display.assert_called_once()
+    mock_font.assert_called_once()
+
+def test_full_init():
+    with patch('pygame.init') as mock_init:
+        init_pygame(fast=False)
+    mock_init.assert_called_once()
+
+def test_startup_report():
+    timer = StartupTimer()
+    timer.mark("imports")
+    timer.mark("first frame")
+    report = timer.report()
+    assert "imports" in report
+    assert "first frame" in report
+    assert len(report.splitlines()) == 3